@@ -4,13 +4,15 @@ import pandas as pd
 import json
 from typing import List, Dict, Any
 from openai import OpenAI
+from services.reranker import RerankerService, shared_reranker
 
 class LLMInvestmentRecommender:
-    def __init__(self, knowledge_base: RAGKnowledgeBase):
+    def __init__(self, knowledge_base: RAGKnowledgeBase, reranker: RerankerService = None):
         """
         Initialize LLM-based investment recommender
         """
         self.knowledge_base = knowledge_base
+        self.reranker = reranker or shared_reranker()
         
         # Initialize LLM Pipeline (replace with appropriate model)
         # self.llm_pipeline = pipeline('text-generation')
@@ -23,8 +25,9 @@ class LLMInvestmentRecommender:
         """
         Generate comprehensive investment recommendation using LLM
         """
-        # Retrieve contextual insights
-        semantic_context = self.knowledge_base.semantic_search(
+        # Retrieve contextual insights: over-fetch, then keep only the best re-ranked passages
+        semantic_context = self.reranker.retrieve(
+            self.knowledge_base,
             f"Investment strategy for {user_profile['age']} year old with {user_profile['risk_score']} risk tolerance"
         )
         
@@ -48,7 +51,7 @@ class LLMInvestmentRecommender:
         {user_context}
 
         Semantic Insights:
-        {json.dumps(semantic_context, indent=2)}
+        {json.dumps(semantic_context, separators=(",", ":"))}
 
         Top Potential Investments:
         {investment_context}
@@ -0,0 +1,72 @@
+import json
+import os
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List
+
+from models.debt_fund_investment import DebtFundInvestment
+from models.mutual_fund_investment import MutualFundInvestment
+from models.stock_investment import StockInvestment
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "knowledge", "snapshot.json")
+
+PRODUCT_TYPES = {
+    "stocks": StockInvestment,
+    "mutual_funds": MutualFundInvestment,
+    "debt_funds": DebtFundInvestment,
+}
+
+
+@dataclass
+class KnowledgeSnapshot:
+    """One versioned set of investment principles and products"""
+    version: str
+    investment_principles: List[Dict[str, Any]]
+    stocks: List[StockInvestment]
+    mutual_funds: List[MutualFundInvestment]
+    debt_funds: List[DebtFundInvestment]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"version": self.version, "investment_principles": self.investment_principles}
+        for key in PRODUCT_TYPES:
+            data[key] = [product.to_dict() for product in getattr(self, key)]
+        return data
+
+
+def _build_products(key: str, entries: List[Dict[str, Any]]) -> list:
+    product_type = PRODUCT_TYPES[key]
+    names = {field.name for field in fields(product_type)}
+    products = []
+    for index, entry in enumerate(entries):
+        missing = names - entry.keys()
+        unknown = entry.keys() - names
+        if missing or unknown:
+            raise ValueError(
+                f"Invalid {key}[{index}] ({entry.get('name', '?')}): "
+                f"missing {sorted(missing)}, unknown {sorted(unknown)}"
+            )
+        products.append(product_type(**entry))
+    return products
+
+
+def load_snapshot(path: str = None) -> KnowledgeSnapshot:
+    """
+    Load and validate a snapshot file; raises ValueError on malformed content
+    """
+    with open(path or DEFAULT_SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if "version" not in data:
+        raise ValueError("Knowledge snapshot has no version")
+    return KnowledgeSnapshot(
+        version=str(data["version"]),
+        investment_principles=data.get("investment_principles", []),
+        **{key: _build_products(key, data.get(key, [])) for key in PRODUCT_TYPES}
+    )
+
+
+def save_snapshot(snapshot: KnowledgeSnapshot, path: str):
+    """Write a snapshot atomically, so a watcher never reads a half-written file"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(snapshot.to_dict(), f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(path + ".tmp", path)
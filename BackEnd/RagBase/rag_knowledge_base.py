@@ -1,354 +1,124 @@
-from models import (
-    debt_fund_investment,
-    mutual_fund_investment,
-    stock_investment,
-    store_type
-)
+from models import store_type
 
 import json
 from typing import List, Dict, Any
-from langchain.vectorstores import Chroma
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from services.company_registry import company_registry
+from services.metrics import timed
+from services.portfolio_optimizer import PortfolioOptimizer
+from services.embedding_cache import CachedEmbeddings
+from config.settings import settings
+from RagBase.knowledge_snapshot import KnowledgeSnapshot, load_snapshot
+from services.lexical_index import BM25Index, reciprocal_rank_fusion
+from services import ann_index
+from services.quantization import PRECISIONS
+
+# Store type of each store_texts() entry
+STORE_TYPES_BY_NAME = {
+    "principles": store_type.StoreType.PRINCIPLE,
+    "mutual_funds": store_type.StoreType.MF,
+    "debt_funds": store_type.StoreType.DF,
+    "stocks": store_type.StoreType.STOCKS,
+}
+
+# Dense and lexical candidates fetched per requested result before fusion
+HYBRID_CANDIDATES_PER_RESULT = 4
 
 class RAGKnowledgeBase:
-    def __init__(self):
+    def __init__(
+        self,
+        embeddings=None,
+        stocks=None,
+        mutual_funds=None,
+        debt_funds=None,
+        build_indexes=True,
+        shared_artifacts_dir=None,
+        snapshot: KnowledgeSnapshot = None,
+        optimizer: PortfolioOptimizer = None,
+        vector_index: str = None,
+        vector_index_params: Dict[str, Any] = None,
+        embedding_precision: str = None
+    ):
         """
         Initialize knowledge base with investment principles and data
+
+        Principles and products come from a versioned snapshot (default: the file at
+        KNOWLEDGE_SNAPSHOT_PATH or knowledge/snapshot.json); the product lists can be
+        overridden (e.g. for benchmarks). embeddings defaults to OpenAIEmbeddings and
+        is wrapped in an embedding cache, so passing the previous knowledge base's
+        embeddings (and optimizer) to a reload only embeds changed documents.
+        build_indexes=False skips the vector stores for catalog-only batch jobs.
+        shared_artifacts_dir loads the stores as memory-mapped embedding matrices
+        (see services.shared_artifacts) instead of embedding everything in-process.
+        vector_index selects the in-process store: "chroma", or a faiss "hnsw", "ivf"
+        or "flat" index (see services.ann_index); defaults to VECTOR_INDEX_BACKEND.
+        embedding_precision ("float32", "float16" or "int8", default EMBEDDING_PRECISION)
+        quantizes the stored embeddings: the shared-artifact matrices, or the
+        in-process faiss indexes (Chroma stores stay float32).
         """
-        self.investment_principles = [
-            {
-                "principle": "Asset Allocation Strategy",
-                "description": "Dynamic asset allocation based on age, risk tolerance, and financial goals",
-                "recommended_allocation": {
-                    "low_risk": {"equity": "40-50%", "debt": "50-60%", "alternatives": "0-10%"},
-                    "moderate_risk": {"equity": "60-70%", "debt": "30-40%", "alternatives": "0-10%"},
-                    "high_risk": {"equity": "70-80%", "debt": "20-30%", "alternatives": "0-10%"}
-                }
-            },
-            {
-                "principle": "Risk Management",
-                "description": "Gradual risk reduction as retirement approaches",
-                "age_based_strategy": {
-                    "20-35": "Aggressive growth",
-                    "36-45": "Balanced growth",
-                    "46-55": "Conservative growth",
-                    "56+": "Capital preservation"
-                }
-            },
-            {
-                "principle": "Tax Optimization",
-                "description": "Leverage tax-efficient investment vehicles",
-                "strategies": [
-                    "Use ELSS for tax deductions",
-                    "Utilize long-term capital gains benefits",
-                    "Consider tax-saving mutual funds"
-                ]
-            }
-        ]
-        
-        # Sample Investment Products
-        self.stocks = [
-            stock_investment.StockInvestment(
-                name="Reliance Industries Limited",
-                symbol="RELIANCE",
-                type="Equity",
-                risk_score=0.7,
-                expected_returns=0.12,
-                sector="Oil & Gas",
-                market_cap=1628000,
-                pe_ratio=24.5,
-                dividend_yield=1.2,
-                beta=1.1,
-                expense_ratio=0.01,
-                tax_efficiency=0.8,
-                key_strengths=["Diversified portfolio", "Strong retail and telecom presence"],
-                potential_risks=["Regulatory challenges", "Global oil price volatility"]
-            ),
-            stock_investment.StockInvestment(
-                name="HDFC Bank Limited",
-                symbol="HDFCBANK",
-                type="Equity",
-                risk_score=0.5,
-                expected_returns=0.14,
-                sector="Banking",
-                market_cap=1500000,
-                pe_ratio=20.2,
-                dividend_yield=1.8,
-                beta=1.1,
-                expense_ratio=0.01,
-                tax_efficiency=0.7,
-                key_strengths=["Strong retail banking", "Consistent growth"],
-                potential_risks=["Regulatory changes"]
-            ),
-            stock_investment.StockInvestment(
-                name="Infosys Limited",
-                symbol="INFY",
-                type="Equity",
-                risk_score=0.6,
-                expected_returns=0.15,
-                sector="IT",
-                market_cap=750000,
-                pe_ratio=23.5,
-                dividend_yield=2.1,
-                beta=0.9,
-                expense_ratio=0.01,
-                tax_efficiency=0.8,
-                key_strengths=["Digital transformation", "Global client base"],
-                potential_risks=["Tech sector volatility", "Currency fluctuations"]
-            ),
-            stock_investment.StockInvestment(
-                name="ICICI Bank Limited",
-                symbol="ICICIBANK",
-                type="Equity",
-                risk_score=0.55,
-                expected_returns=0.13,
-                sector="Banking",
-                market_cap=1400000,
-                pe_ratio=21.0,
-                dividend_yield=1.6,
-                beta=1.0,
-                expense_ratio=0.01,
-                tax_efficiency=0.75,
-                key_strengths=["Strong retail growth", "Digital innovations"],
-                potential_risks=["Economic slowdown"]
-            ),
-            stock_investment.StockInvestment(
-                name="Tata Consultancy Services",
-                symbol="TCS",
-                type="Equity",
-                risk_score=0.6,
-                expected_returns=0.14,
-                sector="IT",
-                market_cap=1300000,
-                pe_ratio=29.3,
-                dividend_yield=1.5,
-                beta=0.8,
-                expense_ratio=0.01,
-                tax_efficiency=0.85,
-                key_strengths=["Global delivery model", "Robust financials"],
-                potential_risks=["Employee attrition"]
-            ),
-            stock_investment.StockInvestment(
-                name="ITC Limited",
-                symbol="ITC",
-                type="Equity",
-                risk_score=0.5,
-                expected_returns=0.10,
-                sector="FMCG",
-                market_cap=582666.49,
-                pe_ratio=24.5,
-                dividend_yield=3.5,
-                beta=0.8,
-                expense_ratio=0.01,
-                tax_efficiency=0.75,
-                key_strengths=["Diversified product portfolio", "Strong brand recognition"],
-                potential_risks=["Regulatory challenges in tobacco industry"]
-            ),
-            stock_investment.StockInvestment(
-                name="Axis Bank Limited",
-                symbol="AXISBANK",
-                type="Equity",
-                risk_score=0.6,
-                expected_returns=0.12,
-                sector="Banking",
-                market_cap=352882.80,
-                pe_ratio=18.7,
-                dividend_yield=1.2,
-                beta=1.1,
-                expense_ratio=0.01,
-                tax_efficiency=0.70,
-                key_strengths=["Robust retail banking", "Expanding digital services"],
-                potential_risks=["Asset quality concerns"]
-            ),
-            stock_investment.StockInvestment(
-                name="Larsen & Toubro Limited",
-                symbol="LT",
-                type="Equity",
-                risk_score=0.55,
-                expected_returns=0.11,
-                sector="Construction",
-                market_cap=486060.70,
-                pe_ratio=20.0,
-                dividend_yield=1.5,
-                beta=1.0,
-                expense_ratio=0.01,
-                tax_efficiency=0.72,
-                key_strengths=["Strong order book", "Diversified operations"],
-                potential_risks=["Project execution delays"]
-            ),
-            stock_investment.StockInvestment(
-                name="State Bank of India",
-                symbol="SBIN",
-                type="Equity",
-                risk_score=0.6,
-                expected_returns=0.13,
-                sector="Banking",
-                market_cap=717584.07,
-                pe_ratio=15.5,
-                dividend_yield=2.0,
-                beta=1.2,
-                expense_ratio=0.01,
-                tax_efficiency=0.70,
-                key_strengths=["Extensive branch network", "Government backing"],
-                potential_risks=["Non-performing assets"]
-            ),
-            stock_investment.StockInvestment(
-                name="Bajaj Finance Limited",
-                symbol="BAJFINANCE",
-                type="Equity",
-                risk_score=0.65,
-                expected_returns=0.14,
-                sector="Financial Services",
-                market_cap=405404.87,
-                pe_ratio=30.0,
-                dividend_yield=0.8,
-                beta=1.3,
-                expense_ratio=0.01,
-                tax_efficiency=0.68,
-                key_strengths=["Strong retail lending", "Innovative financial products"],
-                potential_risks=["Credit risk exposure"]
-            ),
-            stock_investment.StockInvestment(
-                name="Asian Paints Limited",
-                symbol="ASIANPAINT",
-                type="Equity",
-                risk_score=0.5,
-                expected_returns=0.10,
-                sector="Chemicals",
-                market_cap=238060.14,
-                pe_ratio=50.0,
-                dividend_yield=1.0,
-                beta=0.9,
-                expense_ratio=0.01,
-                tax_efficiency=0.75,
-                key_strengths=["Market leadership", "Strong distribution network"],
-                potential_risks=["Raw material price volatility"]
-            ),
-            stock_investment.StockInvestment(
-                name="Bharti Airtel Limited",
-                symbol="BHARTIARTL",
-                type="Equity",
-                risk_score=0.6,
-                expected_returns=0.12,
-                sector="Telecommunications",
-                market_cap=884553.82,
-                pe_ratio=25.0,
-                dividend_yield=1.5,
-                beta=1.1,
-                expense_ratio=0.01,
-                tax_efficiency=0.70,
-                key_strengths=["Large subscriber base", "Expanding 4G/5G services"],
-                potential_risks=["Intense competition"]
-            ),
-            stock_investment.StockInvestment(
-                name="HCL Technologies Limited",
-                symbol="HCLTECH",
-                type="Equity",
-                risk_score=0.55,
-                expected_returns=0.11,
-                sector="IT",
-                market_cap=504565.32,
-                pe_ratio=20.0,
-                dividend_yield=2.5,
-                beta=0.9,
-                expense_ratio=0.01,
-                tax_efficiency=0.75,
-                key_strengths=["Strong software services", "Global client base"],
-                potential_risks=["Currency fluctuations"]
-            ),
-            stock_investment.StockInvestment(
-                name="Maruti Suzuki India Limited",
-                symbol="MARUTI",
-                type="Equity",
-                risk_score=0.6,
-                expected_returns=0.12,
-                sector="Automobile",
-                market_cap=346009.46,
-                pe_ratio=35.0,
-                dividend_yield=1.0,
-                beta=1.0,
-                expense_ratio=0.01,
-                tax_efficiency=0.70,
-                key_strengths=["Market leader in passenger vehicles", "Extensive dealer network"],
-                potential_risks=["Economic downturns"]
-            ),
-            stock_investment.StockInvestment(
-                name="Tata Steel Limited",
-                symbol="TATASTEEL",
-                type="Equity",
-                risk_score=0.65,
-                expected_returns=0.13,
-                sector="Metals",
-                market_cap=172111.50,
-                pe_ratio=10.0,
-                dividend_yield=2.0,
-                beta=1.2,
-                expense_ratio=0.01,
-                tax_efficiency=0.68,
-                key_strengths=["Integrated steel production", "Global presence"],
-                potential_risks=["Cyclical industry risks"]
-            )
-        ]
-        
-        self.mutual_funds = [
-            mutual_fund_investment.MutualFundInvestment(
-                name="HDFC Balanced Advantage Fund",
-                type="Hybrid",
-                risk_score=0.5,
-                expected_returns=0.12,
-                category="Balanced",
-                aum=50000,
-                fund_manager="Fund Manager X",
-                fund_house="HDFC Mutual Fund",
-                expense_ratio=0.02,
-                tax_efficiency=0.85,
-                tracking_error=2.5,
-                benchmark_index="NIFTY 50"
-            ),
-            mutual_fund_investment.MutualFundInvestment(
-                name="SBI Bluechip Fund",
-                type="Equity",
-                risk_score=0.6,
-                expected_returns=0.14,
-                category="Large Cap",
-                aum=75000,
-                fund_manager="Fund Manager Y",
-                fund_house="SBI Mutual Fund",
-                expense_ratio=0.018,
-                tax_efficiency=0.8,
-                tracking_error=2.0,
-                benchmark_index="NIFTY 50"
-            )
-        ]
-        
-        self.debt_funds = [
-            debt_fund_investment.DebtFundInvestment(
-                name="ICICI Prudential Gilt Fund",
-                type="Debt",
-                risk_score=0.2,
-                expected_returns=0.07,
-                duration="Long Term",
-                credit_rating="AAA",
-                govt_securities_percentage=80,
-                corporate_bonds_percentage=20,
-                expense_ratio=0.015,
-                tax_efficiency=0.9
-            ),
-            debt_fund_investment.DebtFundInvestment(
-                name="Axis Short Term Fund",
-                type="Debt",
-                risk_score=0.3,
-                expected_returns=0.08,
-                duration="Short Term",
-                credit_rating="AA",
-                govt_securities_percentage=40,
-                corporate_bonds_percentage=60,
-                expense_ratio=0.012,
-                tax_efficiency=0.85
-            )
-        ]
+        self.embeddings = embeddings
+        if build_indexes and self.embeddings is None:
+            # Imported here so catalog-only users (batch rebalancing, benchmarks) don't load langchain
+            from langchain.embeddings import OpenAIEmbeddings
+            self.embeddings = OpenAIEmbeddings()  # Replace with appropriate embedding model
+        if self.embeddings is not None and not isinstance(self.embeddings, CachedEmbeddings):
+            self.embeddings = CachedEmbeddings(self.embeddings)
+        if snapshot is None:
+            snapshot = load_snapshot(settings.KNOWLEDGE_SNAPSHOT_PATH or None)
+        self.version = snapshot.version
+        self.investment_principles = snapshot.investment_principles
+        self.stocks = snapshot.stocks
+        self.mutual_funds = snapshot.mutual_funds
+        self.debt_funds = snapshot.debt_funds
+
+        if stocks is not None:
+            self.stocks = stocks
+        if mutual_funds is not None:
+            self.mutual_funds = mutual_funds
+        if debt_funds is not None:
+            self.debt_funds = debt_funds
+
+        self.vector_index = vector_index or settings.VECTOR_INDEX_BACKEND
+        if self.vector_index not in ann_index.BACKENDS:
+            raise ValueError(f"Unknown vector index backend: {self.vector_index}")
+        self.vector_index_params = (
+            vector_index_params if vector_index_params is not None else ann_index.configured_params(self.vector_index)
+        )
+        self.embedding_precision = embedding_precision or settings.EMBEDDING_PRECISION
+        if self.embedding_precision not in PRECISIONS:
+            raise ValueError(f"Unknown embedding precision: {self.embedding_precision}")
+
+        # Efficient frontiers are solved once per candidate set and cached (kept across reloads)
+        self.optimizer = optimizer or PortfolioOptimizer()
+
+        # Link catalog stocks to the shared company registry
+        company_registry.register_catalog(self.stocks)
          
+        if not build_indexes:
+            return
+
+        # Lexical BM25 indexes over the same records, fused with the dense results in semantic_search
+        with timed("index_build"):
+            self._store_texts = {
+                STORE_TYPES_BY_NAME[name]: texts for name, texts in self.store_texts().items()
+            }
+            self.lexical_indexes = {store: BM25Index(texts) for store, texts in self._store_texts.items()}
+            self._doc_ids = {
+                store: {text: doc_id for doc_id, text in enumerate(texts)}
+                for store, texts in self._store_texts.items()
+            }
+
+        if shared_artifacts_dir:
+            from services.shared_artifacts import MatrixVectorStore
+            matrix_options = {
+                "precision": self.embedding_precision,
+                "rerank_factor": settings.EMBEDDING_RERANK_FACTOR,
+            }
+            self.principal_vector_store = MatrixVectorStore(shared_artifacts_dir, "principles", **matrix_options)
+            self.mf_vector_store = MatrixVectorStore(shared_artifacts_dir, "mutual_funds", **matrix_options)
+            self.df_vector_store = MatrixVectorStore(shared_artifacts_dir, "debt_funds", **matrix_options)
+            self.stock_vector_store = MatrixVectorStore(shared_artifacts_dir, "stocks", **matrix_options)
+            return
+
         # Convert to vector store
         self.principal_vector_store = self._create_vector_store(
             self.investment_principles
@@ -365,63 +135,87 @@ class RAGKnowledgeBase:
             self.stocks
         )
     
+    def store_texts(self) -> Dict[str, List[str]]:
+        """
+        Document texts of each vector store, as embedded (used to build shared artifacts)
+        """
+        return {
+            "principles": [json.dumps(doc) for doc in self.investment_principles],
+            "mutual_funds": [json.dumps(doc.to_dict()) for doc in self.mutual_funds],
+            "debt_funds": [json.dumps(doc.to_dict()) for doc in self.debt_funds],
+            "stocks": [json.dumps(doc.to_dict()) for doc in self.stocks],
+        }
+
     def _create_vector_store(self, documents):
         """
         Create vector embeddings for semantic search
         """
         # Convert documents to text
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
         texts = [json.dumps(doc) for doc in documents]
-        
-        # Create embeddings
-        embeddings = OpenAIEmbeddings()  # Replace with appropriate embedding model
-        vector_store = Chroma.from_texts(texts, embeddings)
-        
-        return vector_store
+        return self._build_vector_store(texts)
     
     def _create_vector_store_to_dict(self, documents):
         """
         Create vector embeddings for semantic search
         """
         # Convert documents to text
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
         texts = [json.dumps(doc.to_dict()) for doc in documents]
-        
-        # Create embeddings
-        embeddings = OpenAIEmbeddings()  # Replace with appropriate embedding model
-        vector_store = Chroma.from_texts(texts, embeddings)
-        
-        return vector_store
+        return self._build_vector_store(texts)
 
-    def semantic_search(self, query: str, k: int = 3, store: store_type.StoreType = store_type.StoreType.PRINCIPLE):
+    def _build_vector_store(self, texts: List[str]):
         """
-        Perform semantic search on investment knowledge base
+        Embed texts into the configured vector index
         """
-        # if not self.vector_store:
-        #     self.load_knowledge_sources()
-        
-        # Retrieve most relevant documents
-        if store:
-            if store ==  store_type.StoreType.PRINCIPLE:
-                print("Searching in PRINCIPLE store")
-                results = self.principal_vector_store.similarity_search(query, k=k)
+        with timed("index_build"):
+            if self.vector_index == ann_index.CHROMA:
+                from langchain.vectorstores import Chroma
+                return Chroma.from_texts(texts, self.embeddings)
+            return ann_index.FaissVectorStore.from_texts(
+                texts,
+                self.embeddings,
+                backend=self.vector_index,
+                params=self.vector_index_params,
+                precision=self.embedding_precision,
+                rerank_factor=settings.EMBEDDING_RERANK_FACTOR
+            )
 
-            if store ==  store_type.StoreType.MF:
-                print("Searching in MF store")
-                results = self.mf_vector_store.similarity_search(query, k=k)
+    def semantic_search(self, query: str, k: int = 3, store: store_type.StoreType = store_type.StoreType.PRINCIPLE):
+        """
+        Hybrid search on investment knowledge base
 
-            if store ==  store_type.StoreType.DF:
-                print("Searching in DF store")
-                results = self.df_vector_store.similarity_search(query, k=k)
+        Queries that name a record exactly (a ticker, fund or principle name) are
+        answered from the BM25 index alone, without an embedding call. Other queries
+        fuse the dense and BM25 rankings with reciprocal-rank fusion.
+        """
+        # Retrieve most relevant documents
+        stores = {
+            store_type.StoreType.PRINCIPLE: self.principal_vector_store,
+            store_type.StoreType.MF: self.mf_vector_store,
+            store_type.StoreType.DF: self.df_vector_store,
+            store_type.StoreType.STOCKS: self.stock_vector_store,
+        }
+        if store not in stores:
+            raise ValueError("Invalid store type specified.")
 
-            if store ==  store_type.StoreType.STOCKS:
-                print("Searching in STOCK store")
-                results = self.stock_vector_store.similarity_search(query, k=k)
+        texts = self._store_texts[store]
+        candidates = k * HYBRID_CANDIDATES_PER_RESULT
+        with timed("lexical_search"):
+            lexical_index = self.lexical_indexes[store]
+            exact = lexical_index.exact_matches(query)
+            lexical_ranking = [doc_id for doc_id, _ in lexical_index.search(query, candidates)]
+        if exact:
+            ranking = exact + [doc_id for doc_id in lexical_ranking if doc_id not in exact]
+            return [json.loads(texts[doc_id]) for doc_id in ranking[:k]]
 
-        else:
-            raise ValueError("Invalid store type specified.")
-        # results = store.similarity_search(query, k=k)
-        return [json.loads(result.page_content) for result in results]
+        # Embed the query once, then search the store by vector
+        with timed("embedding"):
+            query_vector = self.embeddings.embed_query(query)
+        with timed("vector_search"):
+            results = stores[store].similarity_search_by_vector(query_vector, k=candidates)
+        doc_ids = self._doc_ids[store]
+        dense_ranking = [doc_ids[result.page_content] for result in results if result.page_content in doc_ids]
+        ranking = reciprocal_rank_fusion([dense_ranking, lexical_ranking], k)
+        return [json.loads(texts[doc_id]) for doc_id in ranking]
 
     
     def get_investment_principles(self, user_profile: Dict[str, Any]) -> List[Dict]:
@@ -464,6 +258,9 @@ class RAGKnowledgeBase:
         # Risk-based asset allocation
         risk_allocation = self._determine_asset_allocation(user_profile)
         
+        # Candidate products and optimized amounts per bucket
+        allocation = self.allocate_products(user_profile, total_investment, risk_allocation)
+        
         # Recommendation generation
         recommendation = {
             "user_profile": user_profile,
@@ -471,15 +268,46 @@ class RAGKnowledgeBase:
             "total_investment": total_investment,
             "asset_allocation": risk_allocation,
             "recommended_investments": {
-                "stocks": self._recommend_stocks(user_profile, risk_allocation['equity']),
-                "mutual_funds": self._recommend_mutual_funds(user_profile, risk_allocation['debt']),
-                "debt_funds": self._recommend_debt_funds(user_profile, risk_allocation['debt'])
+                "stocks": self._recommend_stocks(*allocation["stocks"], total_investment),
+                "mutual_funds": self._recommend_mutual_funds(*allocation["mutual_funds"], total_investment),
+                "debt_funds": self._recommend_debt_funds(*allocation["debt_funds"], total_investment)
             },
             "tax_optimization_strategies": self._get_tax_optimization_strategies(user_profile)
         }
         
         return recommendation
 
+    def allocate_products(
+        self,
+        user_profile: Dict[str, Any],
+        total_investment: float,
+        risk_allocation: Dict[str, float]
+    ) -> Dict[str, tuple]:
+        """
+        Select candidate products per bucket and size them from the cached efficient frontiers.
+        Returns {bucket: (products, amounts)}.
+        """
+        top_stocks = self._select_products(self.stocks, user_profile, top_n=3)
+        top_mutual_funds = self._select_products(self.mutual_funds, user_profile, top_n=2)
+        top_debt_funds = self._select_products(self.debt_funds, user_profile, top_n=2)
+
+        # The equity share is split across stocks and mutual funds, the debt share across debt funds
+        equity_amount = total_investment * risk_allocation['equity']
+        debt_amount = total_investment * risk_allocation['debt']
+        equity_amounts = [
+            weight * equity_amount
+            for weight in self.optimizer.allocate(top_stocks + top_mutual_funds, user_profile['risk_score'])
+        ]
+        debt_amounts = [
+            weight * debt_amount
+            for weight in self.optimizer.allocate(top_debt_funds, user_profile['risk_score'])
+        ]
+        return {
+            "stocks": (top_stocks, equity_amounts[:len(top_stocks)]),
+            "mutual_funds": (top_mutual_funds, equity_amounts[len(top_stocks):]),
+            "debt_funds": (top_debt_funds, debt_amounts)
+        }
+
     def _determine_asset_allocation(self, user_profile: Dict[str, Any]) -> Dict[str, float]:
         """
         Determine asset allocation based on user profile
@@ -506,39 +334,42 @@ class RAGKnowledgeBase:
                 "alternatives": 0.05  # 5%
             }
 
-    def _recommend_stocks(self, user_profile: Dict[str, Any], allocation_percentage: float) -> List[Dict[str, Any]]:
+    def _select_products(self, products: List[Any], user_profile: Dict[str, Any], top_n: int) -> List[Any]:
         """
-        Recommend stocks based on user profile and allocation
+        Select the top products within the user's risk tolerance
         """
-        # Filter stocks based on user risk profile
-        filtered_stocks = [
-            stock for stock in self.stocks
-            if stock.risk_score <= user_profile['risk_score'] / 100
+        # Filter products based on user risk profile
+        filtered_products = [
+            product for product in products
+            if product.risk_score <= user_profile['risk_score'] / 100
         ]
         
-        # Sort stocks by expected returns and risk alignment
-        sorted_stocks = sorted(
-            filtered_stocks, 
+        # Sort products by expected returns and risk alignment
+        sorted_products = sorted(
+            filtered_products, 
             key=lambda x: (x.expected_returns, -abs(x.risk_score - user_profile['risk_score'] / 100)),
             reverse=True
         )
         
-        # Select top stocks
-        top_stocks = sorted_stocks[:3]
-        
-        if len(top_stocks) == 0:
-            return []
-        # Calculate investment amounts
+        return sorted_products[:top_n]
+
+    @staticmethod
+    def _allocation_percentage(amount: float, total_investment: float) -> float:
+        return amount / total_investment * 100 if total_investment else 0.0
+
+    def _recommend_stocks(self, stocks: List[Any], amounts: List[float], total_investment: float) -> List[Dict[str, Any]]:
+        """
+        Describe the selected stocks with their optimized investment amounts
+        """
         stock_investments = []
-        remaining_amount = user_profile['initial_investment'] * allocation_percentage
-        per_stock_amount = remaining_amount / len(top_stocks)
-        
-        for stock in top_stocks:
+        for stock, amount in zip(stocks, amounts):
+            if amount == 0:
+                continue
             stock_investment = {
                 "name": stock.name,
                 "symbol": stock.symbol,
-                "investment_amount": per_stock_amount,
-                "allocation_percentage": allocation_percentage * 100,
+                "investment_amount": amount,
+                "allocation_percentage": self._allocation_percentage(amount, total_investment),
                 "expected_returns": stock.expected_returns,
                 "risk_score": stock.risk_score,
                 "key_strengths": stock.key_strengths,
@@ -548,38 +379,19 @@ class RAGKnowledgeBase:
         
         return stock_investments
 
-    def _recommend_mutual_funds(self, user_profile: Dict[str, Any], allocation_percentage: float) -> List[Dict[str, Any]]:
+    def _recommend_mutual_funds(self, funds: List[Any], amounts: List[float], total_investment: float) -> List[Dict[str, Any]]:
         """
-        Recommend mutual funds based on user profile and allocation
+        Describe the selected mutual funds with their optimized investment amounts
         """
-        # Filter mutual funds based on user risk profile
-        filtered_funds = [
-            fund for fund in self.mutual_funds
-            if fund.risk_score <= user_profile['risk_score'] / 100
-        ]
-        
-        # Sort funds by expected returns and risk alignment
-        sorted_funds = sorted(
-            filtered_funds, 
-            key=lambda x: (x.expected_returns, -abs(x.risk_score - user_profile['risk_score'] / 100)),
-            reverse=True
-        )
-        
-        # Select top mutual funds
-        top_funds = sorted_funds[:2]
-        if len(top_funds) == 0:
-            return []
-        # Calculate investment amounts
         mutual_fund_investments = []
-        remaining_amount = user_profile['initial_investment'] * allocation_percentage
-        per_fund_amount = remaining_amount / len(top_funds)
-        
-        for fund in top_funds:
+        for fund, amount in zip(funds, amounts):
+            if amount == 0:
+                continue
             fund_investment = {
                 "name": fund.name,
                 "fund_house": fund.fund_house,
-                "investment_amount": per_fund_amount,
-                "allocation_percentage": allocation_percentage * 100,
+                "investment_amount": amount,
+                "allocation_percentage": self._allocation_percentage(amount, total_investment),
                 "expected_returns": fund.expected_returns,
                 "risk_score": fund.risk_score,
                 "category": fund.category,
@@ -589,37 +401,18 @@ class RAGKnowledgeBase:
         
         return mutual_fund_investments
 
-    def _recommend_debt_funds(self, user_profile: Dict[str, Any], allocation_percentage: float) -> List[Dict[str, Any]]:
+    def _recommend_debt_funds(self, funds: List[Any], amounts: List[float], total_investment: float) -> List[Dict[str, Any]]:
         """
-        Recommend debt funds based on user profile and allocation
+        Describe the selected debt funds with their optimized investment amounts
         """
-        # Filter debt funds based on user risk profile
-        filtered_funds = [
-            fund for fund in self.debt_funds
-            if fund.risk_score <= user_profile['risk_score'] / 100
-        ]
-        
-        # Sort funds by expected returns and risk alignment
-        sorted_funds = sorted(
-            filtered_funds, 
-            key=lambda x: (x.expected_returns, -abs(x.risk_score - user_profile['risk_score'] / 100)),
-            reverse=True
-        )
-        
-        # Select top debt funds
-        top_funds = sorted_funds[:2]
-        if len(top_funds) == 0:
-            return []
-        # Calculate investment amounts
         debt_fund_investments = []
-        remaining_amount = user_profile['initial_investment'] * allocation_percentage
-        per_fund_amount = remaining_amount / len(top_funds)
-        
-        for fund in top_funds:
+        for fund, amount in zip(funds, amounts):
+            if amount == 0:
+                continue
             fund_investment = {
                 "name": fund.name,
-                "investment_amount": per_fund_amount,
-                "allocation_percentage": allocation_percentage * 100,
+                "investment_amount": amount,
+                "allocation_percentage": self._allocation_percentage(amount, total_investment),
                 "expected_returns": fund.expected_returns,
                 "risk_score": fund.risk_score,
                 "duration": fund.duration,
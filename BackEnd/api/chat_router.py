@@ -1,15 +1,107 @@
+import os
 from models.chat import ChatPrompt, ChatResponse
-from services.chat_service import ChatService
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from models.user_profile import InvestmentRecommendationRequest
 from models.investment_response_model import InvestmentRecommendationResponse
-from services.investment_recommender_service import InvestmentRecommenderService
-from RagBase.rag_knowledge_base import RAGKnowledgeBase
+from services.metrics import timed
+from config.settings import settings
+from models.what_if import WhatIfRequest, WhatIfResponse
+from models.rebalance import RebalanceRequest, RebalanceResponse, ASSET_CLASSES
+from api.news_router import news_store
+from services.single_flight import SingleFlight, request_key
+from services.lazy import LazyService
+from services.knowledge_reloader import KnowledgeReloader
+from RagBase.knowledge_snapshot import DEFAULT_SNAPSHOT_PATH
 
 router = APIRouter()
-chat_service = ChatService()
-knowledge_base = RAGKnowledgeBase()
-investment_service = InvestmentRecommenderService(knowledge_base)
+
+# Services are built on first use (or by the startup warm-up); factories import their own modules
+
+def _build_news_index():
+    from services.news_index import NewsIndex
+    index = NewsIndex()
+    # Recent news summaries for chat context, kept current as the news store grows
+    index.attach(news_store)
+    return index
+
+def _build_chat_service():
+    from services.chat_service import ChatService
+    return ChatService(news_index=news_index.get())
+
+def _build_knowledge_base():
+    from RagBase.rag_knowledge_base import RAGKnowledgeBase
+    kb = RAGKnowledgeBase(shared_artifacts_dir=settings.SHARED_ARTIFACTS_DIR or None)
+    knowledge_reloader.mark_loaded(kb.version)
+    knowledge_reloader.start_watching()
+    return kb
+
+def _reload_knowledge_base(snapshot):
+    """Build the new knowledge base and its dependent services off to the side, then swap them in"""
+    from RagBase.rag_knowledge_base import RAGKnowledgeBase
+    from services.investment_recommender_service import InvestmentRecommenderService
+    from services.what_if_service import WhatIfService
+    from services.rebalancing_service import RebalancingService
+    previous = knowledge_base.get()
+    shared_artifacts_dir = settings.SHARED_ARTIFACTS_DIR or None
+    if shared_artifacts_dir:
+        # Multi-worker mode: the first worker to get here rebuilds the shared set (the
+        # others wait on its lock, then find it current); the rest pick it up via the watcher
+        from services.shared_artifacts import prepare_shared_artifacts
+        prepare_shared_artifacts(shared_artifacts_dir, snapshot=snapshot, embeddings=previous.embeddings)
+    # Reusing the embedding cache and optimizer means only changed documents are embedded
+    kb = RAGKnowledgeBase(
+        embeddings=previous.embeddings,
+        snapshot=snapshot,
+        optimizer=previous.optimizer,
+        shared_artifacts_dir=shared_artifacts_dir
+    )
+    services = [
+        (investment_service, InvestmentRecommenderService(kb)),
+        (what_if_service, WhatIfService(kb)),
+        (rebalancing_service, RebalancingService(kb)),
+    ]
+    knowledge_base.swap(kb)
+    for service, instance in services:
+        service.swap(instance)
+
+def _build_investment_service():
+    from services.investment_recommender_service import InvestmentRecommenderService
+    return InvestmentRecommenderService(knowledge_base.get())
+
+def _build_what_if_service():
+    from services.what_if_service import WhatIfService
+    return WhatIfService(knowledge_base.get())
+
+def _build_rebalancing_service():
+    from services.rebalancing_service import RebalancingService
+    return RebalancingService(knowledge_base.get())
+
+news_index = LazyService("news_index", _build_news_index)
+chat_service = LazyService("chat", _build_chat_service)
+knowledge_base = LazyService("knowledge_base", _build_knowledge_base)
+investment_service = LazyService("investment", _build_investment_service)
+what_if_service = LazyService("what_if", _build_what_if_service)
+rebalancing_service = LazyService("rebalancing", _build_rebalancing_service)
+
+knowledge_reloader = KnowledgeReloader(
+    settings.KNOWLEDGE_SNAPSHOT_PATH or DEFAULT_SNAPSHOT_PATH,
+    _reload_knowledge_base,
+    poll_interval=settings.KNOWLEDGE_WATCH_INTERVAL,
+    # The shared artifact manifest (services.shared_artifacts.MANIFEST), rewritten when any worker rebuilds the set
+    rebuilt_marker=os.path.join(settings.SHARED_ARTIFACTS_DIR, "manifest.json") if settings.SHARED_ARTIFACTS_DIR else None
+)
+
+# Identical concurrent chat prompts / recommendation profiles share one computation
+chat_flight = SingleFlight("chat")
+recommendation_flight = SingleFlight("recommendation")
+
+# Upper bound on risk_scores x time_horizons points per what-if request
+MAX_WHAT_IF_POINTS = 2000
+
+async def _generate_chat_response(chat_prompt: ChatPrompt) -> ChatResponse:
+    service = await chat_service.aget()
+    return await service.generate_response(chat_prompt)
 
 @router.post(
     "/chat",
@@ -41,9 +133,13 @@ async def chat_endpoint(
         HTTPException: If there's an error generating the response
     """
     try:
-        chat_response = await chat_service.generate_response(chat_prompt)
+        chat_response = await chat_flight.do(
+            request_key(chat_prompt.prompt, chat_prompt.context),
+            lambda: _generate_chat_response(chat_prompt)
+        )
         # Convert the ChatResponse to a plain text string
-        return f"Prompt: {chat_response.prompt}\nResponse: {chat_response.response}"
+        with timed("serialization"):
+            return f"Prompt: {chat_response.prompt}\nResponse: {chat_response.response}"
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -89,9 +185,129 @@ async def investment_recommendation_endpoint(
         if request.user_profile:
             user_profile.update(request.user_profile)
             
-        recommendation = investment_service.generate_recommendation(
-            user_profile=user_profile
+        recommendation = await recommendation_flight.do(
+            request_key(user_profile),
+            lambda: run_in_threadpool(lambda: investment_service.generate_recommendation(user_profile=user_profile))
         )
-        return recommendation
+        with timed("serialization"):
+            return InvestmentRecommendationResponse(**recommendation)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post(
+    "/investment/what-if",
+    response_model=WhatIfResponse,
+    summary="Evaluate Recommendation Sensitivity",
+    description="""
+    Evaluate the recommendation over a grid of risk scores and time horizons in one call.
+
+    Each point returns the asset allocation, product weights (aligned with `products`),
+    portfolio expected return/volatility and the probability of reaching the target amount.
+    """,
+    response_description="Returns compact per-point allocations for a sensitivity chart"
+)
+async def what_if_endpoint(
+    request: WhatIfRequest
+) -> WhatIfResponse:
+    """
+    Evaluate a what-if sweep.
+
+    Args:
+        request (WhatIfRequest): Parameter grid and investment amounts
+
+    Returns:
+        WhatIfResponse: Product index and one compact allocation per grid point
+
+    Raises:
+        HTTPException: If the grid is empty or too large, or the sweep fails
+    """
+    points = len(set(request.risk_scores)) * len(set(request.time_horizons))
+    if points == 0 or points > MAX_WHAT_IF_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Grid must contain between 1 and {MAX_WHAT_IF_POINTS} points, got {points}"
+        )
+    try:
+        service = await what_if_service.aget()
+        # The grid evaluation is CPU-bound numpy work; keep it off the event loop
+        with timed("what_if_sweep"):
+            return await run_in_threadpool(
+                service.sweep,
+                risk_scores=request.risk_scores,
+                time_horizons=request.time_horizons,
+                initial_investment=request.initial_investment,
+                target_amount=request.target_amount,
+                age=request.age
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post(
+    "/investment/rebalance",
+    response_model=RebalanceResponse,
+    summary="Compute Portfolio Drift and Rebalancing Trades",
+    description="""
+    Compare many clients' current holdings against their target asset allocation
+    and return minimal trade lists for clients whose drift exceeds the threshold.
+
+    For nightly runs over large books use `python run_rebalance.py` with CSV files instead.
+    """,
+    response_description="Returns per-client drift and the trades to place"
+)
+async def rebalance_endpoint(
+    request: RebalanceRequest
+) -> RebalanceResponse:
+    """
+    Rebalance a batch of client portfolios.
+
+    Args:
+        request (RebalanceRequest): Client risk scores and holdings
+
+    Returns:
+        RebalanceResponse: Drift per client and trade list
+
+    Raises:
+        HTTPException: If the request is invalid or rebalancing fails
+    """
+    import pandas as pd
+    from services.rebalancing_service import RebalancingService
+
+    try:
+        clients = pd.DataFrame(
+            [{"client_id": p.client_id, "risk_score": p.risk_score} for p in request.portfolios],
+            columns=["client_id", "risk_score"]
+        )
+        holdings = pd.DataFrame(
+            [
+                {"client_id": p.client_id, "symbol": h.symbol, "amount": h.value}
+                for p in request.portfolios for h in p.holdings
+            ],
+            columns=["client_id", "symbol", "amount"]
+        )
+        service = await rebalancing_service.aget()
+        if request.drift_threshold != service.drift_threshold:
+            service = RebalancingService(await knowledge_base.aget(), drift_threshold=request.drift_threshold)
+        result = await run_in_threadpool(service.rebalance, clients, holdings)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    with timed("serialization"):
+        drift = result["drift"]
+        return RebalanceResponse(
+            asset_classes=list(ASSET_CLASSES),
+            clients=[
+                {
+                    "client_id": row["client_id"],
+                    "total_value": row["total_value"],
+                    "current_allocation": [row[f"current_{name}"] for name in ASSET_CLASSES],
+                    "target_allocation": [row[f"target_{name}"] for name in ASSET_CLASSES],
+                    "drift": [row[f"drift_{name}"] for name in ASSET_CLASSES],
+                    "needs_rebalance": bool(row["needs_rebalance"]),
+                    "unallocated_cash": row["unallocated_cash"]
+                }
+                for row in drift.to_dict("records")
+            ],
+            trades=result["trades"].to_dict("records")
+        )
@@ -0,0 +1,110 @@
+import os
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from config.settings import settings
+from models.job import JobSubmissionResponse, JobStatusResponse, JobResultResponse
+from models.user_profile import InvestmentRecommendationRequest
+from services.job_queue import JobQueue, JobQueueFullError, SUCCEEDED, FAILED
+from services.single_flight import SingleFlight, request_key
+from api.chat_router import investment_service
+
+router = APIRouter()
+
+job_queue = JobQueue(
+    db_path=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "jobs.db"),
+    workers=settings.JOB_WORKERS,
+    max_queued=settings.JOB_QUEUE_SIZE,
+    lease_seconds=settings.JOB_LEASE_SECONDS
+)
+
+PERSONALIZED_RECOMMENDATION = "personalized_recommendation"
+
+# Jobs for the same profile running at the same time share one LLM call
+personalized_flight = SingleFlight("personalized_recommendation")
+
+async def _generate_personalized_recommendation(payload):
+    service = await investment_service.aget()
+    investment_data = await run_in_threadpool(service.build_investment_data)
+    return await service.generate_personalized_recommendation(user_profile=payload, investment_data=investment_data)
+
+async def _run_personalized_recommendation(payload):
+    return await personalized_flight.do(request_key(payload), lambda: _generate_personalized_recommendation(payload))
+
+job_queue.register(PERSONALIZED_RECOMMENDATION, _run_personalized_recommendation)
+
+@router.post(
+    "/jobs/investment/personalized-recommendation",
+    response_model=JobSubmissionResponse,
+    status_code=202,
+    summary="Submit Personalized Recommendation Job",
+    description="""
+    Queue an LLM-backed personalized recommendation and return a job id immediately.
+
+    - Poll /jobs/{job_id} for status and fetch /jobs/{job_id}/result once it has succeeded
+    - Lower priority values are processed first (default 5)
+    """
+)
+async def submit_personalized_recommendation(
+    request: InvestmentRecommendationRequest,
+    priority: int = 5
+) -> JobSubmissionResponse:
+    """
+    Submit a personalized recommendation job.
+
+    Args:
+        request (InvestmentRecommendationRequest): The user's profile
+        priority (int): Queue priority, lower runs first
+
+    Returns:
+        JobSubmissionResponse: The job id and its initial status
+
+    Raises:
+        HTTPException: If the queue is full or the job cannot be stored
+    """
+    payload = {
+        "age": request.age,
+        "risk_score": request.risk_score,
+        "time_horizon": request.time_horizon,
+        "initial_investment": request.initial_investment,
+        "target_amount": request.target_amount,
+        "user_profile": request.user_profile or {}
+    }
+    try:
+        job_id = await job_queue.submit(PERSONALIZED_RECOMMENDATION, payload, priority=priority)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return JobSubmissionResponse(job_id=job_id, status="queued")
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse, summary="Get Job Status")
+async def get_job_status(job_id: str) -> JobStatusResponse:
+    """
+    Return the current status of a submitted job.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobStatusResponse(
+        job_id=job["id"],
+        kind=job["kind"],
+        status=job["status"],
+        priority=job["priority"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        error=job["error"]
+    )
+
+@router.get("/jobs/{job_id}/result", response_model=JobResultResponse, summary="Get Job Result")
+async def get_job_result(job_id: str) -> JobResultResponse:
+    """
+    Return the result of a finished job. Responds 409 while the job is still queued or running.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return JobResultResponse(job_id=job["id"], status=job["status"], result=job["result"])
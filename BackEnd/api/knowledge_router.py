@@ -0,0 +1,52 @@
+from fastapi import APIRouter, HTTPException
+from models.knowledge_base import KnowledgeBaseStatus, KnowledgeBaseReloadResponse
+from api.chat_router import knowledge_reloader
+
+router = APIRouter()
+
+@router.get(
+    "/knowledge-base",
+    response_model=KnowledgeBaseStatus,
+    summary="Knowledge Base Status",
+    description="Return the snapshot version currently being served and whether a reload is in progress."
+)
+async def knowledge_base_status() -> KnowledgeBaseStatus:
+    """
+    Get the knowledge base status.
+
+    Returns:
+        KnowledgeBaseStatus: Live version, load time, reload state and the last reload error
+    """
+    return KnowledgeBaseStatus(**knowledge_reloader.status())
+
+@router.post(
+    "/knowledge-base/reload",
+    response_model=KnowledgeBaseReloadResponse,
+    status_code=202,
+    summary="Reload Knowledge Base",
+    description="""
+    Load the knowledge base snapshot file and rebuild its indexes in the background.
+
+    - The current version keeps serving requests until the new one is fully built, then both are swapped atomically
+    - The reload is skipped if the snapshot version is already live, unless force=true
+    - Poll GET /knowledge-base for the outcome
+    """
+)
+async def reload_knowledge_base(force: bool = False) -> KnowledgeBaseReloadResponse:
+    """
+    Start a knowledge base reload.
+
+    Args:
+        force (bool): Rebuild even if the snapshot version is unchanged
+
+    Returns:
+        KnowledgeBaseReloadResponse: Whether a reload was started and the current status
+
+    Raises:
+        HTTPException: If the reload could not be started
+    """
+    try:
+        started = knowledge_reloader.reload(force=force)
+        return KnowledgeBaseReloadResponse(started=started, status=KnowledgeBaseStatus(**knowledge_reloader.status()))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
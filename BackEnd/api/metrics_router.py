@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from services.metrics import metrics
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse, summary="Prometheus Metrics")
+async def get_metrics() -> PlainTextResponse:
+    """
+    Expose request/stage latency histograms, LLM token and cache counters in Prometheus text format.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
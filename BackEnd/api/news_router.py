@@ -1,35 +1,107 @@
-from fastapi import APIRouter, HTTPException
-from services.news_service import NewsService
-from models.news import NewsResponse, NewsItem  # Import the updated models
-import pandas as pd
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from services.news_store import NewsStore
+from models.news import NewsResponse, NewsItem, NewsHistoryResponse, FULL_MODE, FAST_MODE  # Import the updated models
+from services.metrics import timed
+from services.single_flight import SingleFlight
+from services.lazy import LazyService
 
 router = APIRouter()
 
-news_service = NewsService()
+news_store = NewsStore(
+    db_path=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "news.db")
+)
+
+def _build_news_service():
+    from services.news_service import NewsService
+    return NewsService(news_store=news_store)
+
+news_service = LazyService("news", _build_news_service)
+
+async def _fetch_news(mode: str):
+    service = await news_service.aget()
+    return await service.fetch_and_summarize_news(mode=mode)
+# Concurrent refreshes in the same mode share one scrape and summarization run
+news_flight = SingleFlight("news_summary")
 
 @router.get("/news-summary", response_model=NewsResponse)
-async def get_news_summary():
+async def get_news_summary(
+    mode: str = Query(FULL_MODE, pattern=f"^({FULL_MODE}|{FAST_MODE})$")
+):
     """
     Fetch the top Nifty 20 company news, summarize it, and provide investment insights.
+
+    mode=fast skips the LLM and returns locally classified sentiment with an extractive summary.
     """
     try:
         # Fetch news and generate summaries
-        summary_df = await news_service.fetch_and_summarize_news()
+        summary_df = await news_flight.do(mode, lambda: _fetch_news(mode))
         print(summary_df.head())  # To debug, check the fetched and summarized news
 
         # Convert each row of the summary_df into a NewsItem
-        news_items = [
-            NewsItem(
-                company=row["company"],
-                news_content=row["news_content"],  # Raw news content from your dataframe
-                summary=row["summary"],    # Summary of the news
-                datetime=row["datetime"]
-            )
-            for _, row in summary_df.iterrows()
-        ]
-        
-        # Return the response in the required format
-        return NewsResponse(data=news_items)
+        with timed("serialization"):
+            news_items = [
+                NewsItem(
+                    company=row["company"],
+                    headline=row["headline"],
+                    source=row["source"],
+                    link=row["link"],
+                    news_content=row["news_content"],  # Raw news content from your dataframe
+                    summary=row["summary"],    # Summary of the news
+                    sentiment=row["sentiment"],
+                    sentiment_score=row["sentiment_score"],
+                    datetime=row["datetime"]
+                )
+                for _, row in summary_df.iterrows()
+            ]
+            
+            # Return the response in the required format
+            return NewsResponse(data=news_items)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/news/history", response_model=NewsHistoryResponse)
+async def get_news_history(
+    company: str = Query(..., description="Company symbol, name or alias, e.g. TCS"),
+    days: Optional[int] = Query(30, ge=1, description="Look-back window, ignored when start is given"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None
+):
+    """
+    Page through stored news for one company, newest first.
 
+    Served from the local news store only; nothing is scraped or summarized.
+    """
+    if start is None and days is not None:
+        start = datetime.now() - timedelta(days=days)
+    try:
+        page = news_store.query(company, start=start, end=end, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return NewsHistoryResponse(
+            company=company,
+            symbol=page["symbol"],
+            data=[
+                NewsItem(
+                    company=item["company"],
+                    headline=item["headline"],
+                    source=item["source"],
+                    link=item["link"],
+                    news_content=item["news_content"],
+                    summary=item["summary"],
+                    sentiment=item["sentiment"],
+                    sentiment_score=item["sentiment_score"],
+                    datetime=item["datetime"]
+                )
+                for item in page["items"]
+            ],
+            next_cursor=page["next_cursor"]
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
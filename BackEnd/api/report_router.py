@@ -0,0 +1,81 @@
+import os
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+from config.settings import settings
+from models.report import ReportRequest
+from services.report_service import ReportService
+
+router = APIRouter()
+
+report_service = ReportService(
+    cache_dir=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "reports"),
+    workers=settings.REPORT_WORKERS,
+    max_cached=settings.REPORT_CACHE_MAX_FILES
+)
+
+def _pdf_response(key: str, data: bytes) -> Response:
+    return Response(
+        content=data,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": 'attachment; filename="financial_report.pdf"',
+            "ETag": f'"{key}"',
+            "X-Report-Key": key,
+            "Cache-Control": "private, max-age=86400"
+        }
+    )
+
+@router.post(
+    "/reports/pdf",
+    response_class=Response,
+    summary="Render PDF Report",
+    description="""
+    Render a PDF report (title, text and optional Plotly figures) on the server and return it.
+
+    - Rendering runs in a worker process pool, off the API and UI threads
+    - Reports are cached by a hash of their content: identical requests are rendered once
+    - The X-Report-Key header can be used to download the same report again from GET /reports/{key}
+    """
+)
+async def render_pdf_report(request: ReportRequest) -> Response:
+    """
+    Render (or fetch from cache) a PDF report.
+
+    Args:
+        request (ReportRequest): Title, body text and Plotly figure JSON
+
+    Returns:
+        Response: The PDF bytes
+
+    Raises:
+        HTTPException: If rendering fails
+    """
+    try:
+        key, data = await report_service.render(request.model_dump())
+        return _pdf_response(key, data)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get(
+    "/reports/{key}",
+    response_class=Response,
+    summary="Download Rendered Report",
+    description="Download a previously rendered report by its key (404 once evicted from the cache)."
+)
+async def get_pdf_report(key: str) -> Response:
+    """
+    Download a rendered report.
+
+    Args:
+        key (str): The X-Report-Key returned when the report was rendered
+
+    Returns:
+        Response: The PDF bytes
+
+    Raises:
+        HTTPException: If the report is not in the cache
+    """
+    data = report_service.read(key)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return _pdf_response(key, data)
@@ -1,37 +1,29 @@
 from fastapi import HTTPException, File, UploadFile,APIRouter
-import openai
-
 from fastapi.responses import JSONResponse
-import os 
-# Configure OpenAI API Key
-openai.api_key = "your_api_key"
+from services.lazy import LazyService
+
 router = APIRouter()
 
+def _build_transcription_service():
+    from services.transcription_service import TranscriptionService
+    return TranscriptionService()
+
+transcription_service = LazyService("transcription", _build_transcription_service)
+
 @router.post("/transcribe/")
 
 async def transcribe_audio(file: UploadFile = File(...)):
     try:
-        # Create a temporary file to save the uploaded audio
-        with open(file.filename, "wb") as buffer:
-            buffer.write(await file.read())
-        
-        # Use OpenAI's Whisper to transcribe the audio
-        with open(file.filename, "rb") as audio_file:
-            transcription = openai.Audio.transcribe("whisper-1", audio_file,language="en")
-        
-        # Remove the temporary file
-        os.remove(file.filename)
+        # Upload is spooled to a private temp file and transcribed off the event loop
+        service = await transcription_service.aget()
+        transcription = await service.transcribe(file, language="en")
         
         # Return the transcribed text
         return JSONResponse(content={
-            "transcription": transcription.text,
+            "transcription": transcription,
             "status": "success"
         })
     
     except Exception as e:
-        # Remove the temporary file in case of an error
-        if os.path.exists(file.filename):
-            os.remove(file.filename)
-        
         # Return an error response
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
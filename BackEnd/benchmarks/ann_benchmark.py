@@ -0,0 +1,155 @@
+"""
+Recall/latency benchmark for the approximate nearest-neighbour vector index backends.
+
+Run from the BackEnd directory:
+
+    python -m benchmarks.ann_benchmark --documents 100000 --dimension 256 --queries 500 \
+        --k 10 --output ann.json
+
+Synthetic clustered embeddings are searched with every faiss configuration in the
+sweep (HNSW ef_search values, IVF nprobe values) and compared against exact brute
+force search: recall@k is the fraction of the exact top-k found. Pass --min-recall
+to exit with code 1 when the configuration selected by the current settings falls
+below it.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+
+from benchmarks.run_benchmarks import measure
+from services import ann_index
+
+
+def clustered_vectors(count: int, dimension: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Gaussian blobs around random centres, normalized like embedding vectors"""
+    centres = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, count)] + 0.5 * rng.standard_normal((count, dimension)).astype(np.float32)
+    return ann_index.normalize_rows(vectors)
+
+
+def exact_neighbours(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Brute-force top-k rows per query (the ground truth)"""
+    neighbours = np.empty((len(queries), k), dtype=np.int64)
+    for start in range(0, len(queries), 256):
+        scores = queries[start:start + 256] @ vectors.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        neighbours[start:start + 256] = np.take_along_axis(top, order, axis=1)
+    return neighbours
+
+
+def recall_at_k(found: List[List[int]], truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    return statistics.fmean(len(set(rows) & set(expected.tolist())) / k for rows, expected in zip(found, truth))
+
+
+def bench_backend(
+    name: str,
+    backend: str,
+    params: Dict[str, Any],
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    texts: List[str],
+    common: Dict[str, Any]
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    store = ann_index.FaissVectorStore(vectors, texts, backend=backend, params=params)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    k = truth.shape[1]
+    result = measure(name, lambda query: store.search(query, k), list(queries), dict(common, backend=backend, **params))
+    found = [[row for row, _ in store.search(query, k)] for query in queries]
+    result.update(build_ms=build_ms, recall_at_k=recall_at_k(found, truth))
+    return result
+
+
+def main(argv=None) -> int:
+    from config.settings import settings
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--hnsw-m", type=int, default=settings.VECTOR_INDEX_HNSW_M)
+    parser.add_argument("--ef-construction", type=int, default=settings.VECTOR_INDEX_HNSW_EF_CONSTRUCTION)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--nlist", type=int, default=settings.VECTOR_INDEX_IVF_NLIST, help="0 = ~4 * sqrt(documents)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 64])
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--min-recall", type=float,
+                        help="Fail when the configured backend (VECTOR_INDEX_* settings) has a lower recall@k")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    vectors = clustered_vectors(args.documents, args.dimension, args.clusters, rng)
+    # Queries are perturbed copies of random documents, like a paraphrased lookup
+    queries = ann_index.normalize_rows(
+        vectors[rng.integers(0, args.documents, args.queries)]
+        + 0.3 * rng.standard_normal((args.queries, args.dimension)).astype(np.float32)
+    )
+    truth = exact_neighbours(vectors, queries, args.k)
+    texts = [str(row) for row in range(args.documents)]
+    common = {"documents": args.documents, "dimension": args.dimension, "k": args.k}
+
+    results = [measure(
+        "exact_numpy",
+        lambda query: np.argpartition(-(vectors @ query), args.k - 1)[:args.k],
+        list(queries),
+        dict(common, backend="numpy")
+    )]
+    results[0].update(build_ms=0.0, recall_at_k=1.0)
+    results.append(bench_backend("faiss_flat", ann_index.FLAT, {}, vectors, queries, truth, texts, common))
+    for ef_search in args.ef_search:
+        params = {"m": args.hnsw_m, "ef_construction": args.ef_construction, "ef_search": ef_search}
+        results.append(bench_backend(f"hnsw_ef{ef_search}", ann_index.HNSW, params, vectors, queries, truth, texts, common))
+    for nprobe in args.nprobe:
+        params = {"nlist": args.nlist, "nprobe": nprobe}
+        results.append(bench_backend(f"ivf_nprobe{nprobe}", ann_index.IVF, params, vectors, queries, truth, texts, common))
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    for result in results:
+        print(
+            f"{result['name']:<16} recall@{args.k} {result['recall_at_k']:.3f}  "
+            f"median {result['median_ms']:.3f} ms  p95 {result['p95_ms']:.3f} ms  build {result['build_ms']:.0f} ms",
+            file=sys.stderr
+        )
+
+    if args.min_recall is not None:
+        backend = settings.VECTOR_INDEX_BACKEND
+        if backend in (ann_index.HNSW, ann_index.IVF):
+            configured = ann_index.configured_params(backend)
+            result = bench_backend("configured", backend, configured, vectors, queries, truth, texts, common)
+            if result["recall_at_k"] < args.min_recall:
+                print(f"RECALL {backend} recall@{args.k} {result['recall_at_k']:.3f} < {args.min_recall}", file=sys.stderr)
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Ranking-quality and memory check for quantized (float16 / int8) embedding storage.
+
+Run from the BackEnd directory:
+
+    python -m benchmarks.quantization_check --documents 50000 --k 10 --min-recall 0.99
+
+For each precision, synthetic clustered embeddings are searched with and without
+exact re-ranking of the top k * --rerank-factor candidates. Results are compared
+with exact float32 search: recall@k is the fraction of the exact top-k found.
+Each quantized matrix is also saved and loaded back the way server workers load
+shared artifacts, checking that the codes are memory-mapped (shared through the
+page cache rather than rebuilt per worker) and rank exactly like the original.
+
+The run exits with code 1 when any re-ranked precision's recall@k is below
+--min-recall or a shared-artifact check fails, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+from typing import List
+
+import numpy as np
+
+from benchmarks.ann_benchmark import clustered_vectors, exact_neighbours, recall_at_k
+from benchmarks.run_benchmarks import measure
+from benchmarks.synthetic import HashingEmbeddings
+from services import ann_index
+from services.quantization import FLOAT16, INT8, QuantizedMatrix
+from services.shared_artifacts import MatrixVectorStore, build_shared_artifacts
+
+
+def check_shared_artifacts(matrix: QuantizedMatrix, queries: np.ndarray, k: int) -> List[str]:
+    """Problems found when the matrix is saved and loaded back as a worker would load it"""
+    problems = []
+    with tempfile.TemporaryDirectory() as directory:
+        matrix.save(directory, "check")
+        loaded = QuantizedMatrix.load(directory, "check", matrix.precision)
+        if not isinstance(loaded.codes, np.memmap):
+            problems.append(f"{matrix.precision}: loaded codes are not memory-mapped")
+        for query in queries[:20]:
+            if loaded.search(query, k) != matrix.search(query, k):
+                problems.append(f"{matrix.precision}: loaded codes rank differently from the saved ones")
+                break
+
+        texts = [f"synthetic document {i} sector {i % 7} rating {i % 3}" for i in range(500)]
+        build_shared_artifacts(os.path.join(directory, "set"), {}, {"check": texts}, HashingEmbeddings(64), matrix.precision)
+        store = MatrixVectorStore(os.path.join(directory, "set"), "check", precision=matrix.precision)
+        if store.quantized is None or not isinstance(store.quantized.codes, np.memmap):
+            problems.append(f"{matrix.precision}: MatrixVectorStore did not map the shared codes")
+        del loaded, store
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    parser.add_argument("--min-recall", type=float, default=0.99, help="Required recall@k after re-ranking")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    vectors = clustered_vectors(args.documents, args.dimension, args.clusters, rng)
+    queries = ann_index.normalize_rows(
+        vectors[rng.integers(0, args.documents, args.queries)]
+        + 0.3 * rng.standard_normal((args.queries, args.dimension)).astype(np.float32)
+    )
+    truth = exact_neighbours(vectors, queries, args.k)
+    common = {"documents": args.documents, "dimension": args.dimension, "k": args.k}
+
+    results = []
+    failures = []
+    for precision in (FLOAT16, INT8):
+        matrix = QuantizedMatrix.encode(vectors, precision)
+        for exact in (None, vectors):
+            reranked = exact is not None
+            name = f"{precision}_rerank" if reranked else precision
+
+            def search(query):
+                return matrix.search(query, args.k, exact=exact, rerank_factor=args.rerank_factor)
+
+            result = measure(name, search, list(queries), dict(common, precision=precision, reranked=reranked))
+            recall = recall_at_k([[row for row, _ in search(query)] for query in queries], truth)
+            result.update(
+                recall_at_k=recall,
+                index_bytes=matrix.nbytes,
+                compression=vectors.nbytes / matrix.nbytes
+            )
+            results.append(result)
+            if reranked and recall < args.min_recall:
+                failures.append(f"{name}: recall@{args.k} {recall:.4f} < {args.min_recall}")
+        failures.extend(check_shared_artifacts(matrix, queries, args.k))
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "float32_bytes": vectors.nbytes,
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    for result in results:
+        print(
+            f"{result['name']:<14} recall@{args.k} {result['recall_at_k']:.4f}  "
+            f"median {result['median_ms']:.3f} ms  {result['compression']:.1f}x smaller",
+            file=sys.stderr
+        )
+    for message in failures:
+        print(f"QUALITY {message}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
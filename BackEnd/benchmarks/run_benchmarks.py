@@ -0,0 +1,194 @@
+"""
+Standalone benchmark harness for the recommendation engine and document ingestion.
+
+Run from the BackEnd directory:
+
+    python -m benchmarks.run_benchmarks --stocks 500 --mutual-funds 200 --debt-funds 100 \
+        --profiles 200 --output bench.json
+
+Pass --baseline <previous results.json> to fail (exit code 1) when a benchmark's
+median is slower than the baseline by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from benchmarks.synthetic import HashingEmbeddings, generate_catalog, generate_user_profiles
+
+
+def measure(name: str, fn: Callable[[Any], Any], inputs: List[Any], params: Dict[str, Any], warmup: int = 1) -> Dict[str, Any]:
+    """
+    Time fn over each input (one sample per call) and summarize in milliseconds
+    """
+    for item in inputs[:warmup]:
+        fn(item)
+
+    samples = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    return {
+        "name": name,
+        "params": params,
+        "samples": len(samples),
+        "mean_ms": statistics.fmean(samples),
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min_ms": samples[0],
+        "max_ms": samples[-1],
+    }
+
+
+def bench_recommendation_engine(args) -> List[Dict[str, Any]]:
+    from RagBase.rag_knowledge_base import RAGKnowledgeBase
+    from models.store_type import StoreType
+    from services.investment_recommender_service import InvestmentRecommenderService
+    from services.reranker import LexicalOverlapBackend, RerankerService
+
+    catalog = generate_catalog(args.stocks, args.mutual_funds, args.debt_funds, seed=args.seed)
+    params = {
+        "stocks": args.stocks,
+        "mutual_funds": args.mutual_funds,
+        "debt_funds": args.debt_funds,
+        "profiles": args.profiles,
+    }
+
+    start = time.perf_counter()
+    knowledge_base = RAGKnowledgeBase(embeddings=HashingEmbeddings(), **catalog)
+    build_ms = (time.perf_counter() - start) * 1000
+    results = [{
+        "name": "knowledge_base_build", "params": params, "samples": 1,
+        "mean_ms": build_ms, "median_ms": build_ms, "p95_ms": build_ms, "min_ms": build_ms, "max_ms": build_ms,
+    }]
+
+    profiles = generate_user_profiles(args.profiles, seed=args.seed)
+    results.append(measure(
+        "generate_comprehensive_recommendation",
+        knowledge_base.generate_comprehensive_recommendation,
+        profiles,
+        params
+    ))
+
+    service = InvestmentRecommenderService(knowledge_base, reranker=RerankerService(LexicalOverlapBackend()))
+    investment_data = service.build_investment_data()
+    select_inputs = [(investment_data.copy(), profile) for profile in profiles]
+    results.append(measure(
+        "select_top_investments",
+        lambda item: service._select_top_investments(item[0], item[1], item[1]["user_profile"]["existing_investments"]),
+        select_inputs,
+        params
+    ))
+
+    queries = [
+        (f"Investment strategy for {p['age']} year old with {p['risk_score']} risk tolerance", store)
+        for p in profiles
+        for store in (StoreType.PRINCIPLE, StoreType.STOCKS, StoreType.MF, StoreType.DF)
+    ]
+    results.append(measure(
+        "semantic_search",
+        lambda item: knowledge_base.semantic_search(item[0], k=3, store=item[1]),
+        queries,
+        dict(params, embedder="hashing")
+    ))
+    return results
+
+
+def bench_pdf_ingestion(args) -> List[Dict[str, Any]]:
+    from services.company_registry import CompanyRegistry
+    from services.pdf_service import PDFService
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir
+        params = {"data_dir": os.path.basename(os.path.abspath(data_dir)), "documents": len(
+            [f for f in os.listdir(data_dir) if f.endswith(".pdf")]
+        )}
+
+        def cold(index):
+            PDFService(registry=CompanyRegistry(), data_dir=data_dir, cache_file=os.path.join(tmp, f"cold_{index}.bin"))
+
+        warm_cache = os.path.join(tmp, "warm.bin")
+        PDFService(registry=CompanyRegistry(), data_dir=data_dir, cache_file=warm_cache)
+
+        def warm(_):
+            PDFService(registry=CompanyRegistry(), data_dir=data_dir, cache_file=warm_cache)
+
+        return [
+            measure("pdf_ingestion_cold", cold, list(range(args.pdf_repeat)), params, warmup=0),
+            measure("pdf_ingestion_warm", warm, list(range(args.pdf_repeat)), params),
+        ]
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Return a message for every benchmark whose median regressed beyond tolerance
+    """
+    baseline_by_name = {result["name"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        previous = baseline_by_name.get(result["name"])
+        if previous and result["median_ms"] > previous["median_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{result['name']}: median {result['median_ms']:.3f} ms vs baseline {previous['median_ms']:.3f} ms"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stocks", type=int, default=200)
+    parser.add_argument("--mutual-funds", type=int, default=100)
+    parser.add_argument("--debt-funds", type=int, default=50)
+    parser.add_argument("--profiles", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=os.path.join(os.path.dirname(backend_dir), "Data"))
+    parser.add_argument("--pdf-repeat", type=int, default=3)
+    parser.add_argument("--only", choices=["engine", "pdf"], help="Run a single benchmark group")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", help="Previous JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed median slowdown, e.g. 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    results = []
+    if args.only in (None, "engine"):
+        results.extend(bench_recommendation_engine(args))
+    if args.only in (None, "pdf"):
+        results.extend(bench_pdf_ingestion(args))
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
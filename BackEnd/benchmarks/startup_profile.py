@@ -0,0 +1,132 @@
+"""
+Startup profiler for the API: per-module import time, cold-start time of main:app
+and per-service init time.
+
+Run from the BackEnd directory:
+
+    python -m benchmarks.startup_profile --top 25 --output startup.json
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+--max-cold-start <seconds> exits with code 1 when importing main:app (median of
+--repeat runs) takes longer, so it can gate CI. --services also builds every lazy
+service after import and reports how long each took.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_START_SCRIPT = """
+import time
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+"""
+
+SERVICE_INIT_SCRIPT = """
+import json
+import main
+from services.lazy import LAZY_SERVICES, warm_up
+warm_up()
+print(json.dumps([
+    {"service": s.name, "initialized": s.initialized, "init_ms": (s.init_seconds or 0.0) * 1000}
+    for s in LAZY_SERVICES
+]))
+"""
+
+
+def _run(args: List[str], env: Dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def _environment(warm_up: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["WARM_UP_SERVICES"] = "true" if warm_up else "false"
+    return env
+
+
+def profile_imports(env: Dict[str, str], top: int) -> List[Dict[str, Any]]:
+    """
+    Parse `python -X importtime` output for `import main`: self and cumulative microseconds per module
+    """
+    stderr = _run(["-X", "importtime", "-c", "import main"], env).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        modules.append({
+            "module": name,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    modules.sort(key=lambda module: module["cumulative_ms"], reverse=True)
+    return modules[:top]
+
+
+def measure_cold_start(env: Dict[str, str], repeat: int) -> Dict[str, Any]:
+    samples = sorted(float(_run(["-c", COLD_START_SCRIPT], env).stdout.strip().splitlines()[-1]) * 1000 for _ in range(repeat))
+    return {
+        "samples": len(samples),
+        "median_ms": statistics.median(samples),
+        "min_ms": samples[0],
+        "max_ms": samples[-1],
+    }
+
+
+def profile_services(env: Dict[str, str]) -> List[Dict[str, Any]]:
+    return json.loads(_run(["-c", SERVICE_INIT_SCRIPT], env).stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profile API startup")
+    parser.add_argument("--top", type=int, default=30, help="Number of slowest imports to report")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold-start runs (median is reported)")
+    parser.add_argument("--services", action="store_true", help="Also build every lazy service and time it")
+    parser.add_argument("--max-cold-start", type=float, help="Fail when median cold start exceeds this many seconds")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Warm-up is a startup event, so it never runs during a bare `import main`
+    env = _environment(warm_up=False)
+    report = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "cold_start": measure_cold_start(env, args.repeat),
+        "imports": profile_imports(env, args.top),
+    }
+    if args.services:
+        report["services"] = profile_services(env)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.max_cold_start is not None:
+        median_seconds = report["cold_start"]["median_ms"] / 1000
+        if median_seconds > args.max_cold_start:
+            print(
+                f"REGRESSION cold start of main:app took {median_seconds:.2f}s (limit {args.max_cold_start:.2f}s)",
+                file=sys.stderr
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
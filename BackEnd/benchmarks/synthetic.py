@@ -0,0 +1,115 @@
+import hashlib
+import math
+import random
+import re
+from typing import Any, Dict, List
+from models import debt_fund_investment, mutual_fund_investment, stock_investment
+
+SECTORS = ["Banking", "IT", "FMCG", "Oil & Gas", "Automobile", "Metals", "Pharma", "Telecommunications"]
+FUND_CATEGORIES = ["Large Cap", "Mid Cap", "Small Cap", "Balanced", "Flexi Cap", "Index"]
+DEBT_DURATIONS = ["Short Term", "Medium Term", "Long Term"]
+CREDIT_RATINGS = ["AAA", "AA+", "AA", "A"]
+
+
+class HashingEmbeddings:
+    """
+    Deterministic, network-free embedder (hashed bag of words) with the
+    embed_documents/embed_query interface expected by the vector stores
+    """
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for token in re.findall(r"[a-z0-9]+", text.lower()):
+            digest = hashlib.md5(token.encode()).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimension
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def generate_user_profiles(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Generate random user profiles in the shape accepted by the recommendation endpoints
+    """
+    rng = random.Random(seed)
+    profiles = []
+    for _ in range(count):
+        initial_investment = rng.choice([1, 2, 5, 10, 25, 50, 100]) * 100000
+        profiles.append({
+            "age": rng.randint(18, 80),
+            "risk_score": rng.randint(0, 100),
+            "time_horizon": rng.randint(1, 30),
+            "initial_investment": initial_investment,
+            "target_amount": initial_investment * rng.uniform(1.5, 10),
+            "user_profile": {
+                "existing_investments": rng.sample(["Equity", "Debt", "Hybrid"], rng.randint(0, 2))
+            }
+        })
+    return profiles
+
+
+def generate_catalog(stocks: int, mutual_funds: int, debt_funds: int, seed: int = 42) -> Dict[str, list]:
+    """
+    Generate a synthetic product catalog of the requested size
+    """
+    rng = random.Random(seed)
+    catalog = {"stocks": [], "mutual_funds": [], "debt_funds": []}
+
+    for i in range(stocks):
+        catalog["stocks"].append(stock_investment.StockInvestment(
+            name=f"Synthetic Stock {i} Limited",
+            symbol=f"SYN{i:05d}",
+            type="Equity",
+            risk_score=round(rng.uniform(0.3, 0.9), 2),
+            expected_returns=round(rng.uniform(0.06, 0.2), 3),
+            sector=rng.choice(SECTORS),
+            market_cap=round(rng.uniform(1e4, 2e6), 2),
+            pe_ratio=round(rng.uniform(8, 60), 1),
+            dividend_yield=round(rng.uniform(0, 4), 2),
+            beta=round(rng.uniform(0.6, 1.6), 2),
+            expense_ratio=0.01,
+            tax_efficiency=round(rng.uniform(0.6, 0.9), 2),
+            key_strengths=["Synthetic strength"],
+            potential_risks=["Synthetic risk"]
+        ))
+
+    for i in range(mutual_funds):
+        catalog["mutual_funds"].append(mutual_fund_investment.MutualFundInvestment(
+            name=f"Synthetic Mutual Fund {i}",
+            type=rng.choice(["Equity", "Hybrid"]),
+            risk_score=round(rng.uniform(0.3, 0.8), 2),
+            expected_returns=round(rng.uniform(0.07, 0.16), 3),
+            category=rng.choice(FUND_CATEGORIES),
+            aum=round(rng.uniform(1e3, 1e5), 2),
+            fund_manager=f"Fund Manager {i % 50}",
+            fund_house=f"Fund House {i % 20}",
+            expense_ratio=round(rng.uniform(0.005, 0.025), 4),
+            tax_efficiency=round(rng.uniform(0.7, 0.9), 2),
+            tracking_error=round(rng.uniform(0.5, 4), 2),
+            benchmark_index="NIFTY 50"
+        ))
+
+    for i in range(debt_funds):
+        govt = rng.randint(0, 100)
+        catalog["debt_funds"].append(debt_fund_investment.DebtFundInvestment(
+            name=f"Synthetic Debt Fund {i}",
+            type="Debt",
+            risk_score=round(rng.uniform(0.1, 0.4), 2),
+            expected_returns=round(rng.uniform(0.05, 0.09), 3),
+            duration=rng.choice(DEBT_DURATIONS),
+            credit_rating=rng.choice(CREDIT_RATINGS),
+            govt_securities_percentage=govt,
+            corporate_bonds_percentage=100 - govt,
+            expense_ratio=round(rng.uniform(0.003, 0.015), 4),
+            tax_efficiency=round(rng.uniform(0.8, 0.95), 2)
+        ))
+
+    return catalog
@@ -8,6 +8,49 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '../.env'))
 class Settings(BaseSettings):
     OPENAI_API_KEY: str
     MODEL_NAME: str = "gpt-4o"
+    # Transcription backend: "openai", "local" (openai-whisper package) or "stub"
+    TRANSCRIBE_BACKEND: str = "openai"
+    LOCAL_WHISPER_MODEL: str = "base"
+    # News sentiment: "auto" (model, lexicon fallback), "transformers" or "lexicon"
+    SENTIMENT_BACKEND: str = "auto"
+    SENTIMENT_MODEL: str = "ProsusAI/finbert"
+    # News scraper HTTP cache: "live", "record", "replay" (offline fixtures) or "off"
+    NEWS_HTTP_CACHE_MODE: str = "live"
+    NEWS_HTTP_CACHE_TTL: int = 900
+    NEWS_HTTP_CACHE_DIR: str = ""
+    # Build services in a background thread at startup instead of on first request
+    WARM_UP_SERVICES: bool = True
+    # Memory-mapped read-only artifacts shared by server workers (set by `server.py --mode prod`)
+    SHARED_ARTIFACTS_DIR: str = ""
+    # Retrieved-context re-ranking: "auto" (cross-encoder, lexical fallback), "cross-encoder" or "lexical"
+    RERANK_BACKEND: str = "auto"
+    RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_CANDIDATES: int = 12
+    RERANK_TOP_N: int = 3
+    RERANK_MIN_SCORE: float = 0.1
+    # Embedding storage for the faiss and shared-artifact stores: "float32", or quantized "float16" / "int8" re-ranked exactly
+    EMBEDDING_PRECISION: str = "float32"
+    EMBEDDING_RERANK_FACTOR: int = 4
+    # Extracted PDF text store compression: "auto" (zstd, lz4 or zlib, whichever is installed) or a codec name
+    PDF_CACHE_CODEC: str = "auto"
+    # Knowledge base vector index: "chroma", or faiss "hnsw", "ivf" or exact "flat"
+    VECTOR_INDEX_BACKEND: str = "chroma"
+    VECTOR_INDEX_HNSW_M: int = 32
+    VECTOR_INDEX_HNSW_EF_CONSTRUCTION: int = 200
+    VECTOR_INDEX_HNSW_EF_SEARCH: int = 64
+    VECTOR_INDEX_IVF_NLIST: int = 0  # 0 = ~4 * sqrt(documents)
+    VECTOR_INDEX_IVF_NPROBE: int = 8
+    # Versioned knowledge base snapshot (default: knowledge/snapshot.json); polled for changes every N seconds (0 disables)
+    KNOWLEDGE_SNAPSHOT_PATH: str = ""
+    KNOWLEDGE_WATCH_INTERVAL: float = 10
+    # Server-side PDF report rendering
+    REPORT_WORKERS: int = 2
+    REPORT_CACHE_MAX_FILES: int = 200
+    # Background job queue for long-running LLM work
+    JOB_WORKERS: int = 2
+    JOB_QUEUE_SIZE: int = 100
+    # Seconds a worker's claim on a running job lasts without renewal before another process may take it over
+    JOB_LEASE_SECONDS: float = 60
     
     class Config:
         env_file = ".env"
@@ -3,20 +3,9 @@ import numpy as np
 import json
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
-from sentence_transformers import SentenceTransformer
 import re
-import openai
-import faiss
-from dataclasses import asdict
 from enum import Enum
 
-from langchain.vectorstores import Chroma
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.document_loaders import JSONLoader
-from transformers import pipeline
-from openai import OpenAI
-
 
 
 class InvestmentRecommendationEngine:
@@ -1,8 +1,17 @@
-from fastapi import FastAPI
+import threading
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from api.chat_router import router as chat_router
 from api.news_router import router as news_router
 from api.transcribe_router import router as transcribe_router
+from api.jobs_router import router as jobs_router, job_queue
+from api.metrics_router import router as metrics_router
+from api.knowledge_router import router as knowledge_router
+from api.report_router import router as report_router, report_service
+from services.metrics import metrics
+from services.lazy import warm_up
+from config.settings import settings
 
 app = FastAPI(
     title="Financial Insights Chatbot API",
@@ -23,7 +32,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Build services in the background so the server accepts connections immediately
+@app.on_event("startup")
+async def warm_up_services():
+    if settings.WARM_UP_SERVICES:
+        threading.Thread(target=warm_up, name="service-warm-up", daemon=True).start()
+
+# Run queued jobs, including ones interrupted by a restart, without waiting for a new submission
+@app.on_event("startup")
+async def start_job_workers():
+    job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    job_queue.stop()
+
+@app.on_event("shutdown")
+async def stop_report_workers():
+    report_service.shutdown()
+
+# Record per-route request latency
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        metrics.observe(
+            "app_request_duration_seconds",
+            time.perf_counter() - start,
+            method=request.method,
+            path=route.path if route else "unmatched",
+            status=status
+        )
+
 # Include Routers
 app.include_router(chat_router, prefix="/api/v1", tags=["Chat"])
 app.include_router(news_router, prefix="/api/v1", tags=["News"])
-app.include_router(transcribe_router, prefix="/api/v1", tags=["Transcribe"])
\ No newline at end of file
+app.include_router(transcribe_router, prefix="/api/v1", tags=["Transcribe"])
+app.include_router(jobs_router, prefix="/api/v1", tags=["Jobs"])
+app.include_router(knowledge_router, prefix="/api/v1", tags=["Knowledge Base"])
+app.include_router(report_router, prefix="/api/v1", tags=["Reports"])
+app.include_router(metrics_router, tags=["Metrics"])
\ No newline at end of file
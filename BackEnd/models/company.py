@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+@dataclass
+class Company:
+    """A listed company known to the system, reconciled across data sources"""
+    symbol: str
+    name: str
+    aliases: List[str] = field(default_factory=list)
+    news_name: Optional[str] = None
+    documents: Dict[str, str] = field(default_factory=dict)
+    catalog_entry: Optional[object] = None
+
+    def to_dict(self):
+        return {
+            "symbol": self.symbol,
+            "name": self.name,
+            "aliases": list(self.aliases),
+            "news_name": self.news_name,
+            "documents": dict(self.documents),
+            "in_catalog": self.catalog_entry is not None
+        }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 class InvestmentRecommendationResponse(BaseModel):
     user_profile: Dict[str, Any]
@@ -8,3 +8,4 @@ class InvestmentRecommendationResponse(BaseModel):
     asset_allocation: Dict[str, float]
     recommended_investments: Dict[str, Any]
     tax_optimization_strategies: List[str]
+    goal_projection: Optional[Dict[str, Any]] = None
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+
+class JobSubmissionResponse(BaseModel):
+    job_id: str
+    status: str
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    priority: int
+    created_at: float
+    updated_at: float
+    error: Optional[str] = None
+
+class JobResultResponse(BaseModel):
+    job_id: str
+    status: str
+    result: Any
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class KnowledgeBaseStatus(BaseModel):
+    version: Optional[str] = None
+    loaded_at: Optional[float] = None
+    reloading: bool
+    last_error: Optional[str] = None
+
+class KnowledgeBaseReloadResponse(BaseModel):
+    started: bool
+    status: KnowledgeBaseStatus
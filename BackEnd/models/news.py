@@ -1,11 +1,26 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+
+# /news-summary modes: "full" summarizes with the LLM, "fast" returns extractive summaries
+FULL_MODE = "full"
+FAST_MODE = "fast"
 
 class NewsItem(BaseModel):
     company: str
+    headline: Optional[str] = None
+    source: Optional[str] = None
+    link: Optional[str] = None
     news_content: str
     summary: str
+    sentiment: Optional[str] = None
+    sentiment_score: Optional[float] = None
     datetime: str
 
 class NewsResponse(BaseModel):
     data: List[NewsItem]
+
+class NewsHistoryResponse(BaseModel):
+    company: str
+    symbol: str
+    data: List[NewsItem]
+    next_cursor: Optional[str] = None
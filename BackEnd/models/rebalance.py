@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+
+ASSET_CLASSES = ("equity", "debt", "alternatives")
+
+class Holding(BaseModel):
+    symbol: str = Field(..., description="Stock symbol or fund name")
+    amount: Optional[float] = Field(None, description="Current market value")
+    quantity: Optional[float] = None
+    price: Optional[float] = None
+
+    @model_validator(mode="after")
+    def check_value(self):
+        if self.amount is None and (self.quantity is None or self.price is None):
+            raise ValueError("Provide either amount or quantity and price")
+        return self
+
+    @property
+    def value(self) -> float:
+        return self.amount if self.amount is not None else self.quantity * self.price
+
+class ClientPortfolio(BaseModel):
+    client_id: str
+    risk_score: int
+    holdings: List[Holding]
+
+class RebalanceRequest(BaseModel):
+    portfolios: List[ClientPortfolio]
+    drift_threshold: float = Field(0.05, description="Absolute weight drift that triggers a rebalance")
+
+class Trade(BaseModel):
+    client_id: str
+    symbol: str
+    asset_class: str
+    action: str
+    amount: float
+
+class ClientDrift(BaseModel):
+    client_id: str
+    total_value: float
+    current_allocation: List[float]
+    target_allocation: List[float]
+    drift: List[float]
+    needs_rebalance: bool
+    unallocated_cash: float
+
+class RebalanceResponse(BaseModel):
+    asset_classes: List[str]
+    clients: List[ClientDrift]
+    trades: List[Trade]
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List
+
+class ReportRequest(BaseModel):
+    title: str = "Financial Analysis Report"
+    text: str = Field(..., description="Report body (analysis or chat summary)")
+    figures: List[Dict[str, Any]] = Field(default_factory=list, description="Plotly figures as JSON (fig.to_plotly_json())")
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class WhatIfRequest(BaseModel):
+    age: int = 35
+    risk_scores: List[int] = Field(
+        default_factory=lambda: list(range(0, 101, 5)),
+        description="Risk scores (0-100) to evaluate"
+    )
+    time_horizons: List[int] = Field(
+        default_factory=lambda: [5, 10, 15, 20],
+        description="Investment horizons in years to evaluate"
+    )
+    initial_investment: float
+    target_amount: float
+
+class WhatIfPoint(BaseModel):
+    risk_score: int
+    time_horizon: int
+    asset_allocation: List[float]
+    weights: List[float]
+    expected_return: float
+    volatility: float
+    goal_probability: float
+    median_value: float
+    p5_value: float
+    p95_value: float
+
+class WhatIfResponse(BaseModel):
+    products: List[str]
+    asset_classes: List[str]
+    points: List[WhatIfPoint]
@@ -0,0 +1,51 @@
+"""
+Nightly bulk rebalancing run.
+
+    python run_rebalance.py --clients clients.csv --holdings holdings.csv \\
+        --trades trades.csv --drift drift.csv
+
+clients.csv:  client_id, risk_score
+holdings.csv: client_id, symbol, amount  (or quantity and price instead of amount)
+"""
+import argparse
+import logging
+import time
+
+import pandas as pd
+
+from RagBase.rag_knowledge_base import RAGKnowledgeBase
+from services.rebalancing_service import RebalancingService
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", required=True)
+    parser.add_argument("--holdings", required=True)
+    parser.add_argument("--trades", required=True, help="Output CSV of trades")
+    parser.add_argument("--drift", help="Optional output CSV of per-client drift")
+    parser.add_argument("--threshold", type=float, default=0.05, help="Absolute weight drift that triggers a rebalance")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    clients = pd.read_csv(args.clients, dtype={"client_id": str})
+    holdings = pd.read_csv(args.holdings, dtype={"client_id": str, "symbol": str})
+    if "amount" not in holdings.columns:
+        holdings["amount"] = holdings["quantity"] * holdings["price"]
+
+    # Only the product catalog is needed, so skip building the vector stores
+    service = RebalancingService(RAGKnowledgeBase(build_indexes=False), drift_threshold=args.threshold)
+
+    start = time.perf_counter()
+    result = service.rebalance(clients, holdings[["client_id", "symbol", "amount"]])
+    logging.info(
+        f"Rebalanced {len(clients)} clients ({int(result['drift']['needs_rebalance'].sum())} drifted), "
+        f"{len(result['trades'])} trades in {time.perf_counter() - start:.1f}s"
+    )
+
+    result["trades"].to_csv(args.trades, index=False)
+    if args.drift:
+        result["drift"].to_csv(args.drift, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+
+from services.metrics import record_cache
+
+LIVE = "live"        # serve fresh entries, revalidate stale ones with conditional requests
+RECORD = "record"    # always fetch and store the response as a fixture
+REPLAY = "replay"    # serve only stored responses, never touch the network
+OFF = "off"          # plain requests, nothing stored
+MODES = (LIVE, RECORD, REPLAY, OFF)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+@dataclass
+class CachedResponse:
+    """The subset of requests.Response the scraper relies on"""
+    status_code: int
+    content: bytes
+    from_cache: bool = False
+
+
+class HTTPCache:
+    def __init__(self, cache_dir: str, mode: str = LIVE, default_ttl: int = 900, session: requests.Session = None):
+        """
+        Initialize an on-disk HTTP response cache
+
+        Each URL is stored as a body file plus a JSON metadata file (validators,
+        fetch time, freshness lifetime). Freshness comes from Cache-Control
+        max-age when the server sends it, otherwise default_ttl seconds.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Invalid HTTP cache mode: {mode}")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.default_ttl = default_ttl
+        self.session = session or requests.Session()
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.body"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, url: str) -> Optional[Dict]:
+        body_path, meta_path = self._paths(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return None
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            meta["content"] = f.read()
+        return meta
+
+    def _store(self, url: str, response: requests.Response, cache_control: str):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        body_path, meta_path = self._paths(url)
+        max_age = _MAX_AGE.search(cache_control)
+        meta = {
+            "url": url,
+            "status_code": response.status_code,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "ttl": int(max_age.group(1)) if max_age else self.default_ttl,
+        }
+        # Write the body first so a metadata file always points at a complete body
+        with open(body_path + ".tmp", "wb") as f:
+            f.write(response.content)
+        os.replace(body_path + ".tmp", body_path)
+        self._write_meta(meta_path, meta)
+
+    @staticmethod
+    def _write_meta(meta_path: str, meta: Dict):
+        meta = {key: value for key, value in meta.items() if key != "content"}
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def get(self, url: str, headers: Dict[str, str] = None) -> CachedResponse:
+        """GET a URL through the cache according to the configured mode"""
+        headers = dict(headers or {})
+        entry = self._load(url) if self.mode in (LIVE, REPLAY) else None
+
+        if self.mode == REPLAY:
+            record_cache("http", entry is not None)
+            if entry is None:
+                return CachedResponse(status_code=404, content=b"", from_cache=True)
+            return CachedResponse(status_code=entry["status_code"], content=entry["content"], from_cache=True)
+
+        if entry is not None:
+            if time.time() - entry["fetched_at"] < entry["ttl"]:
+                record_cache("http", True)
+                return CachedResponse(status_code=entry["status_code"], content=entry["content"], from_cache=True)
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.session.get(url, headers=headers)
+
+        if entry is not None and response.status_code == 304:
+            record_cache("http", True)
+            entry["fetched_at"] = time.time()
+            self._write_meta(self._paths(url)[1], entry)
+            return CachedResponse(status_code=entry["status_code"], content=entry["content"], from_cache=True)
+
+        if self.mode != OFF:
+            record_cache("http", False)
+        cache_control = response.headers.get("Cache-Control", "")
+        if self.mode == RECORD or (self.mode == LIVE and response.status_code == 200 and "no-store" not in cache_control):
+            self._store(url, response, cache_control)
+        return CachedResponse(status_code=response.status_code, content=response.content)
@@ -1,17 +1,93 @@
-import requests
-from bs4 import BeautifulSoup
+import os
+import re
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
+from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode, urlunparse
+from services.company_registry import company_registry
+from config.settings import settings
+from scraper.http_cache import HTTPCache
+
+# Only the results container is parsed; the rest of the page is skipped by lxml
+RESULTS_STRAINER = SoupStrainer("div", id=["search", "main"])
+
+# CSS selectors per Google News results layout (full JS page, basic HTML page)
+RESULT_LAYOUTS = (
+    {
+        "container": "div.SoaBEf",
+        "headline": "div[role=heading]",
+        "source": "div.MgUUmf span, div.NUnG9d span",
+        "snippet": "div.GI74Re",
+        "published": "div.OSrXXb span, div.LfVVr",
+    },
+    {
+        "container": "div.Gx5Zad",
+        "headline": "div.BNeawe.vvjwJb, h3",
+        "source": "div.BNeawe.UPmit",
+        "snippet": "div.BNeawe.s3v9rd",
+        "published": "span.r0bn4c",
+    },
+)
+
+_RELATIVE_TIME = re.compile(r"(\d+)\s*(min|minute|hour|day|week|month|year)s?\s+ago", re.IGNORECASE)
+_TIME_UNITS = {
+    "min": timedelta(minutes=1),
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+_DATE_FORMATS = ("%d %b %Y", "%b %d, %Y")
+# Click-tracking query parameters added by Google and ad/social referrers (utm_* is matched by prefix)
+_TRACKING_PARAMS = {"ved", "sa", "usg", "ei", "oq", "gs_lcp", "sca_esv", "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid"}
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _select_text(element, selector: str) -> str:
+    found = element.select_one(selector)
+    return found.get_text(separator=" ", strip=True) if found else ""
+
+
+def parse_published(text: str, now: datetime = None):
+    """Turn Google's "3 hours ago" / "12 Mar 2024" into a datetime, or None"""
+    now = now or datetime.now()
+    match = _RELATIVE_TIME.search(text)
+    if match:
+        return now - int(match.group(1)) * _TIME_UNITS[match.group(2).lower()]
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def normalize_link(href: str) -> str:
+    """
+    Unwrap Google's /url?q= redirects and drop the fragment and tracking parameters
+    for deduplication; other query parameters (e.g. an article id) are kept, sorted
+    """
+    if href.startswith("/url?"):
+        href = parse_qs(urlparse(href).query).get("q", [href])[0]
+    parsed = urlparse(href)
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunparse((parsed.scheme, parsed.netloc.lower(), parsed.path.rstrip("/"), "", urlencode(query), ""))
+
 
 class NewsScraper:
-    def __init__(self):
-        self.nifty_companies = [
-            "Reliance Industries", "TCS", "Infosys", "HDFC Bank", "ICICI Bank",
-            "Hindustan Unilever", "SBI", "Bharti Airtel", "Kotak Mahindra Bank",
-            "Adani Enterprises", "ITC", "HCL Technologies", "Axis Bank",
-            "Larsen & Toubro", "Bajaj Finance", "Nestle India", "Wipro",
-            "Asian Paints", "Maruti Suzuki", "Titan Company"
-        ]
+    def __init__(self, max_articles_per_company: int = 5, http_cache: HTTPCache = None):
+        self.nifty_companies = company_registry.news_companies()
+        self.max_articles_per_company = max_articles_per_company
+        self.http_cache = http_cache or HTTPCache(
+            settings.NEWS_HTTP_CACHE_DIR or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "http"),
+            mode=settings.NEWS_HTTP_CACHE_MODE,
+            default_ttl=settings.NEWS_HTTP_CACHE_TTL
+        )
         self.news_url = (
             "https://www.google.com/search?sca_esv=0779345a01e3fcf7&sxsrf=ADLYWIKkyZoODP9NCxwD4f1Yp9S7uVoL4w:1732958682800&q={company}+stock+news&tbm=nws&source=lnms"
         )
@@ -21,44 +97,83 @@ class NewsScraper:
                 "(KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
             )
         }
-        
+
+    def parse_articles(self, html, company: str, now: datetime = None):
+        """
+        Extract per-article records (headline, source, published, snippet, link)
+        from a news results page
+        """
+        now = now or datetime.now()
+        soup = BeautifulSoup(html, "lxml", parse_only=RESULTS_STRAINER)
+
+        articles = []
+        for layout in RESULT_LAYOUTS:
+            for container in soup.select(layout["container"]):
+                headline = _select_text(container, layout["headline"])
+                anchor = container.find("a", href=True)
+                if not headline or anchor is None:
+                    continue
+                published_text = _select_text(container, layout["published"])
+                published = parse_published(published_text, now) if published_text else None
+                articles.append({
+                    "company": company,
+                    "headline": headline,
+                    "source": _select_text(container, layout["source"]),
+                    "published": published_text,
+                    "snippet": _select_text(container, layout["snippet"]),
+                    "link": normalize_link(anchor["href"]),
+                    "datetime": (published or now).strftime(DATETIME_FORMAT),
+                })
+            if articles:
+                break
+        return articles
+
     def fetch_news(self):
+        """
+        Fetch news articles for every tracked company, one row per article.
+
+        Articles that show up for several companies are kept once, under the
+        first company they were found for.
+        """
         news_list = []
+        seen = set()
 
         for company in self.nifty_companies:
             # Format the search URL for the company
             url = self.news_url.format(company=company.replace(" ", "+"))
-            
-            # Send the request with headers
-            response = requests.get(url, headers=self.headers)
-            
+
+            # Send the request with headers (served from the HTTP cache when fresh)
+            response = self.http_cache.get(url, headers=self.headers)
+
             if response.status_code != 200:
                 print(f"Failed to fetch news for {company}. Status code: {response.status_code}")
                 continue
 
-            # Parse the HTML content with BeautifulSoup
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract the 'search' div that contains news results
-            search_div = soup.find('div', {'id': 'search'})
-            
-            if search_div:
-                # Extract the text from each div inside the 'search' div
-                div_text = ''
-                # for div in search_div.find_all('div'):
-                div_text= search_div.get_text(separator=' ', strip=True) + ' '
-                news_list.append({
-                    "company": company,
-                    "news": div_text.strip(),
-                    "datetime": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                })
-            else:
+            added = 0
+            for article in self.parse_articles(response.content, company):
+                key = article["link"] or article["headline"].lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+                # Compact text handed to sentiment and summarization
+                article["news"] = ". ".join(part for part in (article["headline"], article["snippet"]) if part)
+                news_list.append(article)
+                added += 1
+                if added >= self.max_articles_per_company:
+                    break
+
+            if not added:
                 news_list.append({
                     "company": company,
+                    "headline": "",
+                    "source": "",
+                    "published": "",
+                    "snippet": "",
+                    "link": "",
                     "news": "No news found",
-                    "datetime": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    "datetime": datetime.now().strftime(DATETIME_FORMAT)
                 })
-        
+
         # Return the news list as a DataFrame
         return pd.DataFrame(news_list)
 
@@ -1,9 +1,32 @@
+import argparse
+import os
 import uvicorn
 
+DEFAULT_ARTIFACTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "shared")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Financial Insights API")
+    parser.add_argument("--mode", choices=["dev", "prod"], default="dev",
+                        help="dev: one auto-reloading process; prod: multiple workers sharing mmap'd artifacts")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes in prod mode")
+    parser.add_argument("--artifacts-dir", default=DEFAULT_ARTIFACTS_DIR,
+                        help="Where the shared read-only artifacts are built and memory-mapped from")
+    args = parser.parse_args(argv)
+
+    if args.mode == "dev":
+        uvicorn.run("main:app", host=args.host, port=args.port, reload=True)
+        return
+
+    # Build (or reuse) the shared artifacts once, then point every worker at them
+    from services.shared_artifacts import prepare_shared_artifacts
+    prepare_shared_artifacts(args.artifacts_dir)
+    os.environ["SHARED_ARTIFACTS_DIR"] = args.artifacts_dir
+
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers, reload=False)
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
-    )
\ No newline at end of file
+    main()
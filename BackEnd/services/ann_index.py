@@ -0,0 +1,153 @@
+import math
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from config.settings import settings
+from services.quantization import FLOAT32, faiss_quantizer_type, rerank
+from services.shared_artifacts import Document
+
+# Vector index backends selectable for the knowledge base stores
+CHROMA = "chroma"
+FLAT = "flat"
+HNSW = "hnsw"
+IVF = "ivf"
+BACKENDS = (CHROMA, FLAT, HNSW, IVF)
+
+DEFAULT_PARAMS = {
+    HNSW: {"m": 32, "ef_construction": 200, "ef_search": 64},
+    IVF: {"nlist": 0, "nprobe": 8},
+    FLAT: {},
+}
+
+
+def configured_params(backend: str) -> Dict[str, Any]:
+    """Index parameters from the VECTOR_INDEX_* settings"""
+    if backend == HNSW:
+        return {
+            "m": settings.VECTOR_INDEX_HNSW_M,
+            "ef_construction": settings.VECTOR_INDEX_HNSW_EF_CONSTRUCTION,
+            "ef_search": settings.VECTOR_INDEX_HNSW_EF_SEARCH,
+        }
+    if backend == IVF:
+        return {"nlist": settings.VECTOR_INDEX_IVF_NLIST, "nprobe": settings.VECTOR_INDEX_IVF_NPROBE}
+    return {}
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    vectors = np.array(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return vectors
+
+
+def default_nlist(count: int) -> int:
+    """IVF list count: ~4 * sqrt(n), with at least 39 training points per list"""
+    return max(1, min(int(4 * math.sqrt(count)), count // 39))
+
+
+def build_faiss_index(vectors: np.ndarray, backend: str, params: Dict[str, Any] = None, precision: str = FLOAT32):
+    """
+    Build an inner-product faiss index over row-normalized vectors (so scores are cosine similarities)
+
+    With precision "float16" or "int8" the index stores scalar-quantized vectors
+    (IndexHNSWSQ / IndexIVFScalarQuantizer / IndexScalarQuantizer) instead of float32.
+    """
+    import faiss
+
+    params = dict(DEFAULT_PARAMS[backend], **(params or {}))
+    dimension = vectors.shape[1]
+    quantized = precision != FLOAT32
+    if backend == HNSW:
+        if quantized:
+            index = faiss.IndexHNSWSQ(dimension, faiss_quantizer_type(precision), params["m"], faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+        else:
+            index = faiss.IndexHNSWFlat(dimension, params["m"], faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = params["ef_construction"]
+        index.add(vectors)
+        index.hnsw.efSearch = params["ef_search"]
+    elif backend == IVF:
+        nlist = params["nlist"] or default_nlist(len(vectors))
+        quantizer = faiss.IndexFlatIP(dimension)
+        if quantized:
+            index = faiss.IndexIVFScalarQuantizer(
+                quantizer, dimension, nlist, faiss_quantizer_type(precision), faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.add(vectors)
+        index.nprobe = min(params["nprobe"], nlist)
+    else:
+        if quantized:
+            index = faiss.IndexScalarQuantizer(dimension, faiss_quantizer_type(precision), faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+        else:
+            index = faiss.IndexFlatIP(dimension)
+        index.add(vectors)
+    return index
+
+
+class FaissVectorStore:
+    """
+    Approximate nearest-neighbour store (faiss HNSW / IVF, or exact flat) over
+    normalized embeddings. Implements the similarity_search_by_vector subset of
+    the Chroma API used by RAGKnowledgeBase.
+
+    With precision "float16" or "int8" the index holds quantized vectors; the
+    float32 rows are kept alongside it and the top k * rerank_factor candidates
+    are re-ranked exactly, as the shared-artifact stores do.
+    """
+    def __init__(
+        self,
+        vectors,
+        texts: Sequence[str],
+        backend: str = HNSW,
+        params: Dict[str, Any] = None,
+        precision: str = FLOAT32,
+        rerank_factor: int = 4
+    ):
+        if backend not in DEFAULT_PARAMS:
+            raise ValueError(f"Unknown vector index backend: {backend}")
+        self.texts = list(texts)
+        self.backend = backend
+        self.precision = precision
+        self.rerank_factor = rerank_factor
+        self.vectors = None
+        self.index = None
+        if self.texts:
+            vectors = normalize_rows(vectors)
+            self.index = build_faiss_index(vectors, backend, params, precision)
+            if precision != FLOAT32:
+                self.vectors = vectors
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: Sequence[str],
+        embeddings,
+        backend: str = HNSW,
+        params: Dict[str, Any] = None,
+        precision: str = FLOAT32,
+        rerank_factor: int = 4
+    ) -> "FaissVectorStore":
+        vectors = embeddings.embed_documents(list(texts)) if texts else []
+        return cls(vectors, texts, backend=backend, params=params, precision=precision, rerank_factor=rerank_factor)
+
+    def search(self, embedding, k: int) -> List[tuple]:
+        """Top-k (row, cosine similarity) pairs"""
+        if self.index is None or k <= 0:
+            return []
+        query = normalize_rows(embedding)
+        k = min(k, len(self.texts))
+        if self.vectors is None:
+            scores, rows = self.index.search(query, k)
+            return [(int(row), float(score)) for row, score in zip(rows[0], scores[0]) if row >= 0]
+        scores, rows = self.index.search(query, min(k * max(self.rerank_factor, 1), len(self.texts)))
+        found = rows[0] >= 0
+        return rerank(rows[0][found], scores[0][found], query[0], k, self.vectors)
+
+    def similarity_search_by_vector(self, embedding, k: int = 4) -> List[Document]:
+        return [Document(page_content=self.texts[row]) for row, _ in self.search(embedding, k)]
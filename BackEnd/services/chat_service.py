@@ -4,11 +4,18 @@ from langchain.prompts import PromptTemplate
 from config.settings import settings
 from models.chat import ChatPrompt, ChatResponse
 from services.pdf_service import PDFService
+from services.metrics import timed, record_tokens
+from services.news_index import NewsIndex
+from langchain.callbacks import get_openai_callback
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import logging
 
 class ChatService:
-    def __init__(self):
+    def __init__(self, news_index: NewsIndex = None, news_per_company: int = 3):
         self.pdf_service = PDFService()
+        self.news_index = news_index
+        self.news_per_company = news_per_company
         self.llm = ChatOpenAI(
             api_key=settings.OPENAI_API_KEY,
             model_name=settings.MODEL_NAME,
@@ -16,7 +23,7 @@ class ChatService:
         )
         
         self.prompt_template = PromptTemplate(
-            input_variables=["context", "prompt", "company_data", "fundamental_data"],
+            input_variables=["context", "prompt", "company_data", "fundamental_data", "news_data"],
             template="""
             You are an AI Financial Advisor with access to stock market data and fundamental analysis.
 
@@ -26,6 +33,9 @@ class ChatService:
             Fundamental Analysis:
             {fundamental_data}
 
+            Recent News:
+            {news_data}
+
             Additional Context: {context}
 
             User Question: {prompt}
@@ -46,35 +56,54 @@ class ChatService:
     
     def _get_relevant_company_data(self, prompt: str) -> tuple:
         """Get relevant company data based on the prompt"""
-        companies = self.pdf_service.get_all_companies()
-        relevant_company = None
+        with timed("company_detection"):
+            relevant_company = self.pdf_service.registry.find_in_text(prompt)
         company_data = ""
         fundamental_data = ""
 
-        for company in companies:
-            if company.lower() in prompt.lower():
-                relevant_company = company
-                break
-        
-        if relevant_company:
-            company_data = self.pdf_service.get_company_data(relevant_company)
-            fundamental_data = self.pdf_service.get_fundamental_analysis(relevant_company)
-        else:
-            company_data = "General market data available for: " + ", ".join(companies)
-            fundamental_data = "Please specify a company for detailed fundamental analysis."
+        with timed("pdf_lookup"):
+            if relevant_company and relevant_company.documents:
+                company_data = self.pdf_service.get_company_data(relevant_company.symbol)
+                fundamental_data = self.pdf_service.get_fundamental_analysis(relevant_company.symbol)
+            else:
+                companies = self.pdf_service.get_all_companies()
+                company_data = "General market data available for: " + ", ".join(companies)
+                fundamental_data = "Please specify a company for detailed fundamental analysis."
 
         return company_data, fundamental_data
+
+    def _get_recent_news(self, prompt: str) -> str:
+        """Recent news summaries for every company mentioned in the prompt (or overall), from the news index"""
+        if self.news_index is None or not len(self.news_index):
+            return "No recent news available."
+        symbols = [company.symbol for company in self.pdf_service.registry.find_all_in_text(prompt)]
+        with timed("news_retrieval"):
+            items = self.news_index.search(prompt, symbols=symbols or None, k=self.news_per_company)
+        if not items:
+            return "No recent news available."
+        return "\n".join(
+            f"- [{item['company']}, {item['datetime']}, {item['sentiment'] or 'unclassified'}] "
+            f"{item['headline'] or ''}: {item['summary']}"
+            for item in items
+        )
     
     async def generate_response(self, chat_prompt: ChatPrompt) -> ChatResponse:
         context = chat_prompt.context if chat_prompt.context else "No additional context provided."
-        company_data, fundamental_data = self._get_relevant_company_data(chat_prompt.prompt)
+        # Document store reads and the news query embedding block; run both off the event loop, together
+        (company_data, fundamental_data), news_data = await asyncio.gather(
+            run_in_threadpool(self._get_relevant_company_data, chat_prompt.prompt),
+            run_in_threadpool(self._get_recent_news, chat_prompt.prompt)
+        )
         
-        response = await self.chain.ainvoke({
-            "context": context,
-            "prompt": chat_prompt.prompt,
-            "company_data": company_data,
-            "fundamental_data": fundamental_data
-        })
+        with timed("llm_call"), get_openai_callback() as usage:
+            response = await self.chain.ainvoke({
+                "context": context,
+                "prompt": chat_prompt.prompt,
+                "company_data": company_data,
+                "fundamental_data": fundamental_data,
+                "news_data": news_data
+            })
+        record_tokens("chat", usage)
         logging.info(f"Raw LLM Response: {response['text']}")
         
         return ChatResponse(
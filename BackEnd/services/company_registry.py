@@ -0,0 +1,175 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.company import Company
+
+# Known companies: (symbol, display name, aliases, news search name)
+KNOWN_COMPANIES = [
+    ("RELIANCE", "Reliance Industries Limited", ["Reliance Industries", "Reliance"], "Reliance Industries"),
+    ("TCS", "Tata Consultancy Services", [], "TCS"),
+    ("INFY", "Infosys Limited", ["Infosys"], "Infosys"),
+    ("HDFCBANK", "HDFC Bank Limited", ["HDFC Bank"], "HDFC Bank"),
+    ("ICICIBANK", "ICICI Bank Limited", ["ICICI Bank"], "ICICI Bank"),
+    ("HINDUNILVR", "Hindustan Unilever Limited", ["Hindustan Unilever", "HUL"], "Hindustan Unilever"),
+    ("SBIN", "State Bank of India", ["SBI"], "SBI"),
+    ("BHARTIARTL", "Bharti Airtel Limited", ["Bharti Airtel", "Airtel"], "Bharti Airtel"),
+    ("KOTAKBANK", "Kotak Mahindra Bank Limited", ["Kotak Mahindra Bank", "Kotak Bank"], "Kotak Mahindra Bank"),
+    ("ADANIENT", "Adani Enterprises Limited", ["Adani Enterprises"], "Adani Enterprises"),
+    ("ITC", "ITC Limited", [], "ITC"),
+    ("HCLTECH", "HCL Technologies Limited", ["HCL Technologies", "HCL Tech"], "HCL Technologies"),
+    ("AXISBANK", "Axis Bank Limited", ["Axis Bank"], "Axis Bank"),
+    ("LT", "Larsen & Toubro Limited", ["Larsen & Toubro", "L&T"], "Larsen & Toubro"),
+    ("BAJFINANCE", "Bajaj Finance Limited", ["Bajaj Finance"], "Bajaj Finance"),
+    ("NESTLEIND", "Nestle India Limited", ["Nestle India", "Nestle"], "Nestle India"),
+    ("WIPRO", "Wipro Limited", [], "Wipro"),
+    ("ASIANPAINT", "Asian Paints Limited", ["Asian Paints"], "Asian Paints"),
+    ("MARUTI", "Maruti Suzuki India Limited", ["Maruti Suzuki", "Maruti"], "Maruti Suzuki"),
+    ("TITAN", "Titan Company Limited", ["Titan Company", "Titan"], "Titan Company"),
+    ("APOLLOHOSP", "Apollo Hospitals Enterprise Limited", ["Apollo Hospitals"], None),
+    ("CIPLA", "Cipla Limited", [], None),
+    ("EICHERMOT", "Eicher Motors Limited", ["Eicher Motors"], None),
+    ("HDFCLIFE", "HDFC Life Insurance Company Limited", ["HDFC Life"], None),
+    ("JSWSTEEL", "JSW Steel Limited", ["JSW Steel"], None),
+    ("M&M", "Mahindra & Mahindra Limited", ["Mahindra & Mahindra"], None),
+    ("TECHM", "Tech Mahindra Limited", ["Tech Mahindra"], None),
+    ("ULTRACEMCO", "UltraTech Cement Limited", ["UltraTech Cement", "UltraTech"], None),
+    ("TATASTEEL", "Tata Steel Limited", ["Tata Steel"], None),
+]
+
+REPORT = "report"
+FUNDAMENTALS = "fundamentals"
+
+_FUNDAMENTALS_SUFFIX = "_fundamentals"
+_EXCHANGE_SUFFIX = ".NS"
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a company name, ticker or file stem into a lookup key
+    """
+    key = name.upper().replace("&", " AND ")
+    key = re.sub(r"[^A-Z0-9]+", " ", key).strip()
+    key = re.sub(r"\s+(LIMITED|LTD)$", "", key)
+    return key
+
+
+def parse_document_key(doc_key: str) -> Tuple[str, str]:
+    """
+    Split a PDF document key (file stem) into its company part and document kind
+
+    "RELIANCE.NS_fundamentals" -> ("RELIANCE", "fundamentals")
+    "LARSEN AND TOUBRO"        -> ("LARSEN AND TOUBRO", "report")
+    """
+    base, kind = doc_key, REPORT
+    if base.endswith(_FUNDAMENTALS_SUFFIX):
+        base, kind = base[:-len(_FUNDAMENTALS_SUFFIX)], FUNDAMENTALS
+    if base.upper().endswith(_EXCHANGE_SUFFIX):
+        base = base[:-len(_EXCHANGE_SUFFIX)]
+    return base, kind
+
+
+class CompanyRegistry:
+    def __init__(self, companies: Iterable[tuple] = KNOWN_COMPANIES):
+        """
+        Initialize the registry with the known company table
+        """
+        self._companies: Dict[str, Company] = {}
+        self._index: Dict[str, Company] = {}
+        self._pattern = None
+
+        for symbol, name, aliases, news_name in companies:
+            self.register(Company(symbol=symbol, name=name, aliases=list(aliases), news_name=news_name))
+
+    def register(self, company: Company) -> Company:
+        """
+        Add a company (or merge aliases into an existing one) and index all its names
+        """
+        existing = self._companies.get(company.symbol)
+        if existing:
+            for alias in company.aliases:
+                if alias not in existing.aliases:
+                    existing.aliases.append(alias)
+            company = existing
+        else:
+            self._companies[company.symbol] = company
+
+        for key in (company.symbol, company.name, company.news_name, *company.aliases):
+            if key:
+                self._index.setdefault(normalize_name(key), company)
+        self._pattern = None
+        return company
+
+    def resolve(self, name: str) -> Optional[Company]:
+        """
+        Look up a company by symbol, name, alias or PDF document key
+        """
+        if not name:
+            return None
+        company = self._index.get(normalize_name(name))
+        if company is None:
+            base, _ = parse_document_key(name)
+            company = self._index.get(normalize_name(base))
+        return company
+
+    def _text_pattern(self):
+        if self._pattern is None:
+            keys = sorted(self._index.keys(), key=len, reverse=True)
+            self._pattern = re.compile(
+                r"(?<![A-Z0-9])(" + "|".join(re.escape(key) for key in keys) + r")(?![A-Z0-9])"
+            )
+        return self._pattern
+
+    def find_in_text(self, text: str) -> Optional[Company]:
+        """
+        Return the first known company mentioned in free text, matching whole words only
+        """
+        match = self._text_pattern().search(normalize_name(text))
+        return self._index[match.group(1)] if match else None
+
+    def find_all_in_text(self, text: str) -> List[Company]:
+        """
+        Return every distinct known company mentioned in free text, in order of mention
+        """
+        found = {}
+        for match in self._text_pattern().finditer(normalize_name(text)):
+            company = self._index[match.group(1)]
+            found.setdefault(company.symbol, company)
+        return list(found.values())
+
+    def register_document(self, doc_key: str) -> Optional[Company]:
+        """
+        Attach a PDF document to its company. Fundamentals files carry an exchange
+        ticker, so unknown tickers are registered; other unknown reports stay unassigned.
+        """
+        base, kind = parse_document_key(doc_key)
+        company = self._index.get(normalize_name(base))
+        if company is None and kind == FUNDAMENTALS:
+            company = self.register(Company(symbol=base.upper(), name=base))
+        if company is not None:
+            company.documents.setdefault(kind, doc_key)
+        return company
+
+    def register_catalog(self, products: Iterable) -> None:
+        """
+        Attach investment catalog entries (anything with symbol and name) to companies
+        """
+        for product in products:
+            company = self._companies.get(product.symbol) or self.register(
+                Company(symbol=product.symbol, name=product.name)
+            )
+            company.catalog_entry = product
+
+    def get(self, symbol: str) -> Optional[Company]:
+        return self._companies.get(symbol)
+
+    def companies(self) -> List[Company]:
+        return list(self._companies.values())
+
+    def companies_with_documents(self) -> List[Company]:
+        return [company for company in self._companies.values() if company.documents]
+
+    def news_companies(self) -> List[str]:
+        return [company.news_name for company in self._companies.values() if company.news_name]
+
+
+# Shared registry, populated by PDFService and RAGKnowledgeBase as they load
+company_registry = CompanyRegistry()
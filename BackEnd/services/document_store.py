@@ -0,0 +1,262 @@
+import logging
+import os
+import struct
+import threading
+import zlib
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+# Frame codecs, stored per frame so a file can mix them
+NONE, ZLIB, ZSTD, LZ4 = 0, 1, 2, 3
+CODEC_NAMES = {"none": NONE, "zlib": ZLIB, "zstd": ZSTD, "lz4": LZ4}
+
+INDEX_MAGIC = b"PDFIDX02"
+INDEX_HEADER = struct.Struct("<8sI")
+# is_fundamental, key length, filename length, page count
+DOCUMENT_ENTRY = struct.Struct("<BHHI")
+# offset, compressed length, raw length, codec
+PAGE_ENTRY = struct.Struct("<QIIB")
+
+
+def _zstd():
+    import zstandard
+    return zstandard
+
+
+def _lz4():
+    import lz4.frame
+    return lz4.frame
+
+
+def available_codec(name: str = "auto") -> int:
+    """Resolve a codec name; "auto" picks zstd, then lz4, then zlib, whichever is installed"""
+    if name != "auto":
+        if name not in CODEC_NAMES:
+            raise ValueError(f"Unknown document store codec: {name}")
+        return CODEC_NAMES[name]
+    for codec, loader in ((ZSTD, _zstd), (LZ4, _lz4)):
+        try:
+            loader()
+            return codec
+        except ImportError:
+            continue
+    return ZLIB
+
+
+def compress(data: bytes, codec: int) -> bytes:
+    if codec == ZSTD:
+        return _zstd().ZstdCompressor(level=9).compress(data)
+    if codec == LZ4:
+        return _lz4().compress(data)
+    if codec == ZLIB:
+        return zlib.compress(data, 6)
+    return data
+
+
+def decompress(data: bytes, codec: int, raw_length: int) -> bytes:
+    if codec == ZSTD:
+        return _zstd().ZstdDecompressor().decompress(data, max_output_size=raw_length)
+    if codec == LZ4:
+        return _lz4().decompress(data)
+    if codec == ZLIB:
+        return zlib.decompress(data)
+    return data
+
+
+@dataclass
+class DocumentEntry:
+    filename: str
+    is_fundamental: bool
+    # (offset, compressed length, raw length, codec) per page, in page order
+    pages: List[Tuple[int, int, int, int]] = field(default_factory=list)
+
+
+class DocumentStore(MutableMapping):
+    """
+    doc_key -> {"text", "filename", "is_fundamental"} store backed by two files:
+    `path`, an append-only log of compressed page frames, and `path.idx`, a small
+    binary offset table (metadata and per-page offset, lengths and codec per document).
+
+    Opening reads only the offset table; text is read and decompressed when it is
+    accessed, a page at a time with page()/iter_pages(). Adding a document or page
+    appends frames; flush() then rewrites the offset table, never the frames.
+    Replaced frames are reclaimed by compact(), which flush() runs once dead bytes
+    outweigh live ones.
+    """
+    def __init__(self, path: str, codec: str = "auto"):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.codec = available_codec(codec)
+        self._entries: Dict[str, DocumentEntry] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if os.path.exists(self.index_path) and os.path.exists(path):
+            try:
+                self._entries = self._read_index()
+            except (ValueError, struct.error) as e:
+                logging.warning(f"Discarding unreadable document store index {self.index_path}: {str(e)}")
+        if self._data_end() > (os.path.getsize(path) if os.path.exists(path) else 0):
+            # Offset table points past the frames (e.g. interrupted compaction); start over
+            logging.warning(f"Document store {path} is inconsistent, discarding it")
+            self._entries = {}
+        if os.path.exists(path):
+            # Frames appended after the last flush are not referenced; drop them
+            with open(path, "r+b") as f:
+                f.truncate(self._data_end())
+        else:
+            open(path, "wb").close()
+        self._file = open(path, "r+b")
+
+    def _frames(self) -> Iterator[Tuple[int, int, int, int]]:
+        for entry in self._entries.values():
+            yield from entry.pages
+
+    def _data_end(self) -> int:
+        return max((offset + length for offset, length, _, _ in self._frames()), default=0)
+
+    def _read_index(self) -> Dict[str, DocumentEntry]:
+        with open(self.index_path, "rb") as f:
+            data = f.read()
+        magic, count = INDEX_HEADER.unpack_from(data, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError("not a document store index")
+        entries, position = {}, INDEX_HEADER.size
+        for _ in range(count):
+            is_fundamental, key_length, filename_length, page_count = DOCUMENT_ENTRY.unpack_from(data, position)
+            position += DOCUMENT_ENTRY.size
+            key = data[position:position + key_length].decode("utf-8")
+            position += key_length
+            filename = data[position:position + filename_length].decode("utf-8")
+            position += filename_length
+            pages = []
+            for _ in range(page_count):
+                pages.append(PAGE_ENTRY.unpack_from(data, position))
+                position += PAGE_ENTRY.size
+            entries[key] = DocumentEntry(filename, bool(is_fundamental), pages)
+        return entries
+
+    def _write_index(self):
+        parts = [INDEX_HEADER.pack(INDEX_MAGIC, len(self._entries))]
+        for key, entry in self._entries.items():
+            key_bytes, filename_bytes = key.encode("utf-8"), entry.filename.encode("utf-8")
+            parts.append(DOCUMENT_ENTRY.pack(
+                int(entry.is_fundamental), len(key_bytes), len(filename_bytes), len(entry.pages)
+            ))
+            parts.extend((key_bytes, filename_bytes))
+            parts.extend(PAGE_ENTRY.pack(*page) for page in entry.pages)
+        with open(self.index_path + ".tmp", "wb") as f:
+            f.write(b"".join(parts))
+        os.replace(self.index_path + ".tmp", self.index_path)
+
+    def _read_frame(self, frame: Tuple[int, int, int, int]) -> str:
+        offset, length, raw_length, codec = frame
+        with self._lock:
+            self._file.seek(offset)
+            data = self._file.read(length)
+        return decompress(data, codec, raw_length).decode("utf-8")
+
+    def _append_frame(self, text: str) -> Tuple[int, int, int, int]:
+        raw = text.encode("utf-8")
+        data = compress(raw, self.codec)
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(data)
+            self._dirty = True
+        return offset, len(data), len(raw), self.codec
+
+    def __getitem__(self, doc_key: str) -> Dict:
+        entry = self._entries[doc_key]
+        text = "".join(self._read_frame(frame) for frame in entry.pages)
+        return {"text": text, "filename": entry.filename, "is_fundamental": entry.is_fundamental}
+
+    def __setitem__(self, doc_key: str, record: Dict):
+        """Store a whole document as a single page"""
+        frame = self._append_frame(record.get("text", ""))
+        self._entries[doc_key] = DocumentEntry(
+            record.get("filename") or "", bool(record.get("is_fundamental", False)), [frame]
+        )
+
+    def __delitem__(self, doc_key: str):
+        with self._lock:
+            del self._entries[doc_key]
+            self._dirty = True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, doc_key) -> bool:
+        return doc_key in self._entries
+
+    def start_document(self, doc_key: str, filename: str = "", is_fundamental: bool = False):
+        """Begin (or replace) a document whose pages are then added with append_page"""
+        with self._lock:
+            self._entries[doc_key] = DocumentEntry(filename, is_fundamental)
+            self._dirty = True
+
+    def append_page(self, doc_key: str, text: str) -> int:
+        """Append the next page of a started document; returns its 1-based page number"""
+        frame = self._append_frame(text)
+        entry = self._entries[doc_key]
+        entry.pages.append(frame)
+        return len(entry.pages)
+
+    def page_count(self, doc_key: str) -> int:
+        return len(self._entries[doc_key].pages)
+
+    def page(self, doc_key: str, page_no: int) -> str:
+        """Text of one page (1-based), read and decompressed on its own"""
+        pages = self._entries[doc_key].pages
+        if not 1 <= page_no <= len(pages):
+            raise IndexError(f"{doc_key} has no page {page_no}")
+        return self._read_frame(pages[page_no - 1])
+
+    def iter_pages(self, doc_key: str) -> Iterator[Tuple[int, str]]:
+        """Yield (page_no, text) one decompressed page at a time"""
+        for page_no, frame in enumerate(list(self._entries[doc_key].pages), start=1):
+            yield page_no, self._read_frame(frame)
+
+    @property
+    def live_bytes(self) -> int:
+        return sum(length for _, length, _, _ in self._frames())
+
+    def flush(self):
+        """Persist appended frames and the offset table"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._write_index()
+            self._dirty = False
+            needs_compaction = os.fstat(self._file.fileno()).st_size > 2 * self.live_bytes
+        if needs_compaction:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the frame log without replaced or deleted frames"""
+        with self._lock:
+            entries = {}
+            with open(self.path + ".tmp", "wb") as out:
+                for key, entry in self._entries.items():
+                    pages = []
+                    for offset, length, raw_length, codec in entry.pages:
+                        self._file.seek(offset)
+                        pages.append((out.tell(), length, raw_length, codec))
+                        out.write(self._file.read(length))
+                    entries[key] = DocumentEntry(entry.filename, entry.is_fundamental, pages)
+            self._file.close()
+            os.replace(self.path + ".tmp", self.path)
+            self._entries = entries
+            self._write_index()
+            self._file = open(self.path, "r+b")
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,40 @@
+import hashlib
+import threading
+from typing import Dict, List
+
+from services.metrics import record_cache
+
+
+class CachedEmbeddings:
+    """
+    Embeddings wrapper that remembers document vectors by content hash, so rebuilding
+    an index after a small catalog change only embeds the documents that changed.
+    Queries are passed through uncached.
+    """
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self._vectors: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        with self._lock:
+            missing = {key: text for key, text in zip(keys, texts) if key not in self._vectors}
+        for key in keys:
+            record_cache("embedding", key not in missing)
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            with self._lock:
+                self._vectors.update(zip(missing.keys(), vectors))
+        with self._lock:
+            return [self._vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    def __getattr__(self, attribute):
+        return getattr(self.embeddings, attribute)
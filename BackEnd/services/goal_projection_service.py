@@ -0,0 +1,156 @@
+import numpy as np
+from typing import Any, Dict, List, Sequence
+
+# Correlation of each recommendation bucket with the common market factor
+BUCKET_MARKET_CORRELATION = {"stocks": 0.5, "mutual_funds": 0.7, "debt_funds": 0.1}
+
+
+def risk_to_volatility(risk_score):
+    """
+    Map the catalog's 0-1 risk_score to an annual return volatility
+    (0.2 -> ~3%, 0.5 -> ~12%, 0.7 -> ~20%)
+    """
+    return 0.35 * np.power(np.clip(risk_score, 0.0, 1.0), 1.5)
+
+
+class GoalProjectionService:
+    def __init__(
+        self,
+        simulations: int = 20000,
+        percentiles: Sequence[int] = (5, 25, 50, 75, 95),
+        cash_return: float = 0.04,
+        seed: int = None
+    ):
+        """
+        Initialize the Monte Carlo goal projection engine
+
+        Annual log-returns are normal and i.i.d. per product, correlated through a
+        single market factor, so the value after t years only needs one draw per
+        product and path: log(V_t / V_0) ~ N(t * m, t * s^2).
+        """
+        self.simulations = simulations
+        self.percentiles = tuple(percentiles)
+        self.cash_return = cash_return
+        self.seed = seed
+
+    @staticmethod
+    def _log_parameters(expected_returns, volatilities):
+        """Convert arithmetic mean/volatility of annual returns to log-normal parameters"""
+        expected_returns = np.asarray(expected_returns, dtype=float)
+        volatilities = np.asarray(volatilities, dtype=float)
+        log_variance = np.log1p(np.square(volatilities) / np.square(1 + expected_returns))
+        log_mean = np.log1p(expected_returns) - 0.5 * log_variance
+        return log_mean, np.sqrt(log_variance)
+
+    def _factor_draws(self, rng, products: int, correlations):
+        """Correlated standard normal draws of shape (simulations, products)"""
+        correlations = np.clip(np.asarray(correlations, dtype=float), 0.0, 1.0)
+        market = rng.standard_normal((self.simulations, 1))
+        idiosyncratic = rng.standard_normal((self.simulations, products))
+        return np.sqrt(correlations) * market + np.sqrt(1 - correlations) * idiosyncratic
+
+    @staticmethod
+    def flatten_recommendation(recommended_investments: Dict[str, List[Dict[str, Any]]]):
+        """
+        Turn the recommended_investments buckets into per-product parameter arrays
+        """
+        amounts, expected_returns, risk_scores, correlations = [], [], [], []
+        for bucket, products in recommended_investments.items():
+            for product in products:
+                amounts.append(product["investment_amount"])
+                expected_returns.append(product["expected_returns"])
+                risk_scores.append(product["risk_score"])
+                correlations.append(BUCKET_MARKET_CORRELATION.get(bucket, 0.5))
+        return (
+            np.array(amounts, dtype=float),
+            np.array(expected_returns, dtype=float),
+            risk_to_volatility(np.array(risk_scores, dtype=float)),
+            np.array(correlations, dtype=float)
+        )
+
+    def project(
+        self,
+        recommended_investments: Dict[str, List[Dict[str, Any]]],
+        total_investment: float,
+        time_horizon: int,
+        target_amount: float
+    ) -> Dict[str, Any]:
+        """
+        Simulate the recommended allocation and report goal attainment and yearly percentile bands
+        """
+        amounts, expected_returns, volatilities, correlations = self.flatten_recommendation(recommended_investments)
+        years = max(int(time_horizon), 1)
+        cash = max(total_investment - amounts.sum(), 0.0)
+
+        rng = np.random.default_rng(self.seed)
+        draws = self._factor_draws(rng, len(amounts), correlations)
+        log_mean, log_volatility = self._log_parameters(expected_returns, volatilities)
+
+        # (years, 1, 1) x (simulations, products) -> (years, simulations, products)
+        t = np.arange(1, years + 1, dtype=float)[:, None, None]
+        log_growth = t * log_mean + np.sqrt(t) * log_volatility * draws
+        values = np.exp(log_growth) @ amounts + cash * np.power(1 + self.cash_return, t[:, :, 0])
+
+        terminal = values[-1]
+        bands = np.percentile(values, self.percentiles, axis=1)
+        return {
+            "target_amount": target_amount,
+            "time_horizon": years,
+            "simulations": self.simulations,
+            "probability_of_reaching_target": float(np.mean(terminal >= target_amount)),
+            "expected_value": float(terminal.mean()),
+            "median_value": float(np.median(terminal)),
+            "percentile_bands": [
+                {"year": year, **{f"p{p}": float(bands[i, year - 1]) for i, p in enumerate(self.percentiles)}}
+                for year in range(1, years + 1)
+            ]
+        }
+
+    def project_batch(
+        self,
+        amounts: np.ndarray,
+        expected_returns: np.ndarray,
+        volatilities: np.ndarray,
+        correlations: np.ndarray,
+        horizons: np.ndarray,
+        targets: np.ndarray,
+        cash: np.ndarray = None,
+        chunk_size: int = 64
+    ) -> Dict[str, np.ndarray]:
+        """
+        Evaluate many profiles at once. Product arrays have shape (profiles, products),
+        zero-padded where a profile holds fewer products; horizons/targets have shape
+        (profiles,). All profiles share the same random draws (common random numbers).
+
+        Returns goal probability (profiles,) and terminal percentiles (profiles, len(percentiles)).
+        """
+        amounts = np.atleast_2d(np.asarray(amounts, dtype=float))
+        profiles, products = amounts.shape
+        horizons = np.maximum(np.asarray(horizons, dtype=float), 1.0)
+        targets = np.asarray(targets, dtype=float)
+        cash = np.zeros(profiles) if cash is None else np.asarray(cash, dtype=float)
+
+        rng = np.random.default_rng(self.seed)
+        # Draws are shared; each profile's slot correlations are applied per chunk
+        correlations = np.broadcast_to(np.asarray(correlations, dtype=float), amounts.shape)
+        market = rng.standard_normal((self.simulations, 1))
+        idiosyncratic = rng.standard_normal((self.simulations, products))
+        log_mean, log_volatility = self._log_parameters(
+            np.broadcast_to(expected_returns, amounts.shape),
+            np.broadcast_to(volatilities, amounts.shape)
+        )
+
+        probability = np.empty(profiles)
+        terminal_percentiles = np.empty((profiles, len(self.percentiles)))
+        for start in range(0, profiles, chunk_size):
+            stop = min(start + chunk_size, profiles)
+            rho = correlations[start:stop, None, :]
+            draws = np.sqrt(rho) * market[None] + np.sqrt(1 - rho) * idiosyncratic[None]
+            t = horizons[start:stop, None, None]
+            growth = np.exp(t * log_mean[start:stop, None, :] + np.sqrt(t) * log_volatility[start:stop, None, :] * draws)
+            terminal = np.einsum("bnp,bp->bn", growth, amounts[start:stop])
+            terminal += (cash[start:stop] * np.power(1 + self.cash_return, horizons[start:stop]))[:, None]
+            probability[start:stop] = np.mean(terminal >= targets[start:stop, None], axis=1)
+            terminal_percentiles[start:stop] = np.percentile(terminal, self.percentiles, axis=1).T
+
+        return {"probability": probability, "percentiles": terminal_percentiles}
@@ -5,17 +5,27 @@ from typing import List, Dict, Any
 import pandas as pd
 import json
 import logging
+from services.metrics import timed, record_tokens
+from services.goal_projection_service import GoalProjectionService
+from services.reranker import RerankerService, shared_reranker
+from starlette.concurrency import run_in_threadpool
+from langchain.callbacks import get_openai_callback
 from RagBase.rag_knowledge_base import RAGKnowledgeBase
 from langchain.chat_models import ChatOpenAI
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 
 class InvestmentRecommenderService:
-    def __init__(self, knowledge_base: RAGKnowledgeBase):
+    # Minimum holding period (years) assumed per product type when scoring the catalog
+    RECOMMENDED_HORIZON_YEARS = {"Debt": 1, "Hybrid": 3, "Equity": 5}
+
+    def __init__(self, knowledge_base: RAGKnowledgeBase, reranker: RerankerService = None):
         """
         Initialize investment recommender service
         """
         self.knowledge_base = knowledge_base
+        self.reranker = reranker or shared_reranker()
+        self.goal_projection = GoalProjectionService()
 
         # Initialize LLM
         self.llm = ChatOpenAI(
@@ -64,8 +74,11 @@ The recommendation should be detailed, actionable, and tailored to the user's sp
         """
         Generate comprehensive investment recommendation using LLM
         """
-        # Retrieve contextual insights
-        semantic_context = self.knowledge_base.semantic_search(
+        # Retrieve contextual insights: over-fetch, then keep only the best re-ranked passages.
+        # Embedding the query and scoring the candidates block, so they run off the event loop
+        semantic_context = await run_in_threadpool(
+            self.reranker.retrieve,
+            self.knowledge_base,
             f"Investment strategy for {user_profile['age']} year old with {user_profile['risk_score']} risk tolerance"
         )
 
@@ -96,12 +109,14 @@ The recommendation should be detailed, actionable, and tailored to the user's sp
         # Prepare the input for the chain
         chain_input = {
             "user_context": user_context,
-            "semantic_context": json.dumps(semantic_context, indent=2),
+            "semantic_context": json.dumps(semantic_context, separators=(",", ":")),
             "investment_context": investment_context
         }
 
         # Generate recommendation using the chain
-        recommendation = await self.chain.ainvoke(chain_input)
+        with timed("llm_call"), get_openai_callback() as usage:
+            recommendation = await self.chain.ainvoke(chain_input)
+        record_tokens("investment_recommendation", usage)
         recommendation_text = recommendation["text"]
         logging.info(f"Generated Recommendation: {recommendation_text}")
 
@@ -111,6 +126,23 @@ The recommendation should be detailed, actionable, and tailored to the user's sp
             "recommended_investments": top_investments
         }
 
+    def build_investment_data(self) -> pd.DataFrame:
+        """
+        Flatten the knowledge base catalog into the frame used by _select_top_investments
+        """
+        products = self.knowledge_base.stocks + self.knowledge_base.mutual_funds + self.knowledge_base.debt_funds
+        return pd.DataFrame([
+            {
+                "name": product.name,
+                "type": product.type,
+                "risk_rating": product.risk_score,
+                "returns": product.expected_returns,
+                "recommended_horizon": self.RECOMMENDED_HORIZON_YEARS.get(product.type, 5),
+                "minimum_investment": 0
+            }
+            for product in products
+        ])
+
     def _select_top_investments(
         self,
         investment_data: pd.DataFrame,
@@ -158,8 +190,18 @@ The recommendation should be detailed, actionable, and tailored to the user's sp
         """
         try:
             # Generate recommendation from knowledge base
-            recommendation = self.knowledge_base.generate_comprehensive_recommendation(user_profile)
+            with timed("recommendation"):
+                recommendation = self.knowledge_base.generate_comprehensive_recommendation(user_profile)
             
+            # Project the allocation against the user's target amount and horizon
+            with timed("goal_projection"):
+                recommendation["goal_projection"] = self.goal_projection.project(
+                    recommendation["recommended_investments"],
+                    total_investment=recommendation["total_investment"],
+                    time_horizon=user_profile["time_horizon"],
+                    target_amount=user_profile["target_amount"]
+                )
+
             # Add user profile to response
             recommendation["user_profile"] = user_profile
             
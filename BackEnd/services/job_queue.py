@@ -0,0 +1,257 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+
+class JobStore:
+    """SQLite-backed persistence for job metadata, payloads and results"""
+    def __init__(self, db_path: str):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    lease_until REAL
+                )
+                """
+            )
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in (("owner", "TEXT"), ("lease_until", "REAL")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+
+    def insert(self, job_id: str, kind: str, priority: int, payload: Dict[str, Any]):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, priority, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, priority, json.dumps(payload), now, now)
+            )
+
+    def update(self, job_id: str, status: str, result: Any = None, error: str = None, owner: str = None) -> bool:
+        """
+        Set a job's status and release its lease. With owner, only applies while
+        that owner still holds the job. Returns whether the job was updated.
+        """
+        sql = "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, owner = NULL, lease_until = NULL WHERE id = ?"
+        params = [
+            status,
+            json.dumps(result, default=str) if result is not None else None,
+            error,
+            time.time(),
+            job_id
+        ]
+        if owner is not None:
+            sql += " AND owner = ?"
+            params.append(owner)
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).rowcount == 1
+
+    def claim(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """
+        Atomically move a queued job to running under owner's lease. Only one
+        claimant wins, even across processes sharing the database.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, owner, now + lease_seconds, now, job_id, QUEUED)
+            ).rowcount == 1
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease on a running job; False if owner no longer holds it"""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ? AND owner = ?",
+                (time.time() + lease_seconds, job_id, RUNNING, owner)
+            ).rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def pending(self, queued_before: float = None):
+        """
+        Jobs to pick up, oldest first: queued ones (only those last touched before
+        queued_before, if given) and running ones whose owner's lease has expired,
+        which are put back to queued. Jobs running under a live lease are left alone.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            expired = [row["id"] for row in self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND (lease_until IS NULL OR lease_until < ?)", (RUNNING, now)
+            )]
+            reclaimed = set()
+            for job_id in expired:
+                if self._conn.execute(
+                    "UPDATE jobs SET status = ?, owner = NULL, lease_until = NULL, updated_at = ? "
+                    "WHERE id = ? AND status = ? AND (lease_until IS NULL OR lease_until < ?)",
+                    (QUEUED, now, job_id, RUNNING, now)
+                ).rowcount:
+                    reclaimed.add(job_id)
+            rows = [
+                row for row in self._conn.execute(
+                    "SELECT id, kind, priority, payload, updated_at FROM jobs WHERE status = ? ORDER BY created_at",
+                    (QUEUED,)
+                )
+                if queued_before is None or row["updated_at"] < queued_before or row["id"] in reclaimed
+            ]
+        return [(row["id"], row["kind"], row["priority"], json.loads(row["payload"])) for row in rows]
+
+
+class JobQueue:
+    def __init__(self, db_path: str, workers: int = 2, max_queued: int = 100, lease_seconds: float = 60):
+        """
+        Initialize a bounded, prioritized in-process job queue backed by a JobStore
+
+        Several processes may share the store (server.py --mode prod). A worker runs
+        a job only after claiming it atomically, and holds it under a lease it keeps
+        renewing; jobs whose lease expires (their process died) are picked up again
+        by the periodic recovery sweep of any live process.
+        """
+        self.store = JobStore(db_path)
+        self.workers = workers
+        self.max_queued = max_queued
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        # Ids waiting in this process's queue, so recovery never queues a job twice
+        self._queued_ids = set()
+        self._tasks = []
+        self._sequence = itertools.count()
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any]], Awaitable[Any]]):
+        """Register the coroutine that executes jobs of the given kind"""
+        self._handlers[kind] = handler
+
+    def start(self):
+        """
+        Start the worker tasks on the running event loop and resume jobs left
+        over from a previous process. Called from the app's startup hook; safe to
+        call more than once.
+        """
+        if self._queue is not None:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._queued_ids = set()
+        # Pick up anything left over from a previous process
+        self._recover()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._recovery_loop()))
+
+    def _enqueue(self, priority: int, job_id: str):
+        if job_id not in self._queued_ids:
+            self._queued_ids.add(job_id)
+            self._queue.put_nowait((priority, next(self._sequence), job_id))
+
+    def _recover(self, queued_before: float = None):
+        for job_id, kind, priority, _ in self.store.pending(queued_before):
+            if kind in self._handlers:
+                self._enqueue(priority, job_id)
+
+    async def _recovery_loop(self):
+        """
+        Re-queue jobs whose owner's lease expired, and queued jobs nobody has claimed
+        for a lease period (e.g. queued in memory by a process that has since died)
+        """
+        while True:
+            await asyncio.sleep(self.lease_seconds / 2)
+            try:
+                self._recover(queued_before=time.time() - self.lease_seconds)
+            except Exception as e:
+                logging.error(f"Job recovery failed: {str(e)}")
+
+    async def _keep_lease(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not self.store.renew(job_id, self.owner, self.lease_seconds):
+                logging.warning(f"Lost the lease on job {job_id}")
+                return
+
+    async def submit(self, kind: str, payload: Dict[str, Any], priority: int = 5) -> str:
+        """
+        Persist a job and schedule it. Lower priority values run first.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind: {kind}")
+        self.start()
+        if len(self._queued_ids) >= self.max_queued:
+            raise JobQueueFullError("Job queue is full, try again later")
+
+        job_id = uuid.uuid4().hex
+        self.store.insert(job_id, kind, priority, payload)
+        self._enqueue(priority, job_id)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def stop(self):
+        """Cancel the worker tasks; unfinished jobs are resumed by the next start()"""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._queue = None
+        self._queued_ids = set()
+
+    async def _worker(self):
+        queue, queued_ids = self._queue, self._queued_ids
+        while True:
+            _, _, job_id = await queue.get()
+            queued_ids.discard(job_id)
+            try:
+                # Another worker or process may have run it already
+                if not self.store.claim(job_id, self.owner, self.lease_seconds):
+                    continue
+                job = self.store.get(job_id)
+                lease = asyncio.create_task(self._keep_lease(job_id))
+                try:
+                    result = await self._handlers[job["kind"]](job["payload"])
+                    self.store.update(job_id, SUCCEEDED, result=result, owner=self.owner)
+                except Exception as e:
+                    logging.error(f"Job {job_id} ({job['kind']}) failed: {str(e)}")
+                    self.store.update(job_id, FAILED, error=str(e), owner=self.owner)
+                finally:
+                    lease.cancel()
+            finally:
+                queue.task_done()
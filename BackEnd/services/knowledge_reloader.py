@@ -0,0 +1,116 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from RagBase.knowledge_snapshot import KnowledgeSnapshot, load_snapshot
+
+
+class KnowledgeReloader:
+    def __init__(
+        self,
+        snapshot_path: str,
+        rebuild: Callable[[KnowledgeSnapshot], None],
+        poll_interval: float = 0,
+        rebuilt_marker: Optional[str] = None
+    ):
+        """
+        Initialize hot reloading of the knowledge base snapshot
+
+        rebuild(snapshot) builds the new knowledge base and everything derived from
+        it, then swaps them in; it runs on a background thread, so requests keep being
+        served by the current version until the swap. poll_interval > 0 also watches
+        the snapshot file and reloads when it changes.
+
+        rebuilt_marker is a file another process rewrites when it has rebuilt shared
+        state (the shared artifact manifest in multi-worker mode); the watcher forces
+        a reload when it changes, so a reload requested on one worker reaches all.
+        """
+        self.snapshot_path = snapshot_path
+        self.rebuild = rebuild
+        self.poll_interval = poll_interval
+        self.version: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._watcher: Optional[threading.Thread] = None
+        self.rebuilt_marker = rebuilt_marker
+        self._mtime = self._snapshot_mtime()
+        self._marker_mtime = self._file_mtime(rebuilt_marker)
+
+    @staticmethod
+    def _file_mtime(path: Optional[str]) -> Optional[float]:
+        if not path:
+            return None
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def _snapshot_mtime(self) -> Optional[float]:
+        return self._file_mtime(self.snapshot_path)
+
+    @property
+    def reloading(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def mark_loaded(self, version: str):
+        """Record the version that is currently being served"""
+        self.version = version
+        self.loaded_at = time.time()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "reloading": self.reloading,
+            "last_error": self.last_error,
+        }
+
+    def reload(self, force: bool = False) -> bool:
+        """Start a background reload; returns False if one is already running"""
+        with self._lock:
+            if self.reloading:
+                return False
+            self._thread = threading.Thread(target=self._run, args=(force,), name="knowledge-reload", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self, force: bool):
+        try:
+            self._mtime = self._snapshot_mtime()
+            snapshot = load_snapshot(self.snapshot_path)
+            if snapshot.version == self.version and not force:
+                logging.info(f"Knowledge snapshot {snapshot.version} is already loaded")
+                return
+            self.rebuild(snapshot)
+            # Our own rebuild of shared state must not trigger another reload
+            self._marker_mtime = self._file_mtime(self.rebuilt_marker)
+            self.mark_loaded(snapshot.version)
+            self.last_error = None
+            logging.info(f"Knowledge base version {snapshot.version} is live")
+        except Exception as e:
+            # The current version keeps serving
+            self.last_error = str(e)
+            logging.error(f"Knowledge base reload failed: {str(e)}")
+
+    def start_watching(self):
+        """Poll the snapshot file's mtime and reload when it changes"""
+        if self.poll_interval <= 0 or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name="knowledge-watch", daemon=True)
+        self._watcher.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_interval)
+            mtime = self._snapshot_mtime()
+            marker_mtime = self._file_mtime(self.rebuilt_marker)
+            if mtime is not None and mtime != self._mtime:
+                self.reload()
+            elif marker_mtime is not None and marker_mtime != self._marker_mtime:
+                # Another worker rebuilt the shared state (possibly forced, same version)
+                if self.reload(force=True):
+                    self._marker_mtime = marker_mtime
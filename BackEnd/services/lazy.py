@@ -0,0 +1,70 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from services.metrics import metrics
+
+# Every LazyService created, in creation order (dependencies are created first)
+LAZY_SERVICES: List["LazyService"] = []
+
+
+class LazyService:
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        """
+        Initialize a proxy that builds a service on first use and forwards attribute access to it
+
+        Factories import their service modules themselves, so importing a router
+        does not pull in langchain, pandas or model code until the service is needed.
+        get() and attribute access block while the service is being built; async
+        code resolves it with `await service.aget()` instead.
+        """
+        self.name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+        self.init_seconds: Optional[float] = None
+        LAZY_SERVICES.append(self)
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> Any:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    start = time.perf_counter()
+                    instance = self._factory()
+                    self.init_seconds = time.perf_counter() - start
+                    metrics.observe("app_service_init_duration_seconds", self.init_seconds, service=self.name)
+                    self._instance = instance
+        return self._instance
+
+    async def aget(self) -> Any:
+        """
+        get() for async handlers: a service that isn't built yet (or is being built
+        by the warm-up thread) is waited for in a worker thread, not on the event loop
+        """
+        if self._instance is not None:
+            return self._instance
+        return await run_in_threadpool(self.get)
+
+    def swap(self, instance: Any):
+        """Replace the service with a fully built instance; calls already running keep the old one"""
+        with self._lock:
+            self._instance = instance
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.get(), attribute)
+
+
+def warm_up(services: List[LazyService] = None):
+    """Build services ahead of the first request; failures are logged and retried on first use"""
+    for service in services if services is not None else list(LAZY_SERVICES):
+        try:
+            service.get()
+        except Exception as e:
+            logging.error(f"Warm-up of {service.name} failed: {str(e)}")
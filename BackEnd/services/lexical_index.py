@@ -0,0 +1,82 @@
+import json
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+# Record fields that identify a document; a query equal to one of them is an exact match
+IDENTIFIER_FIELDS = ("symbol", "name", "principle")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def normalize(text: str) -> str:
+    return " ".join(tokenize(text))
+
+
+class BM25Index:
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an Okapi BM25 index over JSON-dumped records
+
+        Also keeps a normalized identifier -> documents map (symbol, name, principle)
+        for exact-match lookups.
+        """
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.lengths: List[int] = []
+        self.identifiers: Dict[str, List[int]] = {}
+
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            self.lengths.append(len(tokens))
+            for token, count in Counter(tokens).items():
+                self.postings.setdefault(token, []).append((doc_id, count))
+            try:
+                record = json.loads(text)
+            except ValueError:
+                continue
+            for field in IDENTIFIER_FIELDS:
+                value = record.get(field) if isinstance(record, dict) else None
+                if isinstance(value, str) and normalize(value):
+                    self.identifiers.setdefault(normalize(value), []).append(doc_id)
+
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+        documents = len(self.lengths)
+        self.idf = {
+            token: math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+            for token, postings in self.postings.items()
+        }
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def exact_matches(self, query: str) -> List[int]:
+        """Documents whose symbol, name or principle equals the query (case and punctuation insensitive)"""
+        return list(self.identifiers.get(normalize(query), []))
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Top-k (doc_id, score) pairs with a positive BM25 score"""
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(query)):
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            for doc_id, count in self.postings[token]:
+                length_norm = 1 - self.b + self.b * self.lengths[doc_id] / self.average_length
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * count * (self.k1 + 1) / (count + self.k1 * length_norm)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int, rank_constant: int = 60) -> List[int]:
+    """Merge ranked doc-id lists by sum(1 / (rank_constant + rank)); ties keep first-seen order"""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (rank_constant + rank)
+    return sorted(scores, key=lambda doc_id: -scores[doc_id])[:k]
@@ -0,0 +1,115 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(label_key, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Initialize an in-process registry of counters and histograms
+        rendered in the Prometheus text exposition format
+        """
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str, tuple]] = {}
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        # name -> label key -> [bucket counts..., sum, count]
+        self._histograms: Dict[str, Dict[tuple, List[float]]] = {}
+
+    def counter(self, name: str, help_text: str):
+        self._meta.setdefault(name, (COUNTER, help_text, ()))
+        self._counters.setdefault(name, {})
+
+    def histogram(self, name: str, help_text: str, buckets: tuple = DEFAULT_BUCKETS):
+        self._meta.setdefault(name, (HISTOGRAM, help_text, tuple(sorted(buckets))))
+        self._histograms.setdefault(name, {})
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        buckets = self._meta[name][2]
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms[name]
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0] * (len(buckets) + 2)
+            index = bisect.bisect_left(buckets, value)
+            if index < len(buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, buckets) in self._meta.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind == COUNTER:
+                    for key, value in self._counters[name].items():
+                        lines.append(f"{name}{_format_labels(key)} {value}")
+                    continue
+                for key, state in self._histograms[name].items():
+                    cumulative = 0
+                    for bound, count in zip(buckets, state):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, (('le', repr(float(bound))),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key, (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {state[-2]}")
+                    lines.append(f"{name}_count{_format_labels(key)} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+metrics.histogram("app_request_duration_seconds", "HTTP request latency by route")
+metrics.histogram("app_stage_duration_seconds", "Latency of individual pipeline stages")
+metrics.counter("app_llm_tokens_total", "LLM tokens consumed, by service and token kind")
+metrics.counter("app_cache_requests_total", "Cache lookups, by cache and result (hit/miss)")
+metrics.histogram("app_service_init_duration_seconds", "Time to build each lazily created service")
+metrics.counter("app_coalesced_requests_total", "Requests by coalescing group and role (leader ran, follower shared)")
+
+
+def timed(stage: str):
+    """Time a pipeline stage, e.g. `with timed("llm_call"): ...`"""
+    return metrics.timer("app_stage_duration_seconds", stage=stage)
+
+
+def record_cache(cache: str, hit: bool):
+    metrics.inc("app_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def record_tokens(service: str, callback):
+    """Record token usage from a langchain OpenAI callback handler"""
+    metrics.inc("app_llm_tokens_total", callback.prompt_tokens, service=service, kind="prompt")
+    metrics.inc("app_llm_tokens_total", callback.completion_tokens, service=service, kind="completion")
@@ -0,0 +1,170 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from services.metrics import timed
+
+
+class NewsIndex:
+    def __init__(
+        self,
+        embeddings=None,
+        half_life_days: float = 3.0,
+        max_age_days: int = 30,
+        max_items: int = 5000,
+        min_similarity: float = 0.2
+    ):
+        """
+        Initialize an in-memory embedding index of recent news summaries
+
+        Items are embedded once, when they are stored, and searched with a
+        freshness-weighted score: cosine similarity * 0.5 ** (age / half_life).
+        embeddings defaults to OpenAIEmbeddings, created on first use.
+        """
+        self._embeddings = embeddings
+        self.half_life_days = half_life_days
+        self.max_age_days = max_age_days
+        self.max_items = max_items
+        self.min_similarity = min_similarity
+
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._symbols = np.array([], dtype=object)
+        self._published = np.array([], dtype=float)
+        self._items: List[Dict[str, Any]] = []
+        self._ids = set()
+        # Stored rows waiting to be embedded by the indexing thread
+        self._pending: "queue.Queue[List[Dict[str, Any]]]" = queue.Queue()
+        self._indexer: Optional[threading.Thread] = None
+
+    @property
+    def embeddings(self):
+        if self._embeddings is None:
+            from langchain.embeddings import OpenAIEmbeddings
+            self._embeddings = OpenAIEmbeddings()
+        return self._embeddings
+
+    def __len__(self):
+        return len(self._items)
+
+    @staticmethod
+    def _text(item: Dict[str, Any]) -> str:
+        return ". ".join(part for part in (item.get("headline"), item.get("summary")) if part)[:2000]
+
+    def attach(self, news_store, background: bool = True):
+        """
+        Load recent items from a NewsStore and keep the index updated as the store grows
+
+        With background=True, newly stored rows are queued and embedded by an
+        indexing thread, so NewsStore.append (called from the news request) never
+        waits on embedding calls.
+        """
+        news_store.subscribe(self.enqueue if background else self.add)
+
+        def load_recent():
+            try:
+                self.add(news_store.since(datetime.now() - timedelta(days=self.max_age_days), self.max_items))
+            except Exception as e:
+                logging.error(f"Loading news index failed: {str(e)}")
+
+        if background and self._indexer is None:
+            self._indexer = threading.Thread(target=self._index_pending, args=(load_recent,), name="news-indexer", daemon=True)
+            self._indexer.start()
+        elif not background:
+            load_recent()
+
+    def enqueue(self, items: List[Dict[str, Any]]):
+        """Queue stored rows for the indexing thread to embed"""
+        if items:
+            self._pending.put(list(items))
+
+    def _index_pending(self, load_recent):
+        """Indexing thread: load recent history, then embed queued rows as they arrive"""
+        load_recent()
+        while True:
+            batch = self._pending.get()
+            # Embed everything queued so far in one call
+            while True:
+                try:
+                    batch.extend(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.add(batch)
+            except Exception as e:
+                logging.error(f"Indexing news failed: {str(e)}")
+
+    def add(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Embed and index stored news rows (dicts with id, symbol, headline, summary, published_at)
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock:
+            new_items = [
+                item for item in items
+                if item["id"] not in self._ids and item["published_at"] >= cutoff
+            ]
+        if not new_items:
+            return 0
+
+        with timed("news_embedding"):
+            vectors = np.asarray(self.embeddings.embed_documents([self._text(item) for item in new_items]), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        with self._lock:
+            fresh = [index for index, item in enumerate(new_items) if item["id"] not in self._ids]
+            new_items = [new_items[index] for index in fresh]
+            vectors = vectors[fresh]
+            self._vectors = vectors if not len(self._items) else np.vstack([self._vectors, vectors])
+            self._items = self._items + new_items
+            self._ids.update(item["id"] for item in new_items)
+            self._symbols = np.array([item["symbol"] for item in self._items], dtype=object)
+            self._published = np.array([item["published_at"] for item in self._items], dtype=float)
+            self._evict(cutoff)
+        return len(new_items)
+
+    def _evict(self, cutoff: float):
+        """Drop items past max_age_days, then the oldest beyond max_items (caller holds the lock)"""
+        keep = np.nonzero(self._published >= cutoff)[0]
+        if len(keep) > self.max_items:
+            keep = keep[np.argsort(-self._published[keep], kind="stable")[:self.max_items]]
+            keep.sort()
+        if len(keep) == len(self._items):
+            return
+        self._vectors = self._vectors[keep]
+        self._symbols = self._symbols[keep]
+        self._published = self._published[keep]
+        self._items = [self._items[index] for index in keep]
+        self._ids = {item["id"] for item in self._items}
+
+    def search(self, query: str, symbols: Optional[List[str]] = None, k: int = 3) -> List[Dict[str, Any]]:
+        """
+        Top-k recent items per symbol (or overall when symbols is None) by freshness-weighted similarity
+        """
+        with self._lock:
+            vectors, item_symbols, published, items = self._vectors, self._symbols, self._published, self._items
+        if not items:
+            return []
+        groups = [item_symbols == symbol for symbol in symbols] if symbols else [np.ones(len(items), dtype=bool)]
+        if not any(mask.any() for mask in groups):
+            return []
+
+        with timed("embedding"):
+            query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        query_vector /= max(float(np.linalg.norm(query_vector)), 1e-12)
+
+        similarity = vectors @ query_vector
+        age_days = np.maximum(time.time() - published, 0.0) / 86400
+        scores = similarity * np.power(0.5, age_days / self.half_life_days)
+
+        results = []
+        for mask in groups:
+            candidates = np.nonzero(mask & (similarity >= self.min_similarity))[0]
+            top = candidates[np.argsort(-scores[candidates], kind="stable")[:k]]
+            results.extend({**items[index], "score": float(scores[index])} for index in top)
+        return results
@@ -1,12 +1,21 @@
+import asyncio
+from collections import OrderedDict
 import pandas as pd
+from typing import Dict, List
+from starlette.concurrency import run_in_threadpool
 from langchain.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from config.settings import settings
 from scraper.news_scraper import NewsScraper
+from services.metrics import timed, record_tokens
+from langchain.callbacks import get_openai_callback
+from services.sentiment_service import SentimentService
+from services.news_store import NewsStore
+from models.news import FULL_MODE, FAST_MODE
 
 class NewsService:
-    def __init__(self):
+    def __init__(self, news_store: NewsStore = None, max_concurrent_summaries: int = 4):
         self.llm = ChatOpenAI(
             api_key=settings.OPENAI_API_KEY,
             model_name=settings.MODEL_NAME,
@@ -16,35 +25,94 @@ class NewsService:
             input_variables=["company", "news_content"],
             template="""\
             Company: {company}
-            News Content: {news_content}
+            News Articles (one per line, with pre-classified sentiment for investment):
+            {news_content}
 
-            Please summarize this news article in 100 words and identify if the news is positive, negative, or neutral for investment.
+            Please summarize this news in 100 words.
             Provide an investment recommendation in 50 words with heading.
             Provide indent of news with heading
             """
         )
         self.summary_chain = LLMChain(llm=self.llm, prompt=self.summary_template)
+        self.sentiment_service = SentimentService()
+        # Kept across refreshes so the HTTP session and cache are reused
+        self.scraper = NewsScraper()
+        self.news_store = news_store
+        self.max_concurrent_summaries = max_concurrent_summaries
 
-    async def fetch_and_summarize_news(self) -> pd.DataFrame:
+    @staticmethod
+    def _extractive_summary(news_content: str, max_words: int = 100) -> str:
+        words = news_content.split()
+        return " ".join(words[:max_words]) + (" ..." if len(words) > max_words else "")
+
+    async def _summarize_companies(self, rows) -> Dict[str, str]:
+        """One summary per company from its deduplicated article texts"""
+        articles = OrderedDict()
+        for row, sentiment in rows:
+            company_articles = articles.setdefault(row["company"], OrderedDict())
+            company_articles.setdefault(" ".join(row["news"].lower().split()), f"- {row['news']} ({sentiment['label']})")
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_summaries)
+
+        async def summarize(company: str, lines: List[str]) -> str:
+            async with semaphore:
+                with timed("llm_call"), get_openai_callback() as usage:
+                    response = await self.summary_chain.ainvoke({
+                        "company": company,
+                        "news_content": "\n".join(lines)
+                    })
+                record_tokens("news_summary", usage)
+                return response["text"]
+
+        results = await asyncio.gather(*(
+            summarize(company, list(company_articles.values()))
+            for company, company_articles in articles.items()
+        ))
+        return dict(zip(articles, results))
+
+    async def fetch_and_summarize_news(self, mode: str = FULL_MODE) -> pd.DataFrame:
         """
         Fetch news and generate summarized insights for each headline.
+
+        Sentiment for every item is classified locally in one batch. In "full" mode
+        each company's articles are summarized together in one LLM call, and the
+        companies are summarized concurrently. In "fast" mode the LLM is skipped and
+        the summary is the leading text of the news.
         """
-        scraper = NewsScraper()
-        news_df = scraper.fetch_news()
-        #print(news_df)
+        with timed("scraping"):
+            news_df = await run_in_threadpool(self.scraper.fetch_news)
+
+        with timed("sentiment"):
+            sentiments = await run_in_threadpool(
+                self.sentiment_service.classify, news_df["news"].tolist() if len(news_df) else []
+            )
+
+        rows = list(zip((row for _, row in news_df.iterrows()), sentiments))
+        if mode == FAST_MODE:
+            company_summaries = {}
+        else:
+            company_summaries = await self._summarize_companies(rows)
+
         summaries = []
-        for _, row in news_df.iterrows():
-            response = await self.summary_chain.ainvoke({
-                "company": row["company"],
-                "news_content": row["news"]  # Use 'news' content now instead of headline
-            })
-            #print(type(response))
-            #print(response)
+        for row, sentiment in rows:
+            if mode == FAST_MODE:
+                summary = self._extractive_summary(row["news"])
+            else:
+                summary = company_summaries[row["company"]]
             summaries.append({
                 "company": row["company"],
+                "headline": row["headline"],
+                "source": row["source"],
+                "link": row["link"],
                 "news_content": row["news"],  # Storing the raw content
-                "summary": response["text"],
+                "summary": summary,
+                "sentiment": sentiment["label"],
+                "sentiment_score": sentiment["score"],
                 "datetime": row["datetime"],
             })
 
+        if self.news_store is not None:
+            with timed("news_store"):
+                await run_in_threadpool(self.news_store.append, summaries)
+
         return pd.DataFrame(summaries)
@@ -0,0 +1,174 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.company_registry import company_registry, CompanyRegistry
+
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def encode_cursor(published_at: float, row_id: int) -> str:
+    return f"{published_at!r}:{row_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        published_at, row_id = cursor.split(":")
+        return float(published_at), int(row_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+class NewsStore:
+    """Append-only SQLite history of summarized news, indexed by company and publish time"""
+    def __init__(self, db_path: str, registry: CompanyRegistry = company_registry):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.registry = registry
+        self._subscribers: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS news (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    company TEXT NOT NULL,
+                    article_key TEXT NOT NULL,
+                    headline TEXT,
+                    source TEXT,
+                    link TEXT,
+                    news_content TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    sentiment TEXT,
+                    sentiment_score REAL,
+                    published_at REAL NOT NULL,
+                    stored_at REAL NOT NULL,
+                    UNIQUE (symbol, article_key)
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_news_symbol_published ON news (symbol, published_at DESC, id DESC)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_news_published ON news (published_at DESC)")
+
+    def _symbol(self, company: str) -> str:
+        resolved = self.registry.resolve(company)
+        return resolved.symbol if resolved else company.upper()
+
+    @staticmethod
+    def _article_key(item: Dict[str, Any]) -> str:
+        key = item.get("link") or item.get("headline") or item["news_content"]
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def subscribe(self, callback: Callable[[List[Dict[str, Any]]], None]):
+        """Call callback with the newly stored rows after every append"""
+        self._subscribers.append(callback)
+
+    def append(self, items: Iterable[Dict[str, Any]]) -> int:
+        """
+        Store summarized news rows (the NewsService output). Articles already stored
+        for a company are left untouched. Returns the number of new rows.
+        """
+        now = time.time()
+        rows = []
+        for item in items:
+            if not (item.get("link") or item.get("headline")):
+                # "No news found" placeholders carry no article
+                continue
+            published = datetime.strptime(item["datetime"], DATETIME_FORMAT).timestamp()
+            rows.append((
+                self._symbol(item["company"]), item["company"], self._article_key(item),
+                item.get("headline"), item.get("source"), item.get("link"),
+                item["news_content"], item["summary"], item.get("sentiment"), item.get("sentiment_score"),
+                published, now
+            ))
+        inserted = []
+        with self._lock, self._conn:
+            for row in rows:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO news (symbol, company, article_key, headline, source, link, news_content, "
+                    "summary, sentiment, sentiment_score, published_at, stored_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    row
+                )
+                if cursor.rowcount:
+                    inserted.append(cursor.lastrowid)
+            new_rows = self._fetch_ids(inserted)
+
+        for callback in self._subscribers:
+            try:
+                callback(new_rows)
+            except Exception as e:
+                logging.error(f"News store subscriber failed: {str(e)}")
+        return len(inserted)
+
+    def _fetch_ids(self, ids: List[int]) -> List[Dict[str, Any]]:
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows.extend(self._to_item(row) for row in self._conn.execute(
+                f"SELECT * FROM news WHERE id IN ({','.join('?' * len(chunk))}) ORDER BY id", chunk
+            ))
+        return rows
+
+    def since(self, start: datetime, limit: int = 5000) -> List[Dict[str, Any]]:
+        """All companies' stored news published after start, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM news WHERE published_at >= ? ORDER BY published_at DESC LIMIT ?",
+                (start.timestamp(), limit)
+            ).fetchall()
+        return [self._to_item(row) for row in rows]
+
+    @staticmethod
+    def _to_item(row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        item["datetime"] = datetime.fromtimestamp(item["published_at"]).strftime(DATETIME_FORMAT)
+        return item
+
+    def query(
+        self,
+        company: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Newest-first page of a company's stored news between start and end.
+        Pagination is keyset-based: pass back next_cursor to get the following page.
+        """
+        symbol = self._symbol(company)
+        sql = "SELECT * FROM news WHERE symbol = ?"
+        params: List[Any] = [symbol]
+        if start is not None:
+            sql += " AND published_at >= ?"
+            params.append(start.timestamp())
+        if end is not None:
+            sql += " AND published_at <= ?"
+            params.append(end.timestamp())
+        if cursor:
+            published_at, row_id = decode_cursor(cursor)
+            sql += " AND (published_at < ? OR (published_at = ? AND id < ?))"
+            params.extend([published_at, published_at, row_id])
+        sql += " ORDER BY published_at DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        items = [self._to_item(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last["published_at"], last["id"])
+        return {"symbol": symbol, "items": items, "next_cursor": next_cursor}
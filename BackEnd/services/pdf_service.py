@@ -1,62 +1,111 @@
 import PyPDF2
 import os
-from typing import Dict, List
-import json
+from typing import Dict, Iterator, List, Tuple
+from config.settings import settings
+from services.metrics import record_cache
+from services.document_store import DocumentStore
+from services.company_registry import company_registry, CompanyRegistry, REPORT, FUNDAMENTALS
+
+def iter_pdf_pages(filepath: str, doc_key: str = None) -> Iterator[Tuple[str, int, str]]:
+    """
+    Stream (doc_key, page_no, text) records from a PDF, 1-based page numbers
+
+    Pages are parsed one at a time and the reader's resolved-object cache is cleared
+    after each, so memory stays bounded by the largest page rather than the file.
+    """
+    doc_key = doc_key or os.path.splitext(os.path.basename(filepath))[0]
+    with open(filepath, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        for page_no, page in enumerate(reader.pages, start=1):
+            yield doc_key, page_no, page.extract_text()
+            reader.resolved_objects.clear()
+
 
 class PDFService:
-    def __init__(self):
+    def __init__(
+        self,
+        registry: CompanyRegistry = company_registry,
+        data_dir: str = None,
+        cache_file: str = None,
+        shared_artifacts_dir: str = None
+    ):
+        """
+        Initialize PDF text access. With a shared artifacts directory (defaults to
+        SHARED_ARTIFACTS_DIR) the text is read from the memory-mapped blob shared by
+        all workers; otherwise PDFs are extracted and cached in-process.
+        """
         current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        self.data_dir = os.path.join(current_dir, "Data")
-        self.cache_file = os.path.join(current_dir, "BackEnd", "cache", "pdf_cache.json")
-        self.processed_data = self._load_cache() or self._process_pdfs()
+        self.data_dir = data_dir or os.path.join(current_dir, "Data")
+        self.cache_file = cache_file or os.path.join(current_dir, "BackEnd", "cache", "pdf_cache.bin")
+        self.registry = registry
+        if shared_artifacts_dir is None:
+            shared_artifacts_dir = settings.SHARED_ARTIFACTS_DIR
+        if shared_artifacts_dir:
+            from services.shared_artifacts import MappedTextTable
+            self.processed_data = MappedTextTable(shared_artifacts_dir)
+        else:
+            self.processed_data = self._load_cache()
+            self._process_pdfs()
+        for doc_key in self.processed_data:
+            self.registry.register_document(doc_key)
     
-    def _load_cache(self) -> Dict:
-        if os.path.exists(self.cache_file):
-            with open(self.cache_file, 'r') as f:
-                return json.load(f)
-        return None
+    def _load_cache(self) -> DocumentStore:
+        """
+        Open the compressed document store: only its offset table is read up front and
+        texts are decompressed on access. Documents missing from it are extracted page
+        by page by _process_pdfs.
+        """
+        return DocumentStore(self.cache_file, codec=settings.PDF_CACHE_CODEC)
 
     def _save_cache(self):
-        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-        with open(self.cache_file, 'w') as f:
-            json.dump(self.processed_data, f)
+        # Appended frames are already on disk; this writes the offset table
+        self.processed_data.flush()
 
     def _process_pdfs(self) -> Dict:
-        data = {}
-        for filename in os.listdir(self.data_dir):
+        """Extract text for every PDF in the data directory that is not cached yet, a page at a time"""
+        data = self.processed_data
+        for filename in sorted(os.listdir(self.data_dir)):
             if filename.endswith('.pdf'):
-                filepath = os.path.join(self.data_dir, filename)
-                company_name = filename.split('.')[0]
-                with open(filepath, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text()
-                data[company_name] = {
-                    'text': text,
-                    'filename': filename,
-                    'is_fundamental': '_fundamentals' in filename
-                }
-        
-        self.processed_data = data
-        self._save_cache()
+                # Key by the full file stem so "X.pdf" and "X.NS_fundamentals.pdf" don't collide
+                doc_key = os.path.splitext(filename)[0]
+                record_cache("pdf_cache", doc_key in data)
+                if doc_key in data:
+                    continue
+                data.start_document(doc_key, filename=filename, is_fundamental='_fundamentals' in filename)
+                for _, _, text in iter_pdf_pages(os.path.join(self.data_dir, filename), doc_key):
+                    data.append_page(doc_key, text)
+                # One document at a time, so an interrupted run keeps everything finished so far
+                self._save_cache()
         return data
 
+    def _get_document_text(self, company_name: str, kind: str) -> str:
+        company = self.registry.resolve(company_name)
+        if company is None or kind not in company.documents:
+            record_cache("pdf_lookup", False)
+            return ''
+        record_cache("pdf_lookup", True)
+        return self.processed_data[company.documents[kind]].get('text', '')
+
     def get_company_data(self, company_name: str) -> Dict:
-        return self.processed_data.get(company_name, {})
+        company = self.registry.resolve(company_name)
+        if company is None:
+            return self.processed_data.get(company_name, {})
+        doc_key = company.documents.get(REPORT) or company.documents.get(FUNDAMENTALS)
+        return self.processed_data.get(doc_key, {})
+
+    def get_page(self, doc_key: str, page_no: int) -> str:
+        """Text of a single page (1-based) without loading the rest of the document"""
+        return self.processed_data.page(doc_key, page_no)
+
+    def iter_pages(self, doc_key: str) -> Iterator[Tuple[int, str]]:
+        """Yield (page_no, text) for a document, one page in memory at a time"""
+        return self.processed_data.iter_pages(doc_key)
 
     def get_all_companies(self) -> List[str]:
-        companies = set()
-        for company in self.processed_data.keys():
-            base_name = company.replace('_fundamentals', '')
-            companies.add(base_name)
-        return list(companies)
+        return [company.symbol for company in self.registry.companies_with_documents()]
 
     def get_fundamental_analysis(self, company_name: str) -> str:
-        fundamental_name = f"{company_name}_fundamentals"
-        if fundamental_name in self.processed_data:
-            return self.processed_data[fundamental_name].get('text', '')
-        return ''
+        return self._get_document_text(company_name, FUNDAMENTALS)
 
     def search_company_data(self, query: str) -> List[Dict]:
         results = []
@@ -0,0 +1,139 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+from services.goal_projection_service import risk_to_volatility
+
+# Correlation with the market factor for products that don't carry a beta
+TYPE_MARKET_CORRELATION = {"Equity": 0.7, "Hybrid": 0.6, "Debt": 0.1}
+
+
+@dataclass
+class Frontier:
+    """Long-only efficient frontier, ordered from most to least risk averse"""
+    risk_aversion: np.ndarray
+    weights: np.ndarray
+    expected_returns: np.ndarray
+    volatilities: np.ndarray
+
+
+def project_to_capped_simplex(values: np.ndarray, cap: float, iterations: int = 40) -> np.ndarray:
+    """
+    Euclidean projection of each row onto {w : 0 <= w <= cap, sum(w) = 1},
+    by bisection on the shift tau in clip(v - tau, 0, cap)
+    """
+    low = values.min(axis=1, keepdims=True) - 1.0
+    high = values.max(axis=1, keepdims=True)
+    for _ in range(iterations):
+        tau = (low + high) / 2
+        total = np.clip(values - tau, 0.0, cap).sum(axis=1, keepdims=True)
+        low = np.where(total > 1, tau, low)
+        high = np.where(total > 1, high, tau)
+    return np.clip(values - (low + high) / 2, 0.0, cap)
+
+
+class PortfolioOptimizer:
+    def __init__(
+        self,
+        market_volatility: float = 0.18,
+        frontier_points: int = 41,
+        risk_aversion_range: Sequence[float] = (0.5, 50.0),
+        max_weight: float = 0.6,
+        iterations: int = 400,
+        cache_size: int = 256
+    ):
+        """
+        Initialize a mean-variance optimizer over a single-index covariance model
+
+        Each distinct candidate set (and its product parameters) gets its frontier
+        solved once and cached; requests then pick a point by the user's risk score.
+        """
+        self.market_volatility = market_volatility
+        self.frontier_points = frontier_points
+        self.risk_aversion_range = risk_aversion_range
+        self.max_weight = max_weight
+        self.iterations = iterations
+        self.cache_size = cache_size
+        self._frontiers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def covariance(self, products: Sequence) -> np.ndarray:
+        """
+        Single-index model: cov = b b' * market_var + diag(idiosyncratic_var).
+        Stocks load on the market through beta and take their idiosyncratic
+        volatility from risk_score; funds split their risk_score volatility by
+        a type-level market correlation.
+        """
+        loadings, idiosyncratic = [], []
+        for product in products:
+            volatility = float(risk_to_volatility(product.risk_score))
+            beta = getattr(product, "beta", None)
+            if beta is not None:
+                loadings.append(beta * self.market_volatility)
+                idiosyncratic.append(volatility)
+            else:
+                correlation = TYPE_MARKET_CORRELATION.get(product.type, 0.5)
+                loadings.append(np.sqrt(correlation) * volatility)
+                idiosyncratic.append(np.sqrt(1 - correlation) * volatility)
+        loadings = np.array(loadings)
+        return np.outer(loadings, loadings) + np.diag(np.square(idiosyncratic))
+
+    def _solve_frontier(self, products: Sequence) -> Frontier:
+        mean = np.array([product.expected_returns for product in products], dtype=float)
+        covariance = self.covariance(products)
+        count = len(products)
+        cap = max(self.max_weight, 1.0 / count)
+
+        # Solve max w'mu - (lambda / 2) w'Sigma w for every lambda at once by projected gradient
+        risk_aversion = np.geomspace(self.risk_aversion_range[1], self.risk_aversion_range[0], self.frontier_points)
+        step = 1.0 / (risk_aversion * np.linalg.eigvalsh(covariance)[-1])
+        weights = np.full((self.frontier_points, count), 1.0 / count)
+        for _ in range(self.iterations):
+            gradient = mean - risk_aversion[:, None] * (weights @ covariance)
+            updated = project_to_capped_simplex(weights + step[:, None] * gradient, cap)
+            converged = np.abs(updated - weights).max() < 1e-7
+            weights = updated
+            if converged:
+                break
+
+        return Frontier(
+            risk_aversion=risk_aversion,
+            weights=weights,
+            expected_returns=weights @ mean,
+            volatilities=np.sqrt(np.einsum("kp,pq,kq->k", weights, covariance, weights))
+        )
+
+    def frontier(self, products: Sequence) -> Frontier:
+        """Return the cached frontier for this candidate set, solving it on first use"""
+        key = tuple(
+            (product.name, product.expected_returns, product.risk_score, getattr(product, "beta", None))
+            for product in products
+        )
+        with self._lock:
+            frontier = self._frontiers.get(key)
+            if frontier is not None:
+                self._frontiers.move_to_end(key)
+                return frontier
+        frontier = self._solve_frontier(products)
+        with self._lock:
+            self._frontiers[key] = frontier
+            if len(self._frontiers) > self.cache_size:
+                self._frontiers.popitem(last=False)
+        return frontier
+
+    def allocate(self, products: Sequence, risk_score: float) -> List[float]:
+        """
+        Weights (summing to 1) for the products at the frontier point matching a 0-100 risk score
+        """
+        if not products:
+            return []
+        if len(products) == 1:
+            return [1.0]
+        frontier = self.frontier(products)
+        index = int(round(np.clip(risk_score, 0, 100) / 100 * (self.frontier_points - 1)))
+        # Drop negligible positions left over from the iterative solve
+        weights = np.where(frontier.weights[index] < 1e-3, 0.0, frontier.weights[index])
+        return (weights / weights.sum()).tolist()
@@ -0,0 +1,136 @@
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+# Storage precisions for embedding matrices
+FLOAT32 = "float32"
+FLOAT16 = "float16"
+INT8 = "int8"
+PRECISIONS = (FLOAT32, FLOAT16, INT8)
+
+# Rows encoded or scanned at a time, so a (possibly memory-mapped) matrix is never copied whole
+CHUNK_ROWS = 16384
+# Rows sampled to train the int8 per-dimension ranges
+TRAIN_SAMPLE_ROWS = 65536
+
+
+def faiss_quantizer_type(precision: str):
+    """faiss ScalarQuantizer type for a quantized precision"""
+    import faiss
+
+    if precision == FLOAT16:
+        return faiss.ScalarQuantizer.QT_fp16
+    if precision == INT8:
+        return faiss.ScalarQuantizer.QT_8bit
+    raise ValueError(f"Unsupported quantized precision: {precision}")
+
+
+def artifact_paths(directory: str, name: str, precision: str) -> Tuple[str, str]:
+    """Paths of a saved matrix's codes and its trained quantizer"""
+    prefix = os.path.join(directory, f"{name}.{precision}")
+    return prefix + ".codes.npy", prefix + ".sq"
+
+
+class QuantizedMatrix:
+    def __init__(self, codes: np.ndarray, quantizer, precision: str):
+        """
+        Initialize a scalar-quantized matrix from its codes (one row of bytes per
+        vector, possibly a read-only memory map) and the trained faiss quantizer
+        that decodes them. Build one with encode(), or load() a saved one.
+
+        float16 halves the memory of a float32 matrix, int8 (per-dimension ranges
+        trained on a sample) cuts it ~4x.
+        """
+        self.codes = codes
+        self.quantizer = quantizer
+        self.precision = precision
+
+    @classmethod
+    def encode(cls, vectors: np.ndarray, precision: str = INT8) -> "QuantizedMatrix":
+        """
+        Quantize a row-normalized float32 matrix. vectors may be a memory map; it is
+        read in chunks so the full float32 matrix is never copied into memory.
+        """
+        import faiss
+
+        quantizer = faiss.IndexScalarQuantizer(vectors.shape[1], faiss_quantizer_type(precision), faiss.METRIC_INNER_PRODUCT)
+        if len(vectors):
+            step = max(1, len(vectors) // TRAIN_SAMPLE_ROWS)
+            quantizer.train(np.ascontiguousarray(vectors[::step], dtype=np.float32))
+        codes = np.empty((len(vectors), quantizer.sa_code_size()), dtype=np.uint8)
+        for start in range(0, len(vectors), CHUNK_ROWS):
+            codes[start:start + CHUNK_ROWS] = quantizer.sa_encode(
+                np.ascontiguousarray(vectors[start:start + CHUNK_ROWS], dtype=np.float32)
+            )
+        return cls(codes, quantizer, precision)
+
+    def save(self, directory: str, name: str):
+        """Write the codes (.codes.npy) and trained quantizer (.sq) next to the float32 matrix"""
+        import faiss
+
+        codes_path, quantizer_path = artifact_paths(directory, name, self.precision)
+        np.save(codes_path, self.codes)
+        faiss.write_index(self.quantizer, quantizer_path)
+
+    @classmethod
+    def load(cls, directory: str, name: str, precision: str) -> "QuantizedMatrix":
+        """Memory-map saved codes, so every process loading them shares one page-cache copy"""
+        import faiss
+
+        codes_path, quantizer_path = artifact_paths(directory, name, precision)
+        return cls(np.load(codes_path, mmap_mode="r"), faiss.read_index(quantizer_path), precision)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+    def candidates(self, query: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best `count` (rows, approximate scores) for a query, scored by faiss directly
+        on the codes: each chunk is copied into a scratch index, never decoded to float32
+        """
+        import faiss
+
+        scanner = faiss.clone_index(self.quantizer)
+        query = np.ascontiguousarray(np.asarray(query, dtype=np.float32).reshape(1, -1))
+        rows, scores = [], []
+        for start in range(0, len(self), CHUNK_ROWS):
+            chunk = np.ascontiguousarray(self.codes[start:start + CHUNK_ROWS])
+            faiss.copy_array_to_vector(chunk.ravel(), scanner.codes)
+            scanner.ntotal = len(chunk)
+            chunk_scores, chunk_rows = scanner.search(query, min(count, len(chunk)))
+            rows.append(chunk_rows[0] + start)
+            scores.append(chunk_scores[0])
+        scanner.reset()
+        rows, scores = np.concatenate(rows), np.concatenate(scores)
+        best = np.argpartition(-scores, count - 1)[:count]
+        return rows[best], scores[best]
+
+    def search(self, query: np.ndarray, k: int, exact: np.ndarray = None, rerank_factor: int = 4) -> List[Tuple[int, float]]:
+        """
+        Top-k (row, score) pairs for a normalized float32 query. With the full-precision
+        matrix as `exact`, the best k * rerank_factor approximate candidates are
+        re-scored exactly, so only those rows of it are read.
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        count = min(len(self), k * max(rerank_factor, 1)) if exact is not None else k
+        rows, scores = self.candidates(query, count)
+        return rerank(rows, scores, query, k, exact)
+
+
+def rerank(rows: np.ndarray, scores: np.ndarray, query: np.ndarray, k: int, exact: np.ndarray = None) -> List[Tuple[int, float]]:
+    """
+    Top-k (row, score) pairs among candidate rows, re-scored against the full-precision
+    matrix `exact` when given (rows are read in order, so a memory map is read sequentially)
+    """
+    if exact is not None:
+        rows = np.sort(rows)
+        scores = np.asarray(exact[rows], dtype=np.float32) @ np.asarray(query, dtype=np.float32).reshape(-1)
+    top = np.argsort(-scores, kind="stable")[:k]
+    return [(int(row), float(score)) for row, score in zip(rows[top], scores[top])]
@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+from RagBase.rag_knowledge_base import RAGKnowledgeBase
+from models.rebalance import ASSET_CLASSES
+from services.company_registry import company_registry, CompanyRegistry
+EQUITY, DEBT, ALTERNATIVES = range(3)
+
+
+class RebalancingService:
+    def __init__(
+        self,
+        knowledge_base: RAGKnowledgeBase,
+        drift_threshold: float = 0.05,
+        min_trade_amount: float = 1.0,
+        registry: CompanyRegistry = company_registry
+    ):
+        """
+        Initialize the bulk rebalancing engine
+
+        Holdings are classified through the catalog (stocks and mutual funds are
+        equity, debt funds are debt); other listed companies known to the registry
+        are equity. Symbols found in neither are rejected rather than guessed.
+        """
+        self.knowledge_base = knowledge_base
+        self.drift_threshold = drift_threshold
+        self.min_trade_amount = min_trade_amount
+        self.registry = registry
+
+        self._asset_class: Dict[str, int] = {}
+        for stock in knowledge_base.stocks:
+            self._asset_class[stock.symbol.upper()] = EQUITY
+            self._asset_class[stock.name.upper()] = EQUITY
+        for fund in knowledge_base.mutual_funds:
+            self._asset_class[fund.name.upper()] = EQUITY
+        for fund in knowledge_base.debt_funds:
+            self._asset_class[fund.name.upper()] = DEBT
+
+        self._targets: Dict[int, tuple] = {}
+
+    def _classify(self, symbols: pd.Series) -> np.ndarray:
+        """
+        Asset class code per holding symbol, resolving symbols outside the catalog
+        through the company registry (cached). Raises ValueError for unknown symbols.
+        """
+        keys = symbols.astype(str).str.upper()
+        unknown = []
+        for key in keys.unique():
+            if key not in self._asset_class:
+                if self.registry.resolve(key) is None:
+                    unknown.append(key)
+                else:
+                    self._asset_class[key] = EQUITY
+        if unknown:
+            raise ValueError(f"Unknown holding symbols: {', '.join(sorted(unknown))}")
+        return keys.map(self._asset_class).to_numpy(dtype=int)
+
+    def _target_for_risk(self, risk_score: int) -> tuple:
+        """
+        Target class weights and default buy product per class for a risk score (cached)
+        """
+        if risk_score not in self._targets:
+            profile = {"risk_score": risk_score}
+            allocation = self.knowledge_base._determine_asset_allocation(profile)
+            products = self.knowledge_base.allocate_products(profile, 1.0, allocation)
+
+            defaults = [None, None, None]
+            for bucket, asset_class in (("stocks", EQUITY), ("mutual_funds", EQUITY), ("debt_funds", DEBT)):
+                for product, amount in zip(*products[bucket]):
+                    best = defaults[asset_class]
+                    if amount > 0 and (best is None or amount > best[1]):
+                        defaults[asset_class] = (getattr(product, "symbol", None) or product.name, amount)
+
+            self._targets[risk_score] = (
+                [allocation[name] for name in ASSET_CLASSES],
+                [default[0] if default else None for default in defaults]
+            )
+        return self._targets[risk_score]
+
+    def rebalance(self, clients: pd.DataFrame, holdings: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Compute drift and trade lists for many clients at once.
+
+        clients:  client_id, risk_score
+        holdings: client_id, symbol, amount (market value)
+
+        Raises ValueError for unknown client_id values or holding symbols.
+
+        Clients whose weight in any asset class drifts more than drift_threshold from
+        target are brought back to target. Sells take from the largest holdings in an
+        overweight class first; each underweight class gets a single buy, into the
+        client's largest holding of that class or the recommended product for their
+        risk score. Buys with no eligible product are reported as unallocated cash.
+
+        Returns {"drift": per-client summary, "trades": one row per trade}.
+        """
+        client_ids = pd.Index(clients["client_id"])
+        if client_ids.has_duplicates:
+            raise ValueError("Duplicate client_id in clients")
+        client_count = len(client_ids)
+
+        holdings = holdings.groupby(["client_id", "symbol"], as_index=False, sort=False)["amount"].sum()
+        client_codes = client_ids.get_indexer(holdings["client_id"])
+        if (client_codes < 0).any():
+            raise ValueError("Holdings reference unknown client_id values")
+        symbols = holdings["symbol"].astype(str).to_numpy()
+        amounts = holdings["amount"].to_numpy(dtype=float)
+        asset_classes = self._classify(holdings["symbol"])
+
+        # Targets and default products per distinct risk score
+        risk_scores = clients["risk_score"].to_numpy(dtype=int)
+        unique_risks, risk_codes = np.unique(risk_scores, return_inverse=True)
+        unique_targets = [self._target_for_risk(int(risk)) for risk in unique_risks]
+        targets = np.array([target for target, _ in unique_targets])[risk_codes]
+        default_products = np.array([defaults for _, defaults in unique_targets], dtype=object)[risk_codes]
+
+        # Current value per client and asset class
+        groups = client_codes * 3 + asset_classes
+        current = np.bincount(groups, weights=amounts, minlength=client_count * 3).reshape(client_count, 3)
+        totals = current.sum(axis=1)
+        safe_totals = np.where(totals > 0, totals, 1.0)
+        weights = current / safe_totals[:, None]
+        drift = weights - targets
+        needs_rebalance = (np.abs(drift) > self.drift_threshold).any(axis=1) & (totals > 0)
+
+        # Positive need = amount to sell, negative = amount to buy
+        need = np.where(needs_rebalance[:, None], current - targets * totals[:, None], 0.0)
+        need = np.where(np.abs(need) >= self.min_trade_amount, need, 0.0)
+
+        # Sort holdings by group, largest first, and locate each group's first row
+        order = np.lexsort((-amounts, groups))
+        sorted_groups = groups[order]
+        sorted_amounts = amounts[order]
+        cumulative = np.cumsum(sorted_amounts)
+        group_ids, group_starts = np.unique(sorted_groups, return_index=True)
+        group_offset = np.zeros(client_count * 3)
+        group_offset[group_ids] = cumulative[group_starts] - sorted_amounts[group_starts]
+        held_before = cumulative - sorted_amounts - group_offset[sorted_groups]
+
+        # Sells: take the need from the largest holdings first
+        flat_need = need.reshape(-1)
+        sell = np.clip(flat_need[sorted_groups] - held_before, 0.0, sorted_amounts)
+        sell_rows = np.nonzero(sell >= self.min_trade_amount)[0]
+        sell_trades = pd.DataFrame({
+            "client_id": client_ids.to_numpy()[sorted_groups[sell_rows] // 3],
+            "symbol": symbols[order][sell_rows],
+            "asset_class": np.array(ASSET_CLASSES)[sorted_groups[sell_rows] % 3],
+            "action": "sell",
+            "amount": sell[sell_rows]
+        })
+
+        # Buys: one trade per underweight class
+        largest_holding = np.full(client_count * 3, None, dtype=object)
+        largest_holding[group_ids] = symbols[order][group_starts]
+        buy_groups = np.nonzero(flat_need < 0)[0]
+        buy_symbols = largest_holding[buy_groups]
+        missing = np.array([symbol is None for symbol in buy_symbols], dtype=bool)
+        buy_symbols[missing] = default_products[buy_groups[missing] // 3, buy_groups[missing] % 3]
+        placed = np.array([symbol is not None for symbol in buy_symbols], dtype=bool)
+
+        buy_trades = pd.DataFrame({
+            "client_id": client_ids.to_numpy()[buy_groups[placed] // 3],
+            "symbol": buy_symbols[placed],
+            "asset_class": np.array(ASSET_CLASSES)[buy_groups[placed] % 3],
+            "action": "buy",
+            "amount": -flat_need[buy_groups[placed]]
+        })
+        unallocated = np.bincount(
+            buy_groups[~placed] // 3, weights=-flat_need[buy_groups[~placed]], minlength=client_count
+        )
+
+        drift_report = pd.DataFrame({"client_id": client_ids.to_numpy(), "total_value": totals})
+        for index, name in enumerate(ASSET_CLASSES):
+            drift_report[f"current_{name}"] = weights[:, index]
+            drift_report[f"target_{name}"] = targets[:, index]
+            drift_report[f"drift_{name}"] = drift[:, index]
+        drift_report["needs_rebalance"] = needs_rebalance
+        drift_report["unallocated_cash"] = unallocated
+
+        return {
+            "drift": drift_report,
+            "trades": pd.concat([sell_trades, buy_trades], ignore_index=True)
+        }
@@ -0,0 +1,148 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from services.metrics import record_cache, timed
+from services.single_flight import SingleFlight, request_key
+
+# Bump when the layout changes so cached reports are not served for the old one
+RENDER_VERSION = 1
+
+
+def _latin1(text: str) -> str:
+    # The core PDF fonts only cover Latin-1 (e.g. "₹" becomes "?")
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+def render_report(payload: Dict[str, Any]) -> bytes:
+    """
+    Render a report to PDF bytes: title, body text, then each Plotly figure as a PNG.
+    Runs in a worker process, so it only takes plain data.
+    """
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font('Helvetica', 'B', 16)
+    pdf.cell(0, 10, _latin1(payload["title"]), ln=True, align='C')
+
+    pdf.set_font('Helvetica', '', 12)
+    pdf.ln(10)
+    pdf.multi_cell(0, 10, _latin1(payload["text"]))
+
+    if payload["figures"]:
+        import plotly.io as pio
+        for figure in payload["figures"]:
+            image = pio.to_image(pio.from_json(json.dumps(figure)), format="png")
+            pdf.image(io.BytesIO(image), x=10, y=None, w=190)
+
+    return bytes(pdf.output())
+
+
+class ReportService:
+    def __init__(self, cache_dir: str, workers: int = 2, max_cached: int = 200):
+        """
+        Initialize PDF report rendering in a process pool with an on-disk cache
+
+        Reports are keyed by a hash of their content, so identical requests are
+        rendered once and then served from cache/reports; identical requests in
+        flight at the same time share one render.
+        """
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.max_cached = max_cached
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._flight = SingleFlight("report")
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def content_key(payload: Dict[str, Any]) -> str:
+        return request_key(RENDER_VERSION, payload)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Bytes of a rendered report, or None if the key is unknown or was evicted"""
+        if len(key) != 40 or not all(c in "0123456789abcdef" for c in key):
+            return None
+        try:
+            with open(self.path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            # Mark as recently used for eviction
+            os.utime(self.path(key))
+        except OSError:
+            pass
+        return data
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    async def render(self, payload: Dict[str, Any]) -> Tuple[str, bytes]:
+        """
+        Return the key and PDF bytes of the report, rendering it unless it is cached.
+        The bytes are returned rather than a path, since eviction (possibly by
+        another server process) may remove the file at any time.
+        """
+        key = self.content_key(payload)
+        data = self.read(key)
+        record_cache("report", data is not None)
+        if data is None:
+            data = await self._flight.do(key, lambda: self._render(key, payload))
+        return key, data
+
+    async def _render(self, key: str, payload: Dict[str, Any]) -> bytes:
+        with timed("report_render"):
+            data = await asyncio.get_running_loop().run_in_executor(self._executor(), render_report, payload)
+        # A private temp file per render: other processes may be writing the same key
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.path(key))
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        self._evict()
+        return data
+
+    def _evict(self):
+        """Keep the max_cached most recently used reports"""
+        reports = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".pdf"):
+                continue
+            try:
+                reports.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                # Evicted by another process meanwhile
+                continue
+        if len(reports) <= self.max_cached:
+            return
+        reports.sort()
+        for _, path in reports[:len(reports) - self.max_cached]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
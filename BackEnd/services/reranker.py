@@ -0,0 +1,98 @@
+import logging
+import math
+import re
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+from config.settings import settings
+from services.metrics import timed
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def passage_text(record: Any) -> str:
+    """Flatten a retrieved record into "key: value" text for scoring"""
+    if isinstance(record, dict):
+        return "; ".join(f"{key.replace('_', ' ')}: {passage_text(value)}" for key, value in record.items())
+    if isinstance(record, (list, tuple)):
+        return ", ".join(passage_text(value) for value in record)
+    return str(record)
+
+
+class LexicalOverlapBackend:
+    """Fraction of query terms present in the passage; the no-model fallback"""
+    def score(self, query: str, passages: List[str]) -> List[float]:
+        terms = set(_TOKEN.findall(query.lower()))
+        if not terms:
+            return [0.0] * len(passages)
+        return [len(terms & set(_TOKEN.findall(passage.lower()))) / len(terms) for passage in passages]
+
+
+class CrossEncoderBackend:
+    """Small CPU cross-encoder (sentence-transformers) scoring (query, passage) pairs in batches"""
+    def __init__(self, model_name: str = None, batch_size: int = 16, max_length: int = 256):
+        from sentence_transformers import CrossEncoder
+        self.model = CrossEncoder(model_name or settings.RERANK_MODEL, max_length=max_length, device="cpu")
+        self.batch_size = batch_size
+
+    def score(self, query: str, passages: List[str]) -> List[float]:
+        logits = self.model.predict([(query, passage) for passage in passages], batch_size=self.batch_size)
+        # Relevance logits -> 0..1, so one cutoff works for every backend
+        return [1.0 / (1.0 + math.exp(-float(logit))) for logit in logits]
+
+
+class RerankerService:
+    def __init__(self, backend=None, top_n: int = None, min_score: float = None):
+        """
+        Initialize the second retrieval stage. RERANK_BACKEND selects "cross-encoder",
+        "lexical", or "auto" (cross-encoder, falling back to term overlap if the model
+        can't be loaded). Scores are in 0..1.
+        """
+        if backend is None:
+            backend_name = settings.RERANK_BACKEND.lower()
+            if backend_name == "lexical":
+                backend = LexicalOverlapBackend()
+            else:
+                try:
+                    backend = CrossEncoderBackend()
+                except Exception as e:
+                    if backend_name != "auto":
+                        raise
+                    logging.warning(f"Re-ranking model unavailable, using lexical fallback: {str(e)}")
+                    backend = LexicalOverlapBackend()
+        self.backend = backend
+        self.top_n = top_n if top_n is not None else settings.RERANK_TOP_N
+        self.min_score = min_score if min_score is not None else settings.RERANK_MIN_SCORE
+
+    def rerank(self, query: str, records: Sequence[Any], top_n: int = None, min_score: float = None) -> List[Tuple[Any, float]]:
+        """
+        Score all records against the query in one batch and return the best
+        (record, score) pairs above min_score, at most top_n. The best record is kept
+        even below the cutoff, so the prompt never loses its context entirely.
+        """
+        if not records:
+            return []
+        top_n = top_n if top_n is not None else self.top_n
+        min_score = min_score if min_score is not None else self.min_score
+        with timed("rerank"):
+            scores = self.backend.score(query, [passage_text(record) for record in records])
+        ranked = sorted(zip(records, scores), key=lambda pair: -pair[1])
+        kept = [(record, score) for record, score in ranked[:top_n] if score >= min_score]
+        return kept or ranked[:1]
+
+    def retrieve(self, knowledge_base, query: str, candidates: int = None, **search_options) -> List[Dict]:
+        """Over-fetch candidates with the knowledge base's hybrid search, then keep the re-ranked best"""
+        records = knowledge_base.semantic_search(query, k=candidates or settings.RERANK_CANDIDATES, **search_options)
+        return [record for record, _ in self.rerank(query, records)]
+
+
+def shared_reranker() -> RerankerService:
+    """The process-wide RerankerService, so the re-ranking model is loaded once"""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = RerankerService()
+    return _shared
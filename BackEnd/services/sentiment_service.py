@@ -0,0 +1,94 @@
+import logging
+import re
+from typing import Dict, List
+from config.settings import settings
+
+POSITIVE = "positive"
+NEGATIVE = "negative"
+NEUTRAL = "neutral"
+
+# Compact finance lexicon (in the spirit of Loughran-McDonald) for the no-model fallback
+POSITIVE_WORDS = {
+    "gain", "gains", "gained", "rise", "rises", "rising", "rose", "surge", "surges", "surged", "jump", "jumps",
+    "jumped", "rally", "rallies", "rallied", "soar", "soars", "soared", "record", "profit",
+    "profits", "profitable", "growth", "grow", "grows", "beat", "beats", "strong", "stronger", "upgrade",
+    "upgraded", "outperform", "outperforms", "bullish", "expansion", "expands", "dividend", "boost",
+    "boosts", "improve", "improved", "improves", "positive", "win", "wins", "approval", "approved", "recovery",
+}
+NEGATIVE_WORDS = {
+    "loss", "losses", "lose", "fall", "falls", "falling", "fell", "drop", "drops", "dropped", "decline",
+    "declines", "declined", "plunge", "plunges", "plunged", "slump", "slumps", "weak", "weaker",
+    "miss", "misses", "missed", "downgrade", "downgraded", "underperform", "bearish", "probe", "fraud",
+    "penalty", "fined", "lawsuit", "default", "cut", "cuts", "slowdown", "concern", "concerns",
+    "negative", "warning", "crash", "crashes", "layoffs", "resigns", "scam", "raid",
+}
+
+_TOKEN = re.compile(r"[a-z]+")
+
+
+class LexiconSentimentBackend:
+    """Word-count polarity over a finance lexicon"""
+    def __init__(self, neutral_band: float = 0.1):
+        self.neutral_band = neutral_band
+
+    def classify(self, texts: List[str]) -> List[Dict[str, float]]:
+        results = []
+        for text in texts:
+            tokens = _TOKEN.findall(text.lower())
+            positive = sum(token in POSITIVE_WORDS for token in tokens)
+            negative = sum(token in NEGATIVE_WORDS for token in tokens)
+            polarity = (positive - negative) / (positive + negative + 1)
+            if polarity > self.neutral_band:
+                label = POSITIVE
+            elif polarity < -self.neutral_band:
+                label = NEGATIVE
+            else:
+                label = NEUTRAL
+            results.append({"label": label, "score": round(abs(polarity), 4)})
+        return results
+
+
+class TransformersSentimentBackend:
+    """Small CPU text-classification model via transformers.pipeline, run in batches"""
+    def __init__(self, model_name: str = None, batch_size: int = 16):
+        from transformers import pipeline
+        self.pipeline = pipeline(
+            "sentiment-analysis",
+            model=model_name or settings.SENTIMENT_MODEL,
+            device=-1
+        )
+        self.batch_size = batch_size
+
+    def classify(self, texts: List[str]) -> List[Dict[str, float]]:
+        outputs = self.pipeline(texts, batch_size=self.batch_size, truncation=True, max_length=512)
+        return [{"label": output["label"].lower(), "score": round(float(output["score"]), 4)} for output in outputs]
+
+
+class SentimentService:
+    def __init__(self, backend=None):
+        """
+        Initialize sentiment classification. SENTIMENT_BACKEND selects "transformers",
+        "lexicon", or "auto" (transformers, falling back to the lexicon if the model
+        can't be loaded).
+        """
+        if backend is None:
+            backend_name = settings.SENTIMENT_BACKEND.lower()
+            if backend_name == "lexicon":
+                backend = LexiconSentimentBackend()
+            else:
+                try:
+                    backend = TransformersSentimentBackend()
+                except Exception as e:
+                    if backend_name != "auto":
+                        raise
+                    logging.warning(f"Sentiment model unavailable, using lexicon fallback: {str(e)}")
+                    backend = LexiconSentimentBackend()
+        self.backend = backend
+
+    def classify(self, texts: List[str]) -> List[Dict[str, float]]:
+        """
+        Classify all texts in one batched pass; returns [{"label", "score"}, ...] in input order
+        """
+        if not texts:
+            return []
+        return self.backend.classify(list(texts))
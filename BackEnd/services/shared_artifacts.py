@@ -0,0 +1,270 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from services.quantization import FLOAT32, QuantizedMatrix
+
+ARTIFACT_VERSION = 2
+MANIFEST = "manifest.json"
+PDF_TEXT = "pdf_text.bin"
+PDF_INDEX = "pdf_index.json"
+
+
+def _lock_file(f):
+    try:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    except ImportError:
+        # Windows: lock the first byte, retrying until it is free
+        import msvcrt
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+
+def _unlock_file(f):
+    try:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    except ImportError:
+        import msvcrt
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def artifacts_lock(directory: str):
+    """
+    Exclusive lock, across processes, on building the artifact set at `directory`
+    (held while checking whether it is current, so only one worker rebuilds it)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(directory)), exist_ok=True)
+    with open(os.path.abspath(directory) + ".lock", "a+b") as f:
+        _lock_file(f)
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+
+
+def manifest_path(directory: str) -> str:
+    return os.path.join(directory, MANIFEST)
+
+
+def _open_mmap(path: str) -> mmap.mmap:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _write_blob(directory: str, name: str, texts: Sequence[str]) -> List[List[int]]:
+    """Write UTF-8 texts back to back and return their [offset, length] pairs"""
+    spans, offset = [], 0
+    with open(os.path.join(directory, name), "wb") as f:
+        for text in texts:
+            data = text.encode("utf-8")
+            f.write(data)
+            spans.append([offset, len(data)])
+            offset += len(data)
+    return spans
+
+
+class MappedTextTable(Mapping):
+    """Read-only doc_key -> {"text", "filename", "is_fundamental"} view over the shared PDF text blob"""
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, PDF_INDEX), "r") as f:
+            self._index: Dict[str, list] = json.load(f)
+        self._blob = _open_mmap(os.path.join(directory, PDF_TEXT))
+
+    def __getitem__(self, doc_key: str) -> Dict:
+        offset, length, filename, is_fundamental = self._index[doc_key]
+        text = self._blob[offset:offset + length].decode("utf-8") if length else ""
+        return {"text": text, "filename": filename, "is_fundamental": is_fundamental}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, doc_key) -> bool:
+        return doc_key in self._index
+
+    # Shared artifacts hold whole documents; each is addressed as a single page
+    def page_count(self, doc_key: str) -> int:
+        return 1 if doc_key in self._index else 0
+
+    def page(self, doc_key: str, page_no: int) -> str:
+        if page_no != 1:
+            raise IndexError(f"{doc_key} has no page {page_no}")
+        return self[doc_key]["text"]
+
+    def iter_pages(self, doc_key: str) -> Iterator[Tuple[int, str]]:
+        yield 1, self[doc_key]["text"]
+
+
+@dataclass
+class Document:
+    page_content: str
+
+
+class MatrixVectorStore:
+    """
+    Exact cosine search over a memory-mapped, row-normalized embedding matrix.
+    Implements the similarity_search_by_vector subset of the Chroma API used by RAGKnowledgeBase.
+
+    With precision "float16" or "int8", the quantized codes built alongside the
+    matrix are memory-mapped too and scanned instead, and the top k * rerank_factor
+    candidates are re-ranked exactly against the mapped float32 rows (see
+    services.quantization). Workers share both through the page cache.
+    """
+    def __init__(self, directory: str, name: str, precision: str = FLOAT32, rerank_factor: int = 4):
+        self.vectors = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        with open(os.path.join(directory, f"{name}.json"), "r") as f:
+            self._spans = json.load(f)
+        self._blob = _open_mmap(os.path.join(directory, f"{name}.bin"))
+        self.rerank_factor = rerank_factor
+        self.quantized = None
+        if precision != FLOAT32:
+            try:
+                self.quantized = QuantizedMatrix.load(directory, name, precision)
+            except (OSError, RuntimeError) as e:
+                # Artifacts built for another precision; quantize privately rather than fail
+                logging.warning(f"No shared {precision} codes for {name}, quantizing in-process: {str(e)}")
+                self.quantized = QuantizedMatrix.encode(self.vectors, precision)
+
+    def text(self, index: int) -> str:
+        offset, length = self._spans[index]
+        return self._blob[offset:offset + length].decode("utf-8")
+
+    def similarity_search_by_vector(self, embedding, k: int = 4) -> List[Document]:
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        if self.quantized is not None:
+            top = [row for row, _ in self.quantized.search(query, k, exact=self.vectors, rerank_factor=self.rerank_factor)]
+            return [Document(page_content=self.text(index)) for index in top]
+        scores = self.vectors @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k else []
+        top = sorted(top, key=lambda index: -scores[index])
+        return [Document(page_content=self.text(index)) for index in top]
+
+
+def fingerprint(pdf_keys: Sequence[str], store_texts: Dict[str, Sequence[str]], precision: str = FLOAT32) -> str:
+    """Hash of the inputs the artifacts were built from, to detect stale sets"""
+    digest = hashlib.sha256(f"{ARTIFACT_VERSION}:{precision}".encode("utf-8"))
+    for key in sorted(pdf_keys):
+        digest.update(key.encode("utf-8"))
+    for name in sorted(store_texts):
+        digest.update(name.encode("utf-8"))
+        for text in store_texts[name]:
+            digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_current(directory: str, expected_fingerprint: str) -> bool:
+    try:
+        with open(manifest_path(directory), "r") as f:
+            return json.load(f).get("fingerprint") == expected_fingerprint
+    except (OSError, ValueError):
+        return False
+
+
+def build_shared_artifacts(
+    directory: str,
+    pdf_data: Mapping,
+    store_texts: Dict[str, Sequence[str]],
+    embeddings,
+    precision: str = FLOAT32
+) -> str:
+    """
+    Write the shared read-only artifact set: PDF text blob + offset index, and per
+    vector store a normalized float32 embedding matrix with its document texts,
+    plus its float16 / int8 codes when precision asks for them.
+
+    Files are written to a staging directory and renamed into place once complete,
+    so a partial set is never visible under `directory`. Returns the fingerprint.
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".shared-", dir=parent)
+    try:
+        doc_keys = sorted(pdf_data)
+        records = [pdf_data[key] for key in doc_keys]
+        spans = _write_blob(staging, PDF_TEXT, [record.get("text", "") for record in records])
+        with open(os.path.join(staging, PDF_INDEX), "w") as f:
+            json.dump({
+                key: [offset, length, record.get("filename"), record.get("is_fundamental", False)]
+                for key, (offset, length), record in zip(doc_keys, spans, records)
+            }, f)
+
+        for name, texts in store_texts.items():
+            vectors = np.asarray(embeddings.embed_documents(list(texts)), dtype=np.float32)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            np.save(os.path.join(staging, f"{name}.npy"), vectors)
+            if precision != FLOAT32:
+                QuantizedMatrix.encode(vectors, precision).save(staging, name)
+            with open(os.path.join(staging, f"{name}.json"), "w") as f:
+                json.dump(_write_blob(staging, f"{name}.bin", texts), f)
+
+        digest = fingerprint(doc_keys, store_texts, precision)
+        with open(os.path.join(staging, MANIFEST), "w") as f:
+            json.dump({
+                "version": ARTIFACT_VERSION,
+                "fingerprint": digest,
+                "stores": sorted(store_texts),
+                "precision": precision
+            }, f)
+
+        previous = None
+        if os.path.exists(directory):
+            previous = tempfile.mkdtemp(prefix=".shared-old-", dir=parent)
+            os.rename(directory, os.path.join(previous, "set"))
+        os.rename(staging, directory)
+        if previous:
+            shutil.rmtree(previous, ignore_errors=True)
+        return digest
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def prepare_shared_artifacts(directory: str, precision: str = None, snapshot=None, embeddings=None) -> str:
+    """
+    Build the artifact set from the PDF data and knowledge base unless an up-to-date
+    set already exists. Run in the parent process before workers start, and by
+    workers on a knowledge base reload: the build is locked across processes, so
+    the first one rebuilds and the rest find the set current.
+    precision defaults to EMBEDDING_PRECISION, which the workers load; snapshot
+    defaults to the configured knowledge snapshot and embeddings to OpenAIEmbeddings.
+    """
+    from config.settings import settings
+    from RagBase.rag_knowledge_base import RAGKnowledgeBase
+    from services.pdf_service import PDFService
+
+    precision = precision or settings.EMBEDDING_PRECISION
+    with artifacts_lock(directory):
+        pdf_service = PDFService(shared_artifacts_dir="")
+        store_texts = RAGKnowledgeBase(build_indexes=False, snapshot=snapshot).store_texts()
+        expected = fingerprint(list(pdf_service.processed_data), store_texts, precision)
+        if is_current(directory, expected):
+            return expected
+        if embeddings is None:
+            from langchain.embeddings import OpenAIEmbeddings
+            embeddings = OpenAIEmbeddings()
+        return build_shared_artifacts(directory, pdf_service.processed_data, store_texts, embeddings, precision)
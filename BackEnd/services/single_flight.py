@@ -0,0 +1,44 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict
+
+from services.metrics import metrics
+
+
+def request_key(*parts: Any) -> str:
+    """Stable key for a request payload (dicts, lists, pydantic .dict() output, scalars)"""
+    encoded = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        """
+        Initialize a coalescing group: concurrent calls with the same key share
+        one in-flight computation and all receive its result (or its exception).
+
+        Results are shared objects, so callers must treat them as read-only.
+        """
+        self.name = name
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    def __len__(self):
+        return len(self._in_flight)
+
+    async def do(self, key: str, function: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            metrics.inc("app_coalesced_requests_total", group=self.name, role="leader")
+            task = asyncio.ensure_future(function())
+            self._in_flight[key] = task
+
+            def release(done):
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+
+            task.add_done_callback(release)
+        else:
+            metrics.inc("app_coalesced_requests_total", group=self.name, role="follower")
+        # Shielded so a disconnecting caller doesn't cancel the work the others are waiting on
+        return await asyncio.shield(task)
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from config.settings import settings
+from services.metrics import timed
+
+
+class OpenAITranscriptionBackend:
+    """Hosted Whisper through the OpenAI API"""
+    def __init__(self):
+        import openai
+        openai.api_key = settings.OPENAI_API_KEY
+        self.openai = openai
+
+    def transcribe(self, path: str, language: str = "en") -> str:
+        with open(path, "rb") as audio_file:
+            transcription = self.openai.Audio.transcribe("whisper-1", audio_file, language=language)
+        return transcription.text
+
+
+class LocalWhisperTranscriptionBackend:
+    """Local Whisper model (openai-whisper package), loaded once per process"""
+    def __init__(self, model_name: str = None):
+        import whisper
+        self.model = whisper.load_model(model_name or settings.LOCAL_WHISPER_MODEL)
+
+    def transcribe(self, path: str, language: str = "en") -> str:
+        result = self.model.transcribe(path, language=language, fp16=False)
+        return result["text"].strip()
+
+
+class StubTranscriptionBackend:
+    """Fixed response, for load tests and environments without a speech model"""
+    def __init__(self, text: str = ""):
+        self.text = text
+
+    def transcribe(self, path: str, language: str = "en") -> str:
+        return self.text
+
+
+TRANSCRIPTION_BACKENDS = {
+    "openai": OpenAITranscriptionBackend,
+    "local": LocalWhisperTranscriptionBackend,
+    "stub": StubTranscriptionBackend,
+}
+
+
+class TranscriptionService:
+    def __init__(self, backend=None):
+        """
+        Initialize transcription service with the configured backend
+        """
+        if backend is None:
+            backend_name = settings.TRANSCRIBE_BACKEND.lower()
+            if backend_name not in TRANSCRIPTION_BACKENDS:
+                raise ValueError(f"Unknown transcription backend: {settings.TRANSCRIBE_BACKEND}")
+            backend = TRANSCRIPTION_BACKENDS[backend_name]()
+        self.backend = backend
+
+    @staticmethod
+    def _spool_to_tempfile(file: UploadFile) -> str:
+        """Copy the upload to a uniquely named temp file in chunks"""
+        suffix = os.path.splitext(os.path.basename(file.filename or ""))[1] or ".wav"
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as buffer:
+            file.file.seek(0)
+            shutil.copyfileobj(file.file, buffer, length=1024 * 1024)
+            return buffer.name
+
+    async def transcribe(self, file: UploadFile, language: str = "en") -> str:
+        """
+        Transcribe an uploaded audio file without blocking the event loop
+        """
+        path = await run_in_threadpool(self._spool_to_tempfile, file)
+        try:
+            with timed("transcription"):
+                return await run_in_threadpool(self.backend.transcribe, path, language)
+        finally:
+            os.remove(path)
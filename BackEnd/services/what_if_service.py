@@ -0,0 +1,110 @@
+import numpy as np
+from typing import Any, Dict, List, Sequence
+from RagBase.rag_knowledge_base import RAGKnowledgeBase
+from services.goal_projection_service import GoalProjectionService, BUCKET_MARKET_CORRELATION, risk_to_volatility
+
+
+class WhatIfService:
+    def __init__(self, knowledge_base: RAGKnowledgeBase, simulations: int = 5000, seed: int = None):
+        """
+        Initialize the what-if sweep service over the knowledge base catalog
+        """
+        self.knowledge_base = knowledge_base
+        self.goal_projection = GoalProjectionService(simulations=simulations, percentiles=(5, 50, 95), seed=seed)
+
+    def sweep(
+        self,
+        risk_scores: Sequence[int],
+        time_horizons: Sequence[int],
+        initial_investment: float,
+        target_amount: float,
+        age: int = 35
+    ) -> Dict[str, Any]:
+        """
+        Evaluate the recommendation for every (risk_score, time_horizon) pair.
+
+        Allocations depend only on the risk score, so one portfolio is built per
+        distinct risk score from the cached frontiers; goal probabilities for the
+        whole grid are then simulated in one batched Monte Carlo pass.
+        """
+        risks = sorted(set(int(risk) for risk in risk_scores))
+        horizons = sorted(set(int(horizon) for horizon in time_horizons))
+
+        # Build one portfolio per risk score over the union of recommended products
+        columns: Dict[str, int] = {}
+        products: List[Any] = []
+        buckets: List[str] = []
+        portfolios, asset_allocations = [], []
+        for risk in risks:
+            profile = {
+                "age": age,
+                "risk_score": risk,
+                "time_horizon": horizons[0],
+                "initial_investment": initial_investment,
+                "target_amount": target_amount
+            }
+            risk_allocation = self.knowledge_base._determine_asset_allocation(profile)
+            allocation = self.knowledge_base.allocate_products(profile, initial_investment, risk_allocation)
+            portfolio = {}
+            for bucket, (bucket_products, amounts) in allocation.items():
+                for product, amount in zip(bucket_products, amounts):
+                    if product.name not in columns:
+                        columns[product.name] = len(products)
+                        products.append(product)
+                        buckets.append(bucket)
+                    portfolio[columns[product.name]] = amount
+            portfolios.append(portfolio)
+            asset_allocations.append([risk_allocation["equity"], risk_allocation["debt"], risk_allocation["alternatives"]])
+
+        amounts = np.zeros((len(risks), max(len(products), 1)))
+        for row, portfolio in enumerate(portfolios):
+            for column, amount in portfolio.items():
+                amounts[row, column] = amount
+
+        expected_returns = np.array([product.expected_returns for product in products] or [0.0])
+        risk_levels = np.array([product.risk_score for product in products] or [0.0])
+        correlations = np.array([BUCKET_MARKET_CORRELATION.get(bucket, 0.5) for bucket in buckets] or [0.0])
+
+        # Portfolio statistics per risk score (invested part only)
+        weights = amounts / initial_investment if initial_investment else amounts
+        covariance = (
+            self.knowledge_base.optimizer.covariance(products) if products else np.zeros((1, 1))
+        )
+        portfolio_returns = weights @ expected_returns
+        portfolio_volatility = np.sqrt(np.einsum("rp,pq,rq->r", weights, covariance, weights))
+
+        # Expand to the (risk, horizon) grid and simulate every point at once
+        grid_amounts = np.repeat(amounts, len(horizons), axis=0)
+        grid_horizons = np.tile(np.array(horizons, dtype=float), len(risks))
+        projection = self.goal_projection.project_batch(
+            grid_amounts,
+            expected_returns,
+            risk_to_volatility(risk_levels),
+            correlations,
+            grid_horizons,
+            np.full(len(grid_horizons), float(target_amount)),
+            cash=np.maximum(initial_investment - grid_amounts.sum(axis=1), 0.0)
+        )
+
+        points = []
+        for row, risk in enumerate(risks):
+            for column, horizon in enumerate(horizons):
+                index = row * len(horizons) + column
+                points.append({
+                    "risk_score": risk,
+                    "time_horizon": horizon,
+                    "asset_allocation": asset_allocations[row],
+                    "weights": np.round(weights[row, :len(products)], 4).tolist(),
+                    "expected_return": round(float(portfolio_returns[row]), 5),
+                    "volatility": round(float(portfolio_volatility[row]), 5),
+                    "goal_probability": round(float(projection["probability"][index]), 4),
+                    "median_value": round(float(projection["percentiles"][index, 1]), 2),
+                    "p5_value": round(float(projection["percentiles"][index, 0]), 2),
+                    "p95_value": round(float(projection["percentiles"][index, 2]), 2)
+                })
+
+        return {
+            "products": [product.name for product in products],
+            "asset_classes": ["equity", "debt", "alternatives"],
+            "points": points
+        }
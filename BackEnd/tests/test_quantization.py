@@ -0,0 +1,72 @@
+"""
+Recall of quantized (float16 / int8) embedding search after exact re-ranking.
+
+Run from the BackEnd directory:
+
+    python -m pytest tests
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from benchmarks.ann_benchmark import clustered_vectors, exact_neighbours, recall_at_k
+from services import ann_index, quantization
+from services.quantization import FLOAT16, INT8, QuantizedMatrix
+
+K = 10
+MIN_RECALL = 0.99
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    rng = np.random.default_rng(42)
+    vectors = clustered_vectors(5000, 64, 50, rng)
+    queries = ann_index.normalize_rows(
+        vectors[rng.integers(0, len(vectors), 100)] + 0.3 * rng.standard_normal((100, 64)).astype(np.float32)
+    )
+    return vectors, queries, exact_neighbours(vectors, queries, K)
+
+
+@pytest.mark.parametrize("precision", [FLOAT16, INT8])
+def test_matrix_recall_after_rerank(dataset, precision, monkeypatch):
+    vectors, queries, truth = dataset
+    # Several chunks, so candidates are merged across scans
+    monkeypatch.setattr(quantization, "CHUNK_ROWS", 1024)
+    matrix = QuantizedMatrix.encode(vectors, precision)
+
+    found = [[row for row, _ in matrix.search(query, K, exact=vectors)] for query in queries]
+
+    assert recall_at_k(found, truth) >= MIN_RECALL
+
+
+@pytest.mark.parametrize("precision", [FLOAT16, INT8])
+def test_matrix_candidates_match_decoded_scores(dataset, precision):
+    vectors, queries, _ = dataset
+    matrix = QuantizedMatrix.encode(vectors, precision)
+    decoded = matrix.quantizer.sa_decode(np.ascontiguousarray(matrix.codes)) @ queries[0]
+
+    rows, scores = matrix.candidates(queries[0], K)
+
+    np.testing.assert_allclose(np.sort(scores)[::-1], np.sort(decoded)[::-1][:K], rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(scores, decoded[rows], rtol=1e-4, atol=1e-5)
+
+
+def store_recall(dataset, backend, precision):
+    vectors, queries, truth = dataset
+    store = ann_index.FaissVectorStore(vectors, [str(row) for row in range(len(vectors))], backend=backend, precision=precision)
+    return store, recall_at_k([[row for row, _ in store.search(query, K)] for query in queries], truth)
+
+
+@pytest.mark.parametrize("backend", [ann_index.FLAT, ann_index.HNSW])
+@pytest.mark.parametrize("precision", [FLOAT16, INT8])
+def test_faiss_store_recall_after_rerank(dataset, backend, precision):
+    vectors, queries, _ = dataset
+    store, recall = store_recall(dataset, backend, precision)
+    _, float32_recall = store_recall(dataset, backend, quantization.FLOAT32)
+
+    # Quantization loses nothing after re-ranking; HNSW's own graph search bounds its recall
+    assert recall >= min(MIN_RECALL, float32_recall)
+    # Re-ranked scores are exact cosine similarities
+    row, score = store.search(queries[0], 1)[0]
+    assert score == pytest.approx(float(vectors[row] @ queries[0]), abs=1e-5)
@@ -5,9 +5,7 @@ from pages.chat import ChatPage
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
-from fpdf import FPDF
 import json
-import io
 from utils.auth import Authentication
 import requests
 
@@ -103,23 +101,30 @@ logo_image_path="images/IISc_Seal_Master_logo.png"
 st.logo(logo_image_path, size="large", link=None, icon_image=logo_image_path)
 
 def generate_pdf_report(analysis_text, figures):
-    pdf = FPDF()
-    pdf.add_page()
-    
-    # Add title
-    pdf.set_font('Arial', 'B', 16)
-    pdf.cell(0, 10, 'Financial Analysis Report', ln=True, align='C')
-    
-    # Add analysis text
-    pdf.set_font('Arial', '', 12)
-    pdf.multi_cell(0, 10, analysis_text)
-    
-    # Add plots
-    for fig in figures:
-        img_bytes = fig.to_image(format="png")
-        pdf.image(io.BytesIO(img_bytes), x=10, y=None, w=190)
-    
-    return pdf.output(dest='S').encode('latin1')
+    # Rendered (and cached by content) on the backend instead of rasterizing figures here
+    figure_json = [json.loads(fig.to_json()) for fig in figures]
+    return APIClient().render_report(analysis_text, figure_json)
+
+def display_sensitivity_chart(sweep, risk_score):
+    # Goal probability across the what-if grid, one line per time horizon
+    points = pd.DataFrame(sweep.get("points", []))
+    if points.empty:
+        st.info("No what-if analysis available.")
+        return
+    points = points.sort_values(["time_horizon", "risk_score"])
+    points["horizon"] = points["time_horizon"].astype(str)
+    fig = px.line(
+        points,
+        x="risk_score",
+        y="goal_probability",
+        color="horizon",
+        markers=True,
+        labels={"risk_score": "Risk Score", "goal_probability": "Probability of Reaching Target", "horizon": "Horizon (Years)"},
+        title="Recommendation Sensitivity"
+    )
+    fig.add_vline(x=risk_score, line_dash="dash", line_color="red")
+    fig.update_yaxes(range=[0, 1], tickformat=".0%")
+    st.plotly_chart(fig, use_container_width=True)
 
 # Function to fetch news and display it in a table
 def fetch_and_display_news():
@@ -186,6 +191,15 @@ def main():
                     # Call the recommendation service
                     recommendation = api_client.get_recommendation(user_profile)
                     st.json(recommendation)
+                    # Same profile swept over risk scores and nearby horizons for the sensitivity chart
+                    st.session_state.what_if = api_client.get_what_if({
+                        'age': age,
+                        'risk_scores': list(range(0, 101, 5)),
+                        'time_horizons': sorted({max(1, time_horizon - 5), time_horizon, time_horizon + 5}),
+                        'initial_investment': initial_investment,
+                        'target_amount': target_amount
+                    })
+                    st.session_state.what_if_risk_score = risk_score
             else:
                 # Disable inputs for chat
                 st.write("Chat Advisory mode enabled. User profile inputs are disabled.")
@@ -206,6 +220,8 @@ def main():
                 chat_page.render()
             elif selected == "Financial Advisory" and mode == "Recommendation":
                 st.write("Chat is disabled in Recommendation mode.")
+                if st.session_state.get("what_if"):
+                    display_sensitivity_chart(st.session_state.what_if, st.session_state.what_if_risk_score)
             
             elif selected == "Live News Recommendation":
                 st.title("Live News Recommendation")
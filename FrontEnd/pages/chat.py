@@ -2,7 +2,6 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from utils.api import APIClient
-from fpdf import FPDF
 from st_audiorec import st_audiorec
 import requests
 from datetime import datetime
@@ -44,18 +43,8 @@ class ChatPage:
         return response_text
 
     def generate_pdf_report(self, summary_text):
-        """Generate PDF report from summary text"""
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font('Arial', 'B', 16)
-        pdf.cell(0, 10, 'Financial Analysis Report', ln=True, align='C')
-
-        pdf.set_font('Arial', '', 12)
-        pdf.ln(10)
-        pdf.multi_cell(0, 10, summary_text)
-
-        pdf_output = pdf.output(dest='S').encode('latin1')
-        return pdf_output
+        """Generate PDF report from summary text (rendered and cached by the backend)"""
+        return self.api_client.render_report(summary_text)
 
     def render(self):
         self.initialize_session_state()
@@ -185,8 +174,9 @@ class ChatPage:
                     # Generate PDF report
                     pdf_bytes = self.generate_pdf_report(summary_text)
                     st.session_state.pdf_bytes = pdf_bytes
-                    st.session_state.pdf_ready = True
-                    st.success("Report is ready for download.")
+                    st.session_state.pdf_ready = pdf_bytes is not None
+                    if st.session_state.pdf_ready:
+                        st.success("Report is ready for download.")
 
                     st.session_state.chat_history.append({
                         'sno': len(st.session_state.chat_history) + 1,
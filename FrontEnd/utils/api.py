@@ -104,3 +104,32 @@ class APIClient:
         except Exception as e:
             st.error(f"Error fetching investment recommendation: {str(e)}")
             return {}
+
+    def get_what_if(self, sweep_request):
+        """Get recommendation sensitivity over a risk score / time horizon grid"""
+        try:
+            response = requests.post(
+                f"{self.base_url}/investment/what-if",
+                json=sweep_request
+            )
+            return response.json()
+        except Exception as e:
+            st.error(f"Error fetching what-if analysis: {str(e)}")
+            return {}
+
+    def render_report(self, text, figures=None, title="Financial Analysis Report"):
+        """Render a PDF report on the server (cached there by content); returns the PDF bytes"""
+        try:
+            response = requests.post(
+                f"{self.base_url}/reports/pdf",
+                json={
+                    "title": title,
+                    "text": text,
+                    "figures": figures or []
+                }
+            )
+            response.raise_for_status()
+            return response.content
+        except Exception as e:
+            st.error(f"Error rendering report: {str(e)}")
+            return None